@@ -0,0 +1,150 @@
+# REMO - Access Control
+# Role-based command permissions compiled into per-user bitmasks
+
+import json
+import asyncio
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+import config
+
+
+# Mask granting every command ("*"); Python ints have unlimited bits
+ALL_COMMANDS = -1
+
+
+class AccessControl:
+    """Compiled access-control table.
+    
+    Each command gets a bit; each role is the OR of its commands' bits; each
+    user maps to their role's mask. A permission check is then one dict
+    lookup (user -> mask) and one AND against the command's bit, which the
+    middleware resolves once when a handler is decorated.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._bits: Dict[str, int] = {}
+        self._masks: Dict[int, int] = {}
+        self._roles: Dict[str, List[str]] = {}
+        self._users: Dict[int, str] = {}
+        self._mtime = 0.0
+        self.denied: Counter = Counter()
+        self.compile()
+    
+    def bit_for(self, command: str) -> int:
+        """Get (allocating on first use) the permission bit for a command."""
+        bit = self._bits.get(command)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[command] = bit
+        return bit
+    
+    def _read_overrides(self) -> Tuple[Dict[str, List[str]], Dict[int, str]]:
+        """Read roles/users from the optional ACL file."""
+        if not self.path.exists():
+            self._mtime = 0.0
+            return {}, {}
+        self._mtime = self.path.stat().st_mtime
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        roles = data.get("roles", {})
+        users = {int(user_id): role for user_id, role in data.get("users", {}).items()}
+        return roles, users
+    
+    def compile(self) -> None:
+        """Rebuild the user -> mask table from config plus the ACL file."""
+        roles = dict(config.ACL_ROLES)
+        users = dict(config.ACL_USERS)
+        
+        try:
+            file_roles, file_users = self._read_overrides()
+            roles.update(file_roles)
+            users.update(file_users)
+        except Exception as e:
+            # Keep the last good table; at startup there is none, so fall
+            # back to the .env/config rules rather than locking everyone out
+            if self._masks:
+                logger.error(f"Failed to load ACL file, keeping previous rules: {e}")
+                return
+            logger.error(f"Failed to load ACL file, using .env/config rules only: {e}")
+        
+        # The owner from .env is always admin
+        users[config.TELEGRAM_USER_ID] = "admin"
+        roles.setdefault("admin", ["*"])
+        
+        role_masks: Dict[str, int] = {}
+        for role, commands in roles.items():
+            mask = 0
+            for command in commands:
+                mask = ALL_COMMANDS if command == "*" else mask | self.bit_for(command)
+                if mask == ALL_COMMANDS:
+                    break
+            role_masks[role] = mask
+        
+        masks = {}
+        for user_id, role in users.items():
+            if role not in role_masks:
+                logger.warning(f"ACL: user {user_id} has unknown role '{role}'")
+                continue
+            masks[user_id] = role_masks[role]
+        
+        # Swap in one assignment so readers never see a half-built table
+        self._masks = masks
+        self._roles = roles
+        self._users = users
+        logger.info(f"ACL compiled: {len(masks)} users, {len(roles)} roles")
+    
+    def is_known(self, user_id: int) -> bool:
+        """Check if a user has any role at all."""
+        return user_id in self._masks
+    
+    def is_allowed(self, user_id: int, bit: int) -> bool:
+        """Hot-path check: one dict lookup and one bit test."""
+        return bool(self._masks.get(user_id, 0) & bit)
+    
+    def can(self, user_id: int, command: str) -> bool:
+        """Check a command by name (resolves the bit first)."""
+        return self.is_allowed(user_id, self.bit_for(command))
+    
+    def record_denied(self, command: str) -> None:
+        self.denied[command] += 1
+    
+    def role_of(self, user_id: int) -> str:
+        return self._users.get(user_id, "none")
+    
+    def get_summary(self) -> str:
+        """Formatted users, roles and denied counts for /acl."""
+        lines = ["🛡️ **Access Control**", ""]
+        for user_id, role in sorted(self._users.items()):
+            lines.append(f"👤 `{user_id}` - {role}")
+        
+        lines.append("")
+        for role, commands in sorted(self._roles.items()):
+            lines.append(f"🔑 **{role}:** `{', '.join(commands)}`")
+        
+        if self.denied:
+            lines.append("")
+            lines.append("⛔ **Denied attempts:**")
+            for command, count in self.denied.most_common():
+                lines.append(f"├ /{command}: {count}")
+        
+        return "\n".join(lines)
+    
+    async def watch(self) -> None:
+        """Hot-reload the ACL file when its modification time changes."""
+        while True:
+            await asyncio.sleep(config.ACL_RELOAD_INTERVAL)
+            try:
+                mtime = self.path.stat().st_mtime if self.path.exists() else 0.0
+            except OSError:
+                continue
+            if mtime != self._mtime:
+                logger.info("ACL file changed, reloading")
+                self.compile()
+
+
+# Singleton instance
+acl = AccessControl(config.ACL_FILE)
@@ -0,0 +1,140 @@
+# REMO - Command Declarations
+# Every bot command in one place: handler, help, confirmation, cost, backends
+
+from typing import NamedTuple, Optional, Tuple
+
+
+class CommandSpec(NamedTuple):
+    """Declaration of a bot command.
+    
+    handler and backends are "module:attribute" paths resolved on first use,
+    so a command's heavy dependencies (pyautogui, pycaw, PIL...) are only
+    imported the first time somebody runs it. action is the coroutine run
+    when a confirmation button for this command is pressed.
+    """
+    name: str
+    section: Optional[str] = None
+    help: Tuple[str, ...] = ()
+    confirm: bool = False
+    cost: int = 1
+    backends: Tuple[str, ...] = ()
+    action: Optional[str] = None
+    handler: Optional[str] = None  # Default: bot.handlers:<name>_command
+    
+    @property
+    def handler_path(self) -> str:
+        return self.handler or f"bot.handlers:{self.name}_command"
+
+
+# Help sections, in display order (commands with section=None are listed last)
+SECTIONS = (
+    ("power", "🔐 **Power Controls**"),
+    ("status", "📊 **Status**"),
+    ("display", "📸 **Display**"),
+    ("audio", "🔊 **Audio**"),
+    ("macros", "🧩 **Macros**"),
+    ("files", "📁 **Files**"),
+)
+
+POWER = "system.power:power"
+AUDIO = "system.audio:audio"
+DISPLAY = "system.display:display"
+
+COMMANDS = (
+    CommandSpec("start"),
+    
+    # Power
+    CommandSpec(
+        "lock", "power", ("/lock - Lock screen",),
+        backends=(POWER,), action=f"{POWER}.lock_screen",
+    ),
+    CommandSpec(
+        "sleep", "power", ("/sleep - Sleep mode",),
+        confirm=True, backends=(POWER,), action=f"{POWER}.sleep",
+    ),
+    CommandSpec(
+        "shutdown", "power",
+        ("/shutdown - Shutdown PC", "/shutdown `in 2h` / `at 23:30` - Schedule"),
+        confirm=True, backends=(POWER,), action=f"{POWER}.shutdown",
+    ),
+    CommandSpec(
+        "restart", "power",
+        ("/restart - Restart PC",),
+        confirm=True, backends=(POWER,), action=f"{POWER}.restart",
+    ),
+    CommandSpec(
+        "schedules", "power", ("/schedules - List scheduled actions",),
+        backends=("system.scheduler:scheduler",),
+    ),
+    CommandSpec(
+        "cancel", "power", ("/cancel `[id]` - Cancel schedule/shutdown",),
+        backends=("system.scheduler:scheduler", POWER),
+    ),
+    CommandSpec(
+        "idle", "power", ("/idle `[lock|sleep] [min|off]` - Idle policies",),
+        backends=("system.idle:idle_monitor",),
+    ),
+    
+    # Status
+    CommandSpec(
+        "status", "status", ("/status - CPU, RAM, Battery info",),
+        cost=2, backends=("system.status:status",),
+    ),
+    CommandSpec("stats", "status", ("/stats `[5m|1h]` - Command latency",)),
+    CommandSpec("logs", "status", ("/logs `[2h] [error] [text]` - Search logs",), cost=3),
+    CommandSpec("tail", "status", ("/tail `[level] [module=name]` - Live log (`/tail stop`)",)),
+    CommandSpec(
+        "panel", "status", ("/panel - Live control panel",),
+        backends=("system.status:status", AUDIO, DISPLAY),
+    ),
+    
+    # Display
+    CommandSpec(
+        "screenshot", "display", ("/screenshot - Capture screen",),
+        cost=3, backends=(DISPLAY, "system.archive:archive"),
+    ),
+    CommandSpec(
+        "record", "display", ("/record `[seconds]` - Record screen",),
+        cost=10, backends=("system.recorder:recorder",),
+    ),
+    CommandSpec(
+        "brightness", "display", ("/brightness `[0-100]` - Set brightness",),
+        backends=(DISPLAY,),
+    ),
+    
+    # Audio
+    CommandSpec(
+        "volume", "audio",
+        (
+            "/volume `[0-100]` - Set volume",
+            "/volume `80 over 5s` - Fade volume",
+            "/volume `[app] [0-100]` - Set app volume",
+        ),
+        backends=(AUDIO,),
+    ),
+    CommandSpec("fade", "audio", ("/fade `[0-100] [seconds]` - Fade volume",), backends=(AUDIO,)),
+    CommandSpec("apps", "audio", ("/apps - Apps playing audio",), backends=(AUDIO,)),
+    CommandSpec("mute", "audio", ("/mute - Mute audio",), backends=(AUDIO,)),
+    CommandSpec("unmute", "audio", ("/unmute - Unmute audio",), backends=(AUDIO,)),
+    
+    # Macros
+    CommandSpec("do", "macros", ("/do `mute; brightness 10; lock` - Run steps at once",)),
+    CommandSpec(
+        "macro", "macros",
+        ("/macro `[name]` - List or run macros", "/macro `name = steps` / `del name` - Edit"),
+    ),
+    
+    # Files
+    CommandSpec(
+        "ls", "files", ("/ls `[folder]` - Browse folders",),
+        backends=("system.files:browser",),
+    ),
+    CommandSpec(
+        "getfile", "files", ("/getfile `<path>` - Download a file",),
+        cost=5, backends=("system.files:transfer",),
+    ),
+    
+    # Other
+    CommandSpec("acl", help=("🛡️ /acl `[reload]` - Users, roles & denied attempts",)),
+    CommandSpec("help", help=("ℹ️ /help - Show this message",)),
+)
@@ -0,0 +1,132 @@
+# REMO - Pending Confirmations
+# One-time, expiring confirmation nonces behind the inline Yes/Cancel buttons
+
+import time
+import secrets
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from loguru import logger
+
+import config
+
+
+class PendingConfirmation:
+    """A confirmation waiting for its button to be pressed."""
+    
+    __slots__ = ("nonce", "user_id", "action", "payload", "chat_id", "message_id", "slot")
+    
+    def __init__(self, nonce: str, user_id: int, action: str, payload: Dict[str, Any], slot: int):
+        self.nonce = nonce
+        self.user_id = user_id
+        self.action = action
+        self.payload = payload
+        self.chat_id: Optional[int] = None
+        self.message_id: Optional[int] = None
+        self.slot = slot
+
+
+class ConfirmationStore:
+    """Bounded store of pending confirmations keyed by a random nonce.
+    
+    Expiry runs on a timer wheel: one slot per tick, each holding the nonces
+    due at that tick, so expiring is O(expired) per tick with no scanning.
+    Entries are consumed exactly once; at most CONFIRM_MAX_PENDING are kept
+    (the oldest is expired early to make room), and every nonce in the wheel
+    is also in the table, so memory stays fixed however many pile up.
+    """
+    
+    def __init__(self, ttl: float, tick: float, max_pending: int):
+        self.tick_seconds = tick
+        self.max_pending = max_pending
+        self._ttl_ticks = max(1, int(round(ttl / tick)))
+        self._wheel: List[Set[str]] = [set() for _ in range(self._ttl_ticks + 1)]
+        self._pending: "OrderedDict[str, PendingConfirmation]" = OrderedDict()
+        self._tick = self._current_tick()
+        
+        # Set by main to edit expired confirmation messages
+        self.on_expire: Optional[Callable[[PendingConfirmation], Awaitable[None]]] = None
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def _current_tick(self) -> int:
+        return int(time.monotonic() / self.tick_seconds)
+    
+    def create(self, user_id: int, action: str, **payload: Any) -> str:
+        """Register a pending confirmation and return its nonce."""
+        self.advance()
+        if len(self._pending) >= self.max_pending:
+            _, oldest = self._pending.popitem(last=False)
+            self._wheel[oldest.slot].discard(oldest.nonce)
+            self._expire(oldest)
+        
+        nonce = secrets.token_urlsafe(9)
+        slot = (self._tick + self._ttl_ticks) % len(self._wheel)
+        self._pending[nonce] = PendingConfirmation(nonce, user_id, action, payload, slot)
+        self._wheel[slot].add(nonce)
+        return nonce
+    
+    def attach(self, nonce: str, chat_id: int, message_id: int) -> None:
+        """Remember which message carries the buttons (to edit it on expiry)."""
+        entry = self._pending.get(nonce)
+        if entry is not None:
+            entry.chat_id, entry.message_id = chat_id, message_id
+    
+    def peek(self, nonce: str) -> Optional[PendingConfirmation]:
+        return self._pending.get(nonce)
+    
+    def consume(self, nonce: str, user_id: int) -> Optional[PendingConfirmation]:
+        """Take a pending confirmation; None if expired, used, or not the requester's."""
+        entry = self._pending.get(nonce)
+        if entry is None or entry.user_id != user_id:
+            return None
+        del self._pending[nonce]
+        self._wheel[entry.slot].discard(nonce)
+        return entry
+    
+    def advance(self) -> int:
+        """Expire everything due up to now; returns how many expired."""
+        now = self._current_tick()
+        expired = 0
+        # Catch up on missed ticks; one full turn already covers every slot
+        self._tick = max(self._tick, now - len(self._wheel))
+        while self._tick < now:
+            self._tick += 1
+            slot = self._wheel[self._tick % len(self._wheel)]
+            for nonce in slot:
+                entry = self._pending.pop(nonce, None)
+                if entry is not None:
+                    self._expire(entry)
+                    expired += 1
+            slot.clear()
+        return expired
+    
+    def _expire(self, entry: PendingConfirmation) -> None:
+        logger.debug(f"Confirmation for {entry.action} expired")
+        if self.on_expire is not None and entry.message_id is not None:
+            asyncio.get_running_loop().create_task(self._notify_expired(entry))
+    
+    async def _notify_expired(self, entry: PendingConfirmation) -> None:
+        try:
+            await self.on_expire(entry)
+        except Exception as e:
+            logger.error(f"Failed to mark confirmation as expired: {e}")
+    
+    async def run(self) -> None:
+        """Timer wheel loop."""
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                self.advance()
+            except Exception as e:
+                logger.error(f"Confirmation expiry error: {e}")
+
+
+# Singleton instance
+confirmations = ConfirmationStore(
+    ttl=config.CONFIRM_TTL,
+    tick=config.CONFIRM_TICK,
+    max_pending=config.CONFIRM_MAX_PENDING,
+)
@@ -1,16 +1,38 @@
 # REMO - Telegram Bot Command Handlers
 
 import io
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple, List
+
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputFile
 from telegram.ext import ContextTypes
+from telegram.error import BadRequest
 from loguru import logger
 
 import config
 from bot.middleware import authorized_only, log_callback
-from system.power import power
-from system.audio import audio
-from system.display import display
-from system.status import status
+from bot.acl import acl
+from bot.registry import registry, lazy_backend
+from bot.confirmations import confirmations
+from bot.macros import macros
+from bot.panel import panels
+from bot.tail import tails
+from utils.metrics import metrics
+from utils.logsearch import log_search, LEVELS
+from utils.duration import parse_duration
+
+# System backends are imported on first use (see bot/commands.py)
+power = lazy_backend("system.power:power")
+audio = lazy_backend("system.audio:audio")
+display = lazy_backend("system.display:display")
+recorder = lazy_backend("system.recorder:recorder")
+archive = lazy_backend("system.archive:archive")
+scheduler = lazy_backend("system.scheduler:scheduler")
+idle_monitor = lazy_backend("system.idle:idle_monitor")
+status = lazy_backend("system.status:status")
+transfer = lazy_backend("system.files:transfer")
+browser = lazy_backend("system.files:browser")
 
 
 # =============================================================================
@@ -22,35 +44,106 @@ def needs_confirmation(command: str) -> bool:
     return config.CONFIRM_COMMANDS.get(command, False)
 
 
+def parse_schedule(args: List[str]) -> Tuple[Optional[float], Optional[str], Optional[str]]:
+    """Parse 'in 2h' or 'at 23:30' plus optional 'missed=run|skip'.
+    
+    Returns (run_at timestamp, missed policy, error message).
+    """
+    # Only /schedule parses this, and it loads the scheduler anyway
+    from system.scheduler import MISSED_POLICIES
+    
+    policy = None
+    words = []
+    for arg in args:
+        if arg.lower().startswith("missed="):
+            policy = arg.split("=", 1)[1].lower()
+            if policy not in MISSED_POLICIES:
+                return None, None, f"❌ Missed policy must be one of: {', '.join(MISSED_POLICIES)}"
+        else:
+            words.append(arg)
+    
+    if len(words) != 2 or words[0].lower() not in ("in", "at"):
+        return None, None, "❌ Usage: in <duration> (e.g. in 2h) or at <HH:MM> (e.g. at 23:30)"
+    
+    mode, value = words[0].lower(), words[1]
+    if mode == "in":
+        seconds = parse_duration(value)
+        if seconds is None:
+            return None, None, "❌ Invalid duration (e.g. 90s, 15m, 2h)"
+        return time.time() + seconds, policy, None
+    
+    try:
+        at = datetime.strptime(value, "%H:%M").time()
+    except ValueError:
+        return None, None, "❌ Invalid time, use HH:MM (e.g. 23:30)"
+    
+    # Next occurrence of that wall-clock time
+    run_at = datetime.combine(datetime.now().date(), at)
+    if run_at <= datetime.now():
+        run_at += timedelta(days=1)
+    return run_at.timestamp(), policy, None
+
+
+async def schedule_action(update: Update, action: str, args: List[str], description: str) -> None:
+    """Schedule a power action from command args, confirming first if required."""
+    run_at, policy, error = parse_schedule(args)
+    if error:
+        await update.message.reply_text(error)
+        return
+    
+    if needs_confirmation(action):
+        when = datetime.fromtimestamp(run_at).strftime("%Y-%m-%d %H:%M")
+        # The schedule rides along with the pending confirmation
+        await send_confirmation(
+            update,
+            action,
+            f"{description} at {when}",
+            run_at=run_at,
+            policy=policy,
+        )
+        return
+    
+    success, message = scheduler.add(action, run_at, policy)
+    await update.message.reply_text(message)
+
+
 async def send_confirmation(
     update: Update, 
     command: str, 
-    action_description: str
+    action_description: str,
+    **payload
 ) -> None:
-    """Send confirmation buttons for dangerous commands."""
+    """Send one-time, expiring confirmation buttons for dangerous commands."""
+    nonce = confirmations.create(update.effective_user.id, command, **payload)
     keyboard = [
         [
-            InlineKeyboardButton("✅ Yes, do it", callback_data=f"confirm_{command}"),
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel"),
+            InlineKeyboardButton("✅ Yes, do it", callback_data=f"confirm:{nonce}"),
+            InlineKeyboardButton("❌ Cancel", callback_data=f"cancel:{nonce}"),
         ]
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await update.message.reply_text(
+    # effective_message: also works when called from a panel button
+    sent = await update.effective_message.reply_text(
         f"⚠️ **Confirmation Required**\n\n"
-        f"Are you sure you want to {action_description}?",
+        f"Are you sure you want to {action_description}?\n"
+        f"_Expires in {config.CONFIRM_TTL}s_",
         reply_markup=reply_markup,
         parse_mode="Markdown"
     )
+    confirmations.attach(nonce, sent.chat_id, sent.message_id)
 
 
 # =============================================================================
 # BASIC COMMANDS
 # =============================================================================
 
-@authorized_only
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle /start command."""
+async def send_welcome(update: Update) -> None:
+    """Reply with the welcome text and command list (shared by /start and /help).
+    
+    Undecorated, so /help doesn't run the ACL check, rate limiter and
+    audit entry a second time under the name "start".
+    """
     user = update.effective_user
     
     welcome_message = f"""
@@ -60,36 +153,24 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
 **Available Commands:**
 
-🔐 **Power Controls**
-├ /lock - Lock screen
-├ /sleep - Sleep mode
-├ /shutdown - Shutdown PC
-└ /restart - Restart PC
-
-📊 **Status**
-└ /status - CPU, RAM, Battery info
-
-📸 **Display**
-├ /screenshot - Capture screen
-└ /brightness `[0-100]` - Set brightness
-
-🔊 **Audio**
-├ /volume `[0-100]` - Set volume
-├ /mute - Mute audio
-└ /unmute - Unmute audio
-
-ℹ️ /help - Show this message
+{registry.help_text()}
 
 🛡️ Device: `{config.DEVICE_NAME}`
 """
-    
+
     await update.message.reply_text(welcome_message, parse_mode="Markdown")
 
 
+@authorized_only
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /start command."""
+    await send_welcome(update)
+
+
 @authorized_only
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /help command."""
-    await start_command(update, context)
+    await send_welcome(update)
 
 
 # =============================================================================
@@ -99,6 +180,10 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @authorized_only
 async def lock_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /lock command."""
+    if context.args:
+        await schedule_action(update, "lock", context.args, "lock the screen")
+        return
+    
     if needs_confirmation("lock"):
         await send_confirmation(update, "lock", "lock the screen")
         return
@@ -110,6 +195,10 @@ async def lock_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @authorized_only
 async def sleep_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /sleep command."""
+    if context.args:
+        await schedule_action(update, "sleep", context.args, "put the computer to sleep")
+        return
+    
     if needs_confirmation("sleep"):
         await send_confirmation(update, "sleep", "put the computer to sleep")
         return
@@ -121,6 +210,10 @@ async def sleep_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 @authorized_only
 async def shutdown_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /shutdown command."""
+    if context.args:
+        await schedule_action(update, "shutdown", context.args, "shutdown the computer")
+        return
+    
     if needs_confirmation("shutdown"):
         await send_confirmation(update, "shutdown", "shutdown the computer")
         return
@@ -132,6 +225,10 @@ async def shutdown_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 @authorized_only
 async def restart_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /restart command."""
+    if context.args:
+        await schedule_action(update, "restart", context.args, "restart the computer")
+        return
+    
     if needs_confirmation("restart"):
         await send_confirmation(update, "restart", "restart the computer")
         return
@@ -140,6 +237,64 @@ async def restart_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(message)
 
 
+@authorized_only
+async def schedules_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /schedules command."""
+    jobs = scheduler.list_jobs()
+    
+    if not jobs:
+        await update.message.reply_text("📭 No scheduled actions")
+        return
+    
+    lines = ["⏰ **Scheduled Actions**", ""]
+    for job in jobs:
+        when = datetime.fromtimestamp(job["run_at"]).strftime("%Y-%m-%d %H:%M")
+        lines.append(f"`#{job['id']}` {job['action']} at {when} (missed: {job['missed_policy']})")
+    
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+
+
+@authorized_only
+async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /cancel command."""
+    if not context.args:
+        # No ID: abort a pending OS-level shutdown/restart countdown
+        success, message = await power.cancel_shutdown()
+        await update.message.reply_text(message)
+        return
+    
+    success, message = scheduler.cancel(context.args[0].lstrip("#"))
+    await update.message.reply_text(message)
+
+
+@authorized_only
+async def idle_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /idle command."""
+    args = context.args
+    
+    if not args:
+        await update.message.reply_text(idle_monitor.get_status(), parse_mode="Markdown")
+        return
+    
+    # /idle lock 10, /idle sleep 30, /idle lock off
+    if len(args) != 2:
+        await update.message.reply_text("❌ Usage: /idle [lock|sleep] [minutes|off]")
+        return
+    
+    policy, value = args[0].lower(), args[1].lower()
+    if value == "off":
+        minutes = None
+    else:
+        try:
+            minutes = int(value)
+        except ValueError:
+            await update.message.reply_text("❌ Please provide minutes or 'off'")
+            return
+    
+    success, message = idle_monitor.set_policy(policy, minutes)
+    await update.message.reply_text(message)
+
+
 # =============================================================================
 # STATUS COMMANDS
 # =============================================================================
@@ -153,6 +308,78 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(message, parse_mode="Markdown")
 
 
+@authorized_only
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /stats command."""
+    window = context.args[0].lower() if context.args else next(iter(config.METRICS_WINDOWS))
+    if window not in config.METRICS_WINDOWS:
+        await update.message.reply_text(
+            f"❌ Usage: /stats [{'|'.join(config.METRICS_WINDOWS)}]"
+        )
+        return
+    
+    await update.message.reply_text(metrics.get_summary(window), parse_mode="Markdown")
+
+
+@authorized_only
+async def logs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /logs command: /logs [2h] [error] [module=system.power] [text]."""
+    level = module = start = None
+    words = []
+    for arg in context.args or []:
+        if arg.upper() in LEVELS and level is None:
+            level = arg.upper()
+        elif arg.lower().startswith("module="):
+            module = arg.split("=", 1)[1]
+        elif start is None and arg[-1:].isalpha() and parse_duration(arg) is not None:
+            start = (datetime.now() - timedelta(seconds=parse_duration(arg))).strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            words.append(arg)
+    
+    try:
+        result = await log_search.search(" ".join(words), level=level, module=module, start=start, limit=15)
+    except Exception as e:
+        logger.error(f"Error searching logs: {e}")
+        await update.message.reply_text(f"❌ Failed to search logs: {e}")
+        return
+    
+    lines = [
+        f"🔎 {len(result['results'])} match(es) - scanned {result['scanned']} of "
+        f"{result['segments']} log segment(s), {result['skipped']} skipped by the index "
+        f"({result['elapsed_ms']:.0f}ms)",
+    ]
+    for entry in result["results"]:
+        lines.append(f"\n{entry['time']} {entry['level']} {entry['module']}\n{entry['message'][:200]}")
+    if not result["results"]:
+        lines.append("\nNo matching log lines. Try /logs 24h error shutdown")
+    
+    await update.message.reply_text("\n".join(lines)[:4000])
+
+
+@authorized_only
+async def tail_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /tail command: /tail [level] [module=name] or /tail stop."""
+    args = context.args or []
+    if args and args[0].lower() == "stop":
+        if not await tails.stop(update.effective_chat.id):
+            await update.message.reply_text("📭 No tail running")
+        return
+    
+    level = module = None
+    for arg in args:
+        if arg.upper() in LEVELS:
+            level = arg.upper()
+        elif arg.lower().startswith("module="):
+            module = arg.split("=", 1)[1]
+        else:
+            await update.message.reply_text(
+                f"❌ Usage: /tail [{'|'.join(name.lower() for name in LEVELS)}] [module=name] or /tail stop"
+            )
+            return
+    
+    await tails.open(context.bot, update.effective_chat.id, level, module)
+
+
 # =============================================================================
 # DISPLAY COMMANDS
 # =============================================================================
@@ -169,6 +396,41 @@ async def screenshot_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             photo=io.BytesIO(image_bytes),
             caption="🖥️ Screenshot captured"
         )
+        await archive.add(image_bytes)
+    else:
+        await update.message.reply_text(message)
+
+
+@authorized_only
+async def record_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /record command."""
+    args = context.args
+    
+    try:
+        seconds = int(args[0]) if args else 5
+    except ValueError:
+        await update.message.reply_text(
+            f"❌ Please provide a number of seconds (1-{config.RECORD_MAX_SECONDS})"
+        )
+        return
+    
+    await update.message.reply_text(f"🎥 Recording {seconds} seconds...")
+    
+    success, message, data, fmt = await recorder.record(seconds)
+    
+    if success and data:
+        if fmt == "mp4":
+            await update.message.reply_video(
+                video=io.BytesIO(data),
+                caption=message,
+                filename="recording.mp4"
+            )
+        else:
+            await update.message.reply_animation(
+                animation=io.BytesIO(data),
+                caption=message,
+                filename="recording.gif"
+            )
     else:
         await update.message.reply_text(message)
 
@@ -207,12 +469,69 @@ async def volume_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text(message)
         return
     
+    # /volume spotify 20 (anything that isn't a number, so "-5" still clamps to 0)
     try:
         level = int(args[0])
-        success, message = await audio.set_volume(level)
+    except ValueError:
+        try:
+            level = int(args[1])
+        except (IndexError, ValueError):
+            await update.message.reply_text("❌ Usage: /volume [app] [0-100]")
+            return
+        
+        success, message = await audio.set_app_volume(args[0], level)
+        await update.message.reply_text(message)
+        return
+    
+    # /volume 80 over 5s
+    if len(args) >= 3 and args[1].lower() == "over":
+        duration = parse_duration(args[2])
+        if duration is None or duration > config.VOLUME_FADE_MAX_SECONDS:
+            await update.message.reply_text(
+                f"❌ Please provide a duration up to {config.VOLUME_FADE_MAX_SECONDS}s (e.g. 5s, 2m)"
+            )
+            return
+        
+        success, message = await audio.ramp_volume(level, duration)
         await update.message.reply_text(message)
+        return
+    
+    success, message = await audio.set_volume(level)
+    await update.message.reply_text(message)
+
+
+@authorized_only
+async def apps_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /apps command."""
+    success, message = await audio.list_apps()
+    await update.message.reply_text(message, parse_mode="Markdown")
+
+
+@authorized_only
+async def fade_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /fade command."""
+    args = context.args
+    
+    if not args:
+        await update.message.reply_text("❌ Usage: /fade [0-100] [seconds]")
+        return
+    
+    try:
+        level = int(args[0])
     except ValueError:
         await update.message.reply_text("❌ Please provide a number between 0-100")
+        return
+    
+    duration = parse_duration(args[1]) if len(args) > 1 else config.VOLUME_FADE_DEFAULT_SECONDS
+    if duration is None or duration > config.VOLUME_FADE_MAX_SECONDS:
+        await update.message.reply_text(
+            f"❌ Please provide a duration up to {config.VOLUME_FADE_MAX_SECONDS}s (e.g. 5s, 2m)"
+        )
+        return
+    
+    await update.message.reply_text(f"🎚️ Fading volume to {max(0, min(100, level))}%...")
+    success, message = await audio.ramp_volume(level, duration)
+    await update.message.reply_text(message)
 
 
 @authorized_only
@@ -229,38 +548,297 @@ async def unmute_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(message)
 
 
+# =============================================================================
+# PANEL COMMANDS
+# =============================================================================
+
+@authorized_only
+async def panel_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /panel command."""
+    await panels.open(context.bot, update.effective_chat.id)
+
+
+@log_callback
+async def panel_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[bool]:
+    """Handle live panel buttons (panel:<command>:<argument>)."""
+    query = update.callback_query
+    _, command, argument = query.data.split(":", 2)
+    
+    panel = panels.get(query.message.chat_id, query.message.message_id)
+    if panel is None:
+        await query.answer("This panel is no longer active, send /panel", show_alert=True)
+        return False
+    
+    if command == "close":
+        await query.answer()
+        await panels.close(query.message.chat_id)
+        return
+    
+    if command == "refresh":
+        success, message = True, "🔄 Refreshing..."
+    elif command in ("lock", "sleep"):
+        if needs_confirmation(command):
+            await query.answer()
+            description = "lock the screen" if command == "lock" else "put the computer to sleep"
+            await send_confirmation(update, command, description)
+            return
+        success, message = await registry.run_action(command)
+    elif command == "volume":
+        _, _, level = await audio.get_volume()
+        success, message = await audio.set_volume(max(0, min(100, level + int(argument))))
+    elif command == "mute":
+        _, muted = await audio.is_muted()
+        success, message = await (audio.unmute() if muted else audio.mute())
+    elif command == "brightness":
+        _, _, level = await display.get_brightness()
+        success, message = await display.set_brightness(max(0, min(100, level + int(argument))))
+    else:
+        success, message = False, "❌ Unknown action"
+    
+    await query.answer(message[:200])
+    panels.touch(panel)
+    return success
+
+
+# =============================================================================
+# MACRO COMMANDS
+# =============================================================================
+
+async def run_steps(update: Update, text: str, description: str) -> None:
+    """Parse and run macro steps, confirming first if any step requires it."""
+    steps, error = macros.parse(text)
+    if error:
+        await update.message.reply_text(error)
+        return
+    
+    user_id = update.effective_user.id
+    denied = sorted({step.name for step in steps if not acl.can(user_id, step.name)})
+    if denied:
+        acl.record_denied("do")
+        await update.message.reply_text(f"⛔ Your role does not allow: {', '.join(denied)}")
+        return
+    
+    if any(needs_confirmation(step.name) for step in steps):
+        await send_confirmation(update, "do", description, steps=text)
+        return
+    
+    success, message = await macros.run(steps)
+    await update.message.reply_text(message)
+
+
+@authorized_only
+async def do_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /do command."""
+    text = " ".join(context.args)
+    await run_steps(update, text, f"run: {text}")
+
+
+@authorized_only
+async def macro_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /macro command."""
+    args = context.args
+    
+    if not args:
+        await update.message.reply_text(macros.get_summary())
+        return
+    
+    # /macro del name
+    if args[0].lower() == "del" and len(args) == 2:
+        success, message = macros.delete(args[1])
+        await update.message.reply_text(message)
+        return
+    
+    # /macro name = mute; brightness 10; lock
+    text = " ".join(args)
+    if "=" in text:
+        name, _, steps = text.partition("=")
+        success, message = macros.define(name.strip(), steps)
+        await update.message.reply_text(message)
+        return
+    
+    name = args[0].lower()
+    if name not in macros.macros:
+        await update.message.reply_text(f"❌ No macro named '{name}'")
+        return
+    
+    await run_steps(update, macros.macros[name], f"run macro '{name}'")
+
+
+# =============================================================================
+# FILE COMMANDS
+# =============================================================================
+
+def ls_view(listing) -> Tuple[str, InlineKeyboardMarkup]:
+    """Text and buttons for one page of /ls (ls:<token>:<page>:<sort>)."""
+    def data(path, page=0, sort=listing.sort) -> str:
+        return f"ls:{browser.token(path)}:{page}:{sort}"
+    
+    rows = []
+    for entry in listing.entries:
+        path = listing.path / entry.name
+        target = data(path) if listing.is_folder(entry) else f"ls:{browser.token(path)}:file:"
+        rows.append([InlineKeyboardButton(listing.label(entry), callback_data=target)])
+    
+    nav = []
+    if listing.parent is not None:
+        nav.append(InlineKeyboardButton("⬆️ Up", callback_data=data(listing.parent)))
+    if listing.page > 0:
+        nav.append(InlineKeyboardButton("◀️", callback_data=data(listing.path, listing.page - 1)))
+    if listing.page < listing.pages - 1:
+        nav.append(InlineKeyboardButton("▶️", callback_data=data(listing.path, listing.page + 1)))
+    if nav:
+        rows.append(nav)
+    
+    sorts = (("name", "🔤 Name"), ("size", "📏 Size"), ("date", "🕒 Date"))
+    rows.append([
+        InlineKeyboardButton(
+            ("• " if sort == listing.sort else "") + label,
+            callback_data=data(listing.path, 0, sort),
+        )
+        for sort, label in sorts
+    ])
+    
+    text = (
+        f"📂 {listing.path}\n"
+        f"{listing.total} items · page {listing.page + 1}/{listing.pages} · by {listing.sort}"
+    )
+    return text, InlineKeyboardMarkup(rows)
+
+
+@authorized_only
+async def ls_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /ls command."""
+    path = " ".join(context.args) if context.args else str(browser.default_path())
+    listing, error = await browser.list(path)
+    if error:
+        await update.message.reply_text(error)
+        return
+    
+    text, keyboard = ls_view(listing)
+    await update.message.reply_text(text, reply_markup=keyboard)
+
+
+@log_callback
+async def ls_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[bool]:
+    """Handle /ls navigation buttons."""
+    query = update.callback_query
+    _, token, page, sort = query.data.split(":", 3)
+    
+    path = browser.path_for(token)
+    if path is None:
+        await query.answer("This listing is too old, send /ls again", show_alert=True)
+        return False
+    
+    if page == "file":
+        await query.answer()
+        await query.message.reply_text(f"📄 {path}\n\nDownload: /getfile {path}")
+        return
+    
+    listing, error = await browser.list(str(path), int(page), sort)
+    if error:
+        await query.answer(error[:200], show_alert=True)
+        return False
+    
+    await query.answer()
+    text, keyboard = ls_view(listing)
+    try:
+        await query.edit_message_text(text, reply_markup=keyboard)
+    except BadRequest as e:
+        # Same page tapped again: nothing to change
+        if "not modified" not in str(e).lower():
+            raise
+
+
+@authorized_only
+async def getfile_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /getfile command."""
+    if not context.args:
+        await update.message.reply_text("❌ Usage: /getfile <path>")
+        return
+    
+    path, error = transfer.check(" ".join(context.args))
+    if error:
+        await update.message.reply_text(error)
+        return
+    
+    stats = transfer.begin(path)
+    note = " (gzip)" if stats.compressed else ""
+    await update.message.reply_text(f"⏳ Sending {path.name} ({stats.size / 1024 / 1024:.1f} MB){note}...")
+    
+    try:
+        async for part, number in transfer.parts(path, stats):
+            # Stream the part from disk instead of reading it into memory
+            with open(part, "rb") as handle:
+                await context.bot.send_document(
+                    update.effective_chat.id,
+                    document=InputFile(
+                        handle,
+                        filename=transfer.part_name(stats, number),
+                        read_file_handle=False,
+                    ),
+                    caption=None if transfer.is_single_part(stats) else f"Part {number}",
+                    write_timeout=config.FILE_UPLOAD_TIMEOUT,
+                )
+    except Exception as e:
+        logger.error(f"File transfer failed for {path}: {e}")
+        await update.message.reply_text(f"❌ Transfer failed after {stats.parts} part(s): {e}")
+        return
+    
+    summary = stats.describe()
+    if stats.parts > 1:
+        summary += "\n\n🧩 Join the parts with `copy /b name.001+name.002 name` (Windows) or `cat name.* > name`"
+    await update.message.reply_text(summary)
+
+
+# =============================================================================
+# ACCESS CONTROL COMMANDS
+# =============================================================================
+
+@authorized_only
+async def acl_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /acl command."""
+    if context.args and context.args[0].lower() == "reload":
+        acl.compile()
+    
+    await update.message.reply_text(acl.get_summary(), parse_mode="Markdown")
+
+
 # =============================================================================
 # CALLBACK HANDLERS
 # =============================================================================
 
 @log_callback
 async def confirmation_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle confirmation button callbacks."""
+    """Handle confirmation button callbacks (returns the action's success)."""
     query = update.callback_query
     await query.answer()
     
-    data = query.data
+    kind, _, nonce = (query.data or "").partition(":")
     
-    if data == "cancel":
+    # Each button works once, only for whoever asked, and only until it expires
+    pending = confirmations.consume(nonce, update.effective_user.id)
+    if pending is None:
+        await query.edit_message_text("⌛ This confirmation has expired or was already used.")
+        return False
+    
+    if kind == "cancel":
         await query.edit_message_text("❌ Operation cancelled.")
         return
     
-    # Parse confirmation action
-    if data.startswith("confirm_"):
-        action = data.replace("confirm_", "")
-        
-        if action == "lock":
-            success, message = await power.lock_screen()
-        elif action == "sleep":
-            success, message = await power.sleep()
-        elif action == "shutdown":
-            success, message = await power.shutdown()
-        elif action == "restart":
-            success, message = await power.restart()
-        else:
-            message = "❌ Unknown action"
-        
-        await query.edit_message_text(message)
+    if "steps" in pending.payload:
+        # Macro: steps were validated when the confirmation was sent
+        steps, error = macros.parse(pending.payload["steps"])
+        success, message = await macros.run(steps) if not error else (False, error)
+    elif "run_at" in pending.payload:
+        # Scheduled action
+        success, message = scheduler.add(
+            pending.action, pending.payload["run_at"], pending.payload["policy"]
+        )
+    else:
+        success, message = await registry.run_action(pending.action)
+    
+    await query.edit_message_text(message)
+    return success
 
 
 # =============================================================================
@@ -0,0 +1,219 @@
+# REMO - Macros
+# Batches of control steps ("mute; brightness 10; lock") run in one go
+
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+import config
+from bot.registry import lazy_backend
+from utils.duration import parse_duration
+
+
+power = lazy_backend("system.power:power")
+audio = lazy_backend("system.audio:audio")
+display = lazy_backend("system.display:display")
+
+
+StepRunner = Callable[[], Awaitable[Tuple[bool, str]]]
+
+
+class MacroStep(NamedTuple):
+    """One parsed step, ready to run."""
+    text: str
+    name: str
+    resource: str   # Steps on different resources run concurrently
+    final: bool     # Runs after every other step (e.g. lock)
+    run: StepRunner
+
+
+class StepResult(NamedTuple):
+    step: MacroStep
+    success: bool
+    message: str
+    elapsed: float
+
+
+def _level(args: List[str]) -> int:
+    if not args or not args[0].isdigit():
+        raise ValueError("needs a level 0-100")
+    return int(args[0])
+
+
+def _fade(args: List[str]) -> StepRunner:
+    level = _level(args)
+    duration = parse_duration(args[1]) if len(args) > 1 else config.VOLUME_FADE_DEFAULT_SECONDS
+    if duration is None:
+        raise ValueError("needs a duration like 5s or 2m")
+    if duration > config.VOLUME_FADE_MAX_SECONDS:
+        raise ValueError(f"fade is limited to {config.VOLUME_FADE_MAX_SECONDS}s")
+    return lambda: audio.ramp_volume(level, duration)
+
+
+def _volume(args: List[str]) -> StepRunner:
+    level = _level(args)
+    return lambda: audio.set_volume(level)
+
+
+def _brightness(args: List[str]) -> StepRunner:
+    level = _level(args)
+    return lambda: display.set_brightness(level)
+
+
+# Step name -> (resource, final, builder(args) -> coroutine factory)
+STEPS: Dict[str, Tuple[str, bool, Callable[[List[str]], StepRunner]]] = {
+    "mute": ("audio", False, lambda args: lambda: audio.mute()),
+    "unmute": ("audio", False, lambda args: lambda: audio.unmute()),
+    "volume": ("audio", False, _volume),
+    "fade": ("audio", False, _fade),
+    "brightness": ("display", False, _brightness),
+    "lock": ("power", True, lambda args: lambda: power.lock_screen()),
+    "sleep": ("power", True, lambda args: lambda: power.sleep()),
+    "shutdown": ("power", True, lambda args: lambda: power.shutdown()),
+    "restart": ("power", True, lambda args: lambda: power.restart()),
+}
+
+
+class MacroBook:
+    """Named macros (persisted) plus the parser and runner for step lists.
+    
+    Steps are grouped by resource: each group runs in order, groups run
+    concurrently (audio and display don't wait on each other), and final
+    steps such as lock or shutdown run last, only if everything else
+    succeeded.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.macros: Dict[str, str] = {}
+        self._load()
+    
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            self.macros = json.loads(self.path.read_text(encoding="utf-8"))
+            logger.info(f"Loaded {len(self.macros)} macros")
+        except Exception as e:
+            logger.error(f"Failed to load macros: {e}")
+    
+    def _save(self) -> None:
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.macros, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.error(f"Failed to save macros: {e}")
+    
+    def parse(self, text: str) -> Tuple[List[MacroStep], Optional[str]]:
+        """Parse "mute; brightness 10; lock" into steps (or an error message)."""
+        steps = []
+        for part in filter(None, (part.strip() for part in text.split(";"))):
+            words = part.lstrip("/").split()
+            if not words:
+                continue  # A bare "/" step
+            name, args = words[0].lower(), words[1:]
+            if name not in STEPS:
+                return [], f"❌ Unknown step: {name} (use {', '.join(STEPS)})"
+            
+            resource, final, build = STEPS[name]
+            try:
+                run = build(args)
+            except ValueError as e:
+                return [], f"❌ {part}: {e}"
+            steps.append(MacroStep(part, name, resource, final, run))
+        
+        if not steps:
+            return [], "❌ No steps given (e.g. mute; brightness 10; lock)"
+        if len(steps) > config.MACRO_MAX_STEPS:
+            return [], f"❌ At most {config.MACRO_MAX_STEPS} steps per macro"
+        return steps, None
+    
+    def define(self, name: str, text: str) -> Tuple[bool, str]:
+        """Save a macro after checking that it parses."""
+        name = name.lower()
+        if not name.isidentifier():
+            return False, "❌ Macro names may only use letters, digits and _"
+        
+        steps, error = self.parse(text)
+        if error:
+            return False, error
+        
+        self.macros[name] = "; ".join(step.text for step in steps)
+        self._save()
+        logger.info(f"Macro '{name}' saved: {self.macros[name]}")
+        return True, f"✅ Macro '{name}' saved ({len(steps)} steps)"
+    
+    def delete(self, name: str) -> Tuple[bool, str]:
+        if self.macros.pop(name.lower(), None) is None:
+            return False, f"❌ No macro named '{name}'"
+        self._save()
+        return True, f"🗑️ Macro '{name}' deleted"
+    
+    async def _run_step(self, step: MacroStep) -> StepResult:
+        start = time.perf_counter()
+        try:
+            success, message = await step.run()
+        except Exception as e:
+            success, message = False, f"❌ {e}"
+        return StepResult(step, success, message, time.perf_counter() - start)
+    
+    async def run(self, steps: List[MacroStep]) -> Tuple[bool, str]:
+        """Run parsed steps and build one combined reply."""
+        start = time.perf_counter()
+        
+        chains: Dict[str, List[int]] = {}
+        for index, step in enumerate(steps):
+            if not step.final:
+                chains.setdefault(step.resource, []).append(index)
+        
+        results: List[Optional[StepResult]] = [None] * len(steps)
+        
+        async def run_chain(indexes: List[int]) -> None:
+            # Steps sharing a resource run one after another
+            for index in indexes:
+                results[index] = await self._run_step(steps[index])
+        
+        await asyncio.gather(*(run_chain(indexes) for indexes in chains.values()))
+        
+        # Final steps (lock, sleep, ...) only run once everything else succeeded
+        ok = all(result.success for result in results if result is not None)
+        for index, step in enumerate(steps):
+            if not step.final:
+                continue
+            if ok:
+                results[index] = await self._run_step(step)
+                ok = results[index].success
+            else:
+                results[index] = StepResult(step, False, "⏭️ Skipped (an earlier step failed)", 0.0)
+        
+        total = time.perf_counter() - start
+        summed = sum(result.elapsed for result in results)
+        success = all(result.success for result in results)
+        
+        lines = [f"{'✅' if success else '⚠️'} Ran {len(steps)} steps in {total * 1000:.0f}ms "
+                 f"(steps add up to {summed * 1000:.0f}ms)", ""]
+        for step, result in zip(steps, results):
+            icon = "✓" if result.success else "✗"
+            lines.append(f"{icon} {step.text} ({result.elapsed * 1000:.0f}ms): {result.message}")
+        
+        logger.info(f"Macro ran {len(steps)} steps in {total * 1000:.0f}ms, success={success}")
+        return success, "\n".join(lines)
+    
+    def get_summary(self) -> str:
+        """Formatted list of saved macros for /macro."""
+        if not self.macros:
+            return "📭 No macros yet. Define one with /macro name = mute; brightness 10; lock"
+        
+        lines = ["🧩 Macros", ""]
+        for name, text in sorted(self.macros.items()):
+            lines.append(f"▶️ {name}: {text}")
+        return "\n".join(lines)
+
+
+# Singleton instance
+macros = MacroBook(config.MACRO_FILE)
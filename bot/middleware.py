@@ -1,90 +1,118 @@
 # REMO - Bot Middleware
-# Authentication, rate limiting, and logging
+# Authentication, rate limiting, logging, and latency metrics
 
+import time
 from functools import wraps
 from typing import Callable, Any
-from collections import defaultdict
-from datetime import datetime, timedelta
 
 from telegram import Update
 from telegram.ext import ContextTypes
+from telegram.request import HTTPXRequest
 from loguru import logger
 
 import config
+from utils.ratelimit import create_limiter
+from utils.metrics import metrics
+from utils.audit import audit
+from bot.acl import acl
+from bot.confirmations import confirmations
 
 
-class RateLimiter:
-    """Simple rate limiter for commands."""
-    
-    def __init__(self, max_calls: int, window_seconds: int):
-        self.max_calls = max_calls
-        self.window = timedelta(seconds=window_seconds)
-        self.calls: dict[int, list[datetime]] = defaultdict(list)
-    
-    def is_allowed(self, user_id: int) -> bool:
-        """Check if user is allowed to make a call."""
-        now = datetime.now()
-        cutoff = now - self.window
-        
-        # Remove old calls
-        self.calls[user_id] = [
-            call_time for call_time in self.calls[user_id]
-            if call_time > cutoff
-        ]
-        
-        # Check if under limit
-        if len(self.calls[user_id]) < self.max_calls:
-            self.calls[user_id].append(now)
-            return True
-        
-        return False
+# Global rate limiter instance (keyed by user ID)
+rate_limiter = create_limiter(
+    config.RATE_LIMIT_ALGORITHM,
+    limit=config.RATE_LIMIT_COMMANDS,
+    window=config.RATE_LIMIT_WINDOW,
+    max_keys=config.RATE_LIMIT_MAX_KEYS,
+)
+
+
+class TimedRequest(HTTPXRequest):
+    """Bot API transport that attributes request time to the running command."""
     
-    def reset(self, user_id: int):
-        """Reset rate limit for a user."""
-        self.calls[user_id] = []
+    async def do_request(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().do_request(*args, **kwargs)
+        finally:
+            metrics.add_reply_time(time.perf_counter() - start)
 
 
-# Global rate limiter instance
-rate_limiter = RateLimiter(
-    max_calls=config.RATE_LIMIT_COMMANDS,
-    window_seconds=config.RATE_LIMIT_WINDOW
-)
+def command_name(update: Update) -> str:
+    """Get the command name from an update ("/volume@remo_bot 50" -> "volume")."""
+    if not update.message or not update.message.text:
+        return "callback"
+    first = update.message.text.split(maxsplit=1)[0]
+    return first.lstrip("/").split("@", 1)[0].lower()
+
+
+def _message_text(update: Update) -> str:
+    return update.message.text if update.message and update.message.text else "callback"
 
 
 def authorized_only(func: Callable) -> Callable:
-    """Decorator to restrict access to authorized user only."""
+    """Decorator to restrict access to users whose role allows the command."""
+    
+    # Resolve the permission bit once, at decoration time
+    command_key = func.__name__.removesuffix("_command")
+    permission_bit = acl.bit_for(command_key)
     
     @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs) -> Any:
+        start = time.perf_counter()
         user = update.effective_user
         
         if user is None:
             logger.warning("Received update without user")
             return
         
-        # Check if user is authorized
-        if user.id != config.TELEGRAM_USER_ID:
-            logger.warning(
-                f"Unauthorized access attempt from user {user.id} (@{user.username})"
-            )
-            await update.message.reply_text(
-                "⛔ Access denied. You are not authorized to use this bot."
-            )
+        # Check if user is authorized (one dict lookup + one bit test)
+        if not acl.is_allowed(user.id, permission_bit):
+            acl.record_denied(command_key)
+            audit.record(user.id, command_key, "denied", detail=_message_text(update))
+            if not acl.is_known(user.id):
+                logger.warning(
+                    f"Unauthorized access attempt from user {user.id} (@{user.username})"
+                )
+                await update.message.reply_text(
+                    "⛔ Access denied. You are not authorized to use this bot."
+                )
+            else:
+                logger.warning(
+                    f"User {user.id} (@{user.username}, {acl.role_of(user.id)}) "
+                    f"denied /{command_key}"
+                )
+                await update.message.reply_text(
+                    f"⛔ Your role does not allow /{command_key}."
+                )
             return
         
-        # Check rate limit
-        if not rate_limiter.is_allowed(user.id):
+        # Check rate limit (heavier commands cost more)
+        cost = config.COMMAND_COSTS.get(command_name(update), 1)
+        if not rate_limiter.is_allowed(user.id, cost):
             logger.warning(f"Rate limit exceeded for user {user.id}")
+            audit.record(user.id, command_key, "rate_limited", detail=_message_text(update))
             await update.message.reply_text(
                 "⚠️ Too many commands. Please wait a moment."
             )
             return
         
         # Log command
-        command = update.message.text if update.message else "callback"
+        command = _message_text(update)
         logger.info(f"Command from {user.id} (@{user.username}): {command}")
         
-        return await func(update, context, *args, **kwargs)
+        # Time the handler; Telegram API time is collected by TimedRequest
+        timer = metrics.start_command(command_key)
+        handler_start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await func(update, context, *args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            end = time.perf_counter()
+            metrics.finish_command(timer, auth=handler_start - start, handler=end - handler_start)
+            audit.record(user.id, command_key, outcome, latency=end - start, detail=command)
     
     return wrapper
 
@@ -100,16 +128,44 @@ def log_callback(func: Callable) -> Callable:
         if user is None or query is None:
             return
         
-        # Check authorization
-        if user.id != config.TELEGRAM_USER_ID:
+        # Check authorization: confirming needs permission for the pending
+        # action, a panel button (panel:<command>:<arg>) for its command,
+        # an /ls button (ls:<token>:<page>:<sort>) for /ls
+        data = query.data or ""
+        kind, _, rest = data.partition(":")
+        action = None
+        if kind == "confirm":
+            pending = confirmations.peek(rest)
+            action = pending.action if pending else None
+        elif kind == "panel":
+            command = rest.split(":", 1)[0]
+            action = "panel" if command in ("refresh", "close") else command
+        elif kind == "ls":
+            action = "ls"
+        allowed = acl.can(user.id, action) if action else acl.is_known(user.id)
+        
+        if not allowed:
+            acl.record_denied(action or "callback")
+            audit.record(user.id, action or "callback", "denied", source="callback", detail=data)
             logger.warning(
-                f"Unauthorized callback from user {user.id} (@{user.username})"
+                f"Unauthorized callback from user {user.id} (@{user.username}): {data}"
             )
             await query.answer("⛔ Access denied", show_alert=True)
             return
         
         logger.info(f"Callback from {user.id}: {query.data}")
         
-        return await func(update, context, *args, **kwargs)
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await func(update, context, *args, **kwargs)
+            # Callbacks that run an action return its success flag
+            outcome = "failed" if result is False else "ok"
+            return result
+        finally:
+            audit.record(
+                user.id, action or data, outcome,
+                latency=time.perf_counter() - start, source="callback", detail=data,
+            )
     
     return wrapper
@@ -0,0 +1,192 @@
+# REMO - Live Control Panel
+# One self-updating message with status and control buttons (/panel)
+
+import time
+import asyncio
+from typing import Dict, Optional
+
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from loguru import logger
+
+import config
+from bot.registry import lazy_backend
+
+
+audio = lazy_backend("system.audio:audio")
+display = lazy_backend("system.display:display")
+status = lazy_backend("system.status:status")
+
+
+def panel_keyboard() -> InlineKeyboardMarkup:
+    """Buttons carry panel:<command>:<argument>; the ACL checks <command>."""
+    def button(label: str, data: str) -> InlineKeyboardButton:
+        return InlineKeyboardButton(label, callback_data=f"panel:{data}")
+    
+    return InlineKeyboardMarkup([
+        [button("🔒 Lock", "lock:"), button("😴 Sleep", "sleep:")],
+        [button("🔉 -10", "volume:-10"), button("🔇 Mute", "mute:"), button("🔊 +10", "volume:+10")],
+        [button("🔅 -10", "brightness:-10"), button("🔆 +10", "brightness:+10")],
+        [button("🔄 Refresh", "refresh:"), button("✖️ Close", "close:")],
+    ])
+
+
+class LivePanel:
+    """State of one panel message and its refresh task."""
+    
+    def __init__(self, bot: Bot, chat_id: int, message_id: int):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.last_text = ""
+        self.last_activity = time.monotonic()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        
+        # API call accounting
+        self.renders = 0
+        self.edits = 0
+
+
+class PanelManager:
+    """Keeps at most one live panel per chat.
+    
+    Each panel re-renders every PANEL_REFRESH_INTERVAL seconds (or right
+    after a button press) and only calls edit_message_text when the text
+    actually changed. Values are rounded so noise doesn't force edits. After
+    PANEL_IDLE_TIMEOUT seconds without a button press the panel pauses
+    until Refresh is tapped.
+    """
+    
+    def __init__(self):
+        self._panels: Dict[int, LivePanel] = {}
+    
+    async def render(self, live: bool = True) -> str:
+        """Build the status block shown in the panel."""
+        cpu, memory, battery = await asyncio.gather(
+            status.get_cpu_percent(),
+            status.get_memory_info(),
+            status.get_battery_info(),
+        )
+        volume_ok, _, volume = await audio.get_volume()
+        muted_ok, muted = await audio.is_muted()
+        brightness_ok, _, brightness = await display.get_brightness()
+        
+        # Round to steps so tiny fluctuations don't trigger an edit
+        cpu_step = round(cpu / 5) * 5
+        lines = [
+            "🎛️ **REMO Panel**",
+            "",
+            f"🖥️ **CPU:** ~{cpu_step:.0f}%  🧠 **RAM:** {memory['percent']:.0f}%",
+        ]
+        if battery:
+            plug = "🔌" if battery["plugged"] else "🔋"
+            lines.append(f"{plug} **Battery:** {battery['percent']}%")
+        
+        volume_text = f"{volume}%" if volume_ok else "N/A"
+        if muted_ok and muted:
+            volume_text += " (muted)"
+        lines.append(f"🔊 **Volume:** {volume_text}")
+        lines.append(f"🔆 **Brightness:** {brightness}%" if brightness_ok else "🔆 **Brightness:** N/A")
+        lines.append("")
+        lines.append("🟢 Live" if live else "⏸️ Paused (tap Refresh to resume)")
+        return "\n".join(lines)
+    
+    async def _update(self, panel: LivePanel, live: bool = True) -> None:
+        """Re-render and edit the message only if the text changed."""
+        text = await self.render(live)
+        panel.renders += 1
+        if text == panel.last_text:
+            return
+        
+        await panel.bot.edit_message_text(
+            text,
+            chat_id=panel.chat_id,
+            message_id=panel.message_id,
+            reply_markup=panel_keyboard(),
+            parse_mode="Markdown",
+        )
+        panel.last_text = text
+        panel.edits += 1
+    
+    async def _run(self, panel: LivePanel) -> None:
+        """Refresh loop for one panel."""
+        try:
+            while time.monotonic() - panel.last_activity < config.PANEL_IDLE_TIMEOUT:
+                try:
+                    await self._update(panel)
+                except BadRequest as e:
+                    logger.warning(f"Panel edit failed, stopping: {e}")
+                    return
+                except Exception as e:
+                    logger.error(f"Panel refresh error: {e}")
+                
+                try:
+                    await asyncio.wait_for(panel.wakeup.wait(), config.PANEL_REFRESH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                panel.wakeup.clear()
+            
+            await self._update(panel, live=False)
+        except Exception as e:
+            logger.error(f"Panel pause failed: {e}")
+        finally:
+            logger.info(
+                f"Panel {panel.message_id} stopped: {panel.renders} renders, {panel.edits} edits "
+                f"({panel.renders - panel.edits} skipped)"
+            )
+    
+    def _start(self, panel: LivePanel) -> None:
+        panel.last_activity = time.monotonic()
+        if panel.task is None or panel.task.done():
+            panel.task = asyncio.get_running_loop().create_task(self._run(panel))
+        else:
+            panel.wakeup.set()
+    
+    async def open(self, bot: Bot, chat_id: int) -> None:
+        """Post a new panel, closing any previous one in this chat."""
+        await self.close(chat_id)
+        
+        text = await self.render()
+        message = await bot.send_message(
+            chat_id, text, reply_markup=panel_keyboard(), parse_mode="Markdown"
+        )
+        panel = LivePanel(bot, chat_id, message.message_id)
+        panel.last_text = text
+        self._panels[chat_id] = panel
+        self._start(panel)
+    
+    def get(self, chat_id: int, message_id: int) -> Optional[LivePanel]:
+        panel = self._panels.get(chat_id)
+        return panel if panel is not None and panel.message_id == message_id else None
+    
+    def touch(self, panel: LivePanel) -> None:
+        """Register activity: refresh now and keep (or resume) the panel live."""
+        self._start(panel)
+    
+    async def close(self, chat_id: int) -> None:
+        """Stop a chat's panel and replace its buttons with a closed note."""
+        panel = self._panels.pop(chat_id, None)
+        if panel is None:
+            return
+        if panel.task is not None:
+            panel.task.cancel()
+        try:
+            await panel.bot.edit_message_text(
+                "🎛️ Panel closed. Send /panel to open a new one.",
+                chat_id=panel.chat_id,
+                message_id=panel.message_id,
+            )
+        except Exception as e:
+            logger.debug(f"Could not close panel message: {e}")
+    
+    async def close_all(self) -> None:
+        """Close every panel and wait for its refresh task (on shutdown, before the bot stops)."""
+        tasks = [panel.task for panel in self._panels.values() if panel.task is not None]
+        for chat_id in list(self._panels):
+            await self.close(chat_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Singleton instance
+panels = PanelManager()
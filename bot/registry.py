@@ -0,0 +1,142 @@
+# REMO - Command Registry
+# Registers declared commands and loads their handlers/backends on first use
+
+import time
+import asyncio
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import Application, CommandHandler, ContextTypes
+from loguru import logger
+
+from bot.commands import COMMANDS, SECTIONS, CommandSpec
+
+
+def _resolve(path: str) -> Any:
+    """Resolve "module:attr.attr" to an object, importing the module."""
+    module_name, _, attributes = path.partition(":")
+    target = importlib.import_module(module_name)
+    for attribute in filter(None, attributes.split(".")):
+        target = getattr(target, attribute)
+    return target
+
+
+class LazyBackend:
+    """Stand-in for a system singleton that imports its module on first use."""
+    
+    def __init__(self, path: str):
+        self._path = path
+        self._target: Any = None
+    
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+    
+    def load(self) -> Any:
+        if self._target is None:
+            self._target = _resolve(self._path)
+        return self._target
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+
+_backends: Dict[str, LazyBackend] = {}
+
+
+def lazy_backend(path: str) -> LazyBackend:
+    """Get the shared lazy proxy for a "module:singleton" path."""
+    backend = _backends.get(path)
+    if backend is None:
+        backend = LazyBackend(path)
+        _backends[path] = backend
+    return backend
+
+
+class CommandRegistry:
+    """Command table built from the declarations in bot/commands.py."""
+    
+    def __init__(self, specs: Tuple[CommandSpec, ...]):
+        self.specs: Dict[str, CommandSpec] = {spec.name: spec for spec in specs}
+        self._handlers: Dict[str, Callable] = {}
+        self._load_lock = asyncio.Lock()
+    
+    async def _load(self, spec: CommandSpec) -> Callable:
+        """Import a command's backends (off the event loop) and its handler."""
+        async with self._load_lock:
+            if spec.name in self._handlers:
+                return self._handlers[spec.name]
+            
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            for path in spec.backends:
+                backend = lazy_backend(path)
+                if not backend.loaded:
+                    # Heavy imports (pyautogui, pycaw, PIL) would stall the loop
+                    await loop.run_in_executor(None, backend.load)
+            
+            handler = _resolve(spec.handler_path)
+            self._handlers[spec.name] = handler
+            
+            elapsed = (time.perf_counter() - start) * 1000
+            backends = ", ".join(spec.backends) or "no backends"
+            logger.info(f"Loaded /{spec.name} ({backends}) in {elapsed:.0f}ms")
+            return handler
+    
+    def _dispatcher(self, spec: CommandSpec) -> Callable:
+        async def dispatch(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
+            handler = self._handlers.get(spec.name) or await self._load(spec)
+            return await handler(update, context)
+        
+        dispatch.__name__ = f"{spec.name}_dispatch"
+        return dispatch
+    
+    def register(self, application: Application) -> None:
+        """Add a CommandHandler for every declared command."""
+        for spec in self.specs.values():
+            application.add_handler(CommandHandler(spec.name, self._dispatcher(spec)))
+        logger.info(f"Registered {len(self.specs)} commands")
+    
+    async def run_action(self, name: str) -> Tuple[bool, str]:
+        """Run a command's confirmed action (e.g. confirm_shutdown)."""
+        spec = self.specs.get(name)
+        if spec is None or spec.action is None:
+            return False, "❌ Unknown action"
+        
+        path, _, method = spec.action.rpartition(".")
+        return await getattr(lazy_backend(path), method)()
+    
+    def help_text(self) -> str:
+        """Command list for /start and /help, grouped by section."""
+        blocks: List[str] = []
+        for section, title in SECTIONS:
+            lines = [line for spec in self.specs.values() if spec.section == section
+                     for line in spec.help]
+            if not lines:
+                continue
+            tree = [f"├ {line}" for line in lines[:-1]] + [f"└ {lines[-1]}"]
+            blocks.append("\n".join([title] + tree))
+        
+        other = [line for spec in self.specs.values() if spec.section is None for line in spec.help]
+        if other:
+            blocks.append("\n".join(other))
+        
+        return "\n\n".join(blocks)
+    
+    def close_backends(self) -> None:
+        """Close the backends that were actually loaded (on shutdown)."""
+        for path, backend in _backends.items():
+            if not backend.loaded:
+                continue
+            close: Optional[Callable] = getattr(backend, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                logger.error(f"Failed to close {path}: {e}")
+
+
+# Singleton instance
+registry = CommandRegistry(COMMANDS)
@@ -0,0 +1,130 @@
+# REMO - Live Log Tail
+# /tail: one message per chat that follows remo.log with batched edits
+
+import time
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from telegram import Bot
+from telegram.error import BadRequest, RetryAfter
+from loguru import logger
+
+import config
+from utils.logtail import log_tail, TailFollower
+
+
+class TailSession:
+    """State of one /tail message."""
+    
+    def __init__(self, bot: Bot, chat_id: int, message_id: int, header: str, follower: TailFollower):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.header = header
+        self.follower = follower
+        self.lines: Deque[str] = deque(maxlen=config.LOG_TAIL_LINES)
+        self.received = 0
+        self.edits = 0
+        self.task: Optional[asyncio.Task] = None
+    
+    def render(self, footer: str) -> str:
+        # Keep under Telegram's 4096 characters, dropping the oldest lines
+        body = "\n".join(line[:300] for line in self.lines) or "(waiting for new lines...)"
+        return f"{self.header}\n\n{body[-(3900 - len(self.header) - len(footer)):]}\n\n{footer}"
+
+
+class TailManager:
+    """At most one live tail per chat.
+    
+    New lines are collected as they are written and the message is edited
+    at most every LOG_TAIL_EDIT_INTERVAL seconds, showing the last
+    LOG_TAIL_LINES lines, so a burst of logging costs one edit instead of
+    one per line. Tails stop after LOG_TAIL_MAX_SECONDS or on /tail stop.
+    """
+    
+    def __init__(self):
+        self._sessions: Dict[int, TailSession] = {}
+    
+    async def _edit(self, session: TailSession, footer: str) -> None:
+        await session.bot.edit_message_text(
+            session.render(footer), chat_id=session.chat_id, message_id=session.message_id
+        )
+        session.edits += 1
+    
+    async def _run(self, session: TailSession) -> None:
+        deadline = time.monotonic() + config.LOG_TAIL_MAX_SECONDS
+        last_edit = 0.0
+        try:
+            while time.monotonic() < deadline:
+                lines = await session.follower.read(deadline - time.monotonic())
+                if session.follower.closed:
+                    return  # Shutting down
+                if not lines:
+                    continue
+                session.lines.extend(lines)
+                session.received += len(lines)
+                
+                # Batch: let more lines pile up until the next edit slot
+                wait = last_edit + config.LOG_TAIL_EDIT_INTERVAL - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    await self._edit(session, "🟢 Live - /tail stop to end")
+                except RetryAfter as e:
+                    await asyncio.sleep(e.retry_after)
+                except BadRequest as e:
+                    if "not modified" not in str(e).lower():
+                        logger.warning(f"Tail edit failed, stopping: {e}")
+                        return
+                last_edit = time.monotonic()
+            
+            await self._edit(session, "⏹️ Stopped (time limit). Send /tail to start again.")
+        except Exception as e:
+            logger.error(f"Tail error: {e}")
+        finally:
+            log_tail.unfollow(session.follower)
+            if self._sessions.get(session.chat_id) is session:
+                del self._sessions[session.chat_id]
+            logger.info(
+                f"Tail {session.message_id} ended: {session.received} lines in {session.edits} edits"
+            )
+    
+    async def open(self, bot: Bot, chat_id: int, level: Optional[str], module: Optional[str]) -> None:
+        """Start a tail in this chat, replacing any previous one."""
+        await self.stop(chat_id)
+        
+        filters = ", ".join(filter(None, [
+            f"level ≥ {level}" if level else "",
+            f"module {module}*" if module else "",
+        ]))
+        header = f"📜 Tail of {config.LOG_FILE.name}" + (f" ({filters})" if filters else "")
+        message = await bot.send_message(chat_id, f"{header}\n\n(waiting for new lines...)")
+        
+        session = TailSession(bot, chat_id, message.message_id, header, log_tail.follow(level, module))
+        self._sessions[chat_id] = session
+        session.task = asyncio.get_running_loop().create_task(self._run(session))
+    
+    async def stop(self, chat_id: int) -> bool:
+        """Stop this chat's tail; returns whether one was running."""
+        session = self._sessions.pop(chat_id, None)
+        if session is None:
+            return False
+        if session.task is not None:
+            session.task.cancel()
+        try:
+            await self._edit(session, "⏹️ Stopped. Send /tail to start again.")
+        except Exception as e:
+            logger.debug(f"Could not mark tail as stopped: {e}")
+        return True
+    
+    async def close_all(self) -> None:
+        """Stop every tail and wait for its task (on shutdown, before the bot stops)."""
+        tasks = [session.task for session in self._sessions.values() if session.task is not None]
+        for chat_id in list(self._sessions):
+            await self.stop(chat_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Singleton instance
+tails = TailManager()
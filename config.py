@@ -5,6 +5,8 @@ import secrets
 from pathlib import Path
 from dotenv import load_dotenv
 
+from bot.commands import COMMANDS
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,7 +23,7 @@ if not TELEGRAM_BOT_TOKEN:
         "See .env.example for reference."
     )
 
-# Your Telegram User ID (numeric) - ONLY this user can control the bot
+# Your Telegram User ID (numeric) - the owner, always has the admin role
 # Get your ID from @userinfobot on Telegram
 TELEGRAM_USER_ID = int(os.getenv("REMO_USER_ID", "0"))
 if TELEGRAM_USER_ID == 0:
@@ -32,6 +34,38 @@ if TELEGRAM_USER_ID == 0:
     )
 
 
+# =============================================================================
+# ACCESS CONTROL
+# =============================================================================
+
+# Roles: name -> commands the role may use ("*" = everything)
+ACL_ROLES = {
+    "admin": ["*"],
+    "operator": [
+        "start", "help", "status", "screenshot", "record", "lock",
+        "volume", "fade", "apps", "mute", "unmute", "brightness",
+        "schedules",
+    ],
+    "viewer": ["start", "help", "status"],
+}
+
+# Extra operators: Telegram user ID -> role
+# Example: REMO_ACL_USERS=111111111:operator,222222222:viewer
+ACL_USERS = {
+    int(user_id): role
+    for user_id, role in (
+        entry.split(":", 1)
+        for entry in os.getenv("REMO_ACL_USERS", "").split(",")
+        if ":" in entry
+    )
+}
+
+# Optional JSON file with {"roles": {...}, "users": {"<id>": "<role>"}};
+# changes are picked up without a restart
+ACL_FILE = Path(__file__).parent / "acl.json"
+ACL_RELOAD_INTERVAL = 5  # seconds
+
+
 # =============================================================================
 # WEBHOOK SETTINGS
 # =============================================================================
@@ -39,18 +73,18 @@ if TELEGRAM_USER_ID == 0:
 # Generate a static webhook secret (saved to file, won't change on restart)
 _SECRET_FILE = Path(__file__).parent / ".webhook_secret"
 
-def _get_or_create_webhook_secret() -> str:
-    """Get existing webhook secret or create new one."""
-    if _SECRET_FILE.exists():
-        return _SECRET_FILE.read_text().strip()
+def _get_or_create_secret(path: Path) -> str:
+    """Get existing secret from file or create new one."""
+    if path.exists():
+        return path.read_text().strip()
     else:
         new_secret = secrets.token_urlsafe(32)
-        _SECRET_FILE.write_text(new_secret)
+        path.write_text(new_secret)
         return new_secret
 
 WEBHOOK_SECRET = os.getenv(
     "REMO_WEBHOOK_SECRET", 
-    _get_or_create_webhook_secret()
+    _get_or_create_secret(_SECRET_FILE)
 )
 
 # Cloudflare Tunnel domain
@@ -73,21 +107,15 @@ WEBHOOK_URL = f"https://{WEBHOOK_DOMAIN}{WEBHOOK_PATH}"
 # =============================================================================
 # COMMAND CONFIRMATION SETTINGS
 # =============================================================================
-# Set to True to require confirmation before executing
-# Set to False to execute immediately
-
-CONFIRM_COMMANDS = {
-    "shutdown": True,
-    "restart": True,
-    "sleep": True,
-    "lock": False,
-    "screenshot": False,
-    "volume": False,
-    "mute": False,
-    "unmute": False,
-    "brightness": False,
-    "status": False,
-}
+# Generated from the command declarations in bot/commands.py
+# (set confirm=True there to require confirmation before executing)
+
+CONFIRM_COMMANDS = {spec.name: spec.confirm for spec in COMMANDS}
+
+# Confirmation buttons expire after this long and work only once
+CONFIRM_TTL = 60  # seconds
+CONFIRM_TICK = 1  # expiry timer resolution (seconds)
+CONFIRM_MAX_PENDING = 100  # oldest pending confirmation is expired beyond this
 
 # =============================================================================
 # DEVICE SETTINGS (for future multi-device support)
@@ -96,6 +124,134 @@ CONFIRM_COMMANDS = {
 DEVICE_ID = os.getenv("REMO_DEVICE_ID", "main-laptop")
 DEVICE_NAME = os.getenv("REMO_DEVICE_NAME", "Main Laptop")
 
+# =============================================================================
+# POWER SETTINGS
+# =============================================================================
+
+# Max seconds an OS command (shutdown, powercfg, ...) may run before it is killed
+POWER_COMMAND_TIMEOUT = 15
+
+# SetSuspendState only returns on resume or failure; if it is still running
+# after this many seconds the machine is considered to be suspending
+POWER_SUSPEND_CONFIRM_TIMEOUT = 2
+
+# Scheduled actions (/shutdown in 2h, /sleep at 23:30) are persisted here
+SCHEDULE_FILE = Path(__file__).parent / "schedules.json"
+
+# What to do with a job whose time passed while REMO/the machine was off:
+# "run" = execute as soon as possible, "skip" = drop it and notify
+SCHEDULE_MISSED_POLICY = {
+    "shutdown": "skip",
+    "restart": "skip",
+    "sleep": "skip",
+    "lock": "run",
+}
+
+# Jobs less than this late are never considered missed
+SCHEDULE_MISSED_GRACE = 300  # seconds
+
+# Max time the scheduler sleeps before re-checking the wall clock
+SCHEDULE_MAX_SLEEP = 60  # seconds
+
+# =============================================================================
+# IDLE POLICIES
+# =============================================================================
+
+# Idle source: "auto" (GetLastInputInfo on Windows, disabled elsewhere) or "fake" (for testing)
+IDLE_SOURCE = os.getenv("REMO_IDLE_SOURCE", "auto")
+
+# How often idle time is sampled
+IDLE_CHECK_INTERVAL = 15  # seconds
+
+# Minutes of idle time before acting (None = disabled); /idle changes
+# these at runtime and saves them to IDLE_POLICY_FILE
+IDLE_POLICY_DEFAULTS = {
+    "lock": None,   # Lock screen after N minutes idle
+    "sleep": None,  # Sleep after N minutes idle, only on battery
+}
+IDLE_POLICY_FILE = Path(__file__).parent / "idle_policies.json"
+
+# =============================================================================
+# CONTROL PANEL
+# =============================================================================
+
+# /panel re-renders this often and edits the message only when it changed
+PANEL_REFRESH_INTERVAL = int(os.getenv("REMO_PANEL_REFRESH_INTERVAL", "10"))  # seconds
+
+# Stop refreshing after this long without a button press
+PANEL_IDLE_TIMEOUT = 300  # seconds
+
+# =============================================================================
+# MACROS
+# =============================================================================
+
+# Saved /macro definitions ("name": "mute; brightness 10; lock")
+MACRO_FILE = Path(__file__).parent / "macros.json"
+MACRO_MAX_STEPS = 10
+
+# =============================================================================
+# DISPLAY SETTINGS
+# =============================================================================
+
+# Cached brightness is trusted for this long before re-reading the hardware
+# (catches changes made outside REMO, e.g. keyboard brightness keys)
+BRIGHTNESS_CACHE_TTL = int(os.getenv("REMO_BRIGHTNESS_CACHE_TTL", "30"))  # seconds
+
+# Rapid /brightness calls within this window collapse into a single write
+BRIGHTNESS_DEBOUNCE = float(os.getenv("REMO_BRIGHTNESS_DEBOUNCE", "0.15"))  # seconds
+
+# Screen recording (/record)
+RECORD_FPS = int(os.getenv("REMO_RECORD_FPS", "5"))
+RECORD_MAX_SECONDS = int(os.getenv("REMO_RECORD_MAX_SECONDS", "30"))
+RECORD_MAX_FRAMES = int(os.getenv("REMO_RECORD_MAX_FRAMES", "120"))  # Ring length
+RECORD_SCALE = float(os.getenv("REMO_RECORD_SCALE", "0.5"))  # Frame downscale factor
+RECORD_FORMAT = os.getenv("REMO_RECORD_FORMAT", "gif")  # "gif" or "mp4" (needs imageio[ffmpeg])
+
+# =============================================================================
+# AUDIO SETTINGS
+# =============================================================================
+
+# Audio backend: "auto" (pycaw on Windows) or "fake" (in-memory, for testing)
+AUDIO_BACKEND = os.getenv("REMO_AUDIO_BACKEND", "auto")
+
+# Per-app sessions are re-enumerated after this long when the backend
+# cannot notify about new sessions
+AUDIO_SESSION_CACHE_TTL = 10  # seconds
+
+# Volume fades (/fade, /volume N over Ts)
+VOLUME_RAMP_TICK_RATE = 20  # Volume updates per second during a fade
+VOLUME_FADE_DEFAULT_SECONDS = 3
+VOLUME_FADE_MAX_SECONDS = 600
+
+# =============================================================================
+# FILE TRANSFER
+# =============================================================================
+
+# Folders /getfile may read from, separated by os.pathsep (";" on Windows).
+# Empty means any path the bot user can read.
+FILE_ROOTS = [
+    Path(p).expanduser().resolve()
+    for p in os.getenv("REMO_FILE_ROOTS", "").split(os.pathsep) if p
+]
+
+# /ls and /api/fs: entries per page and folders kept in the scan cache
+FILE_BROWSER_PAGE_SIZE = 10
+FILE_BROWSER_CACHE_DIRS = 64
+FILE_BROWSER_MAX_TOKENS = 512  # Path tokens behind /ls buttons
+
+# Files are read in chunks of this size, so memory stays flat for any file size
+FILE_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Telegram bots can upload at most 50 MB per document; larger output is split
+FILE_PART_SIZE = 49 * 1024 * 1024
+FILE_UPLOAD_TIMEOUT = 600  # seconds per part
+
+# Text-like files are gzipped on the fly (already-compressed formats are not)
+FILE_COMPRESS_EXTENSIONS = {
+    ".log", ".txt", ".csv", ".tsv", ".json", ".jsonl", ".xml", ".md", ".html",
+    ".htm", ".py", ".js", ".sql", ".ini", ".cfg", ".conf", ".yaml", ".yml", ".bak",
+}
+
 # =============================================================================
 # LOGGING SETTINGS
 # =============================================================================
@@ -104,6 +260,50 @@ LOG_LEVEL = os.getenv("REMO_LOG_LEVEL", "INFO")
 LOG_DIR = Path(__file__).parent / "logs"
 LOG_FILE = LOG_DIR / "remo.log"
 
+# Most recent records kept in memory for the dashboard's live log view
+LOG_BUFFER_SIZE = 500
+LOG_BUFFER_MESSAGE_MAX = 500  # characters
+
+# Index of rotated log segments for /logs and /api/logs/search
+LOG_INDEX_FILE = LOG_DIR / "segments.json"
+LOG_INDEX_BLOOM_BITS_PER_ITEM = 10  # ~1% false positives with 7 hashes
+LOG_INDEX_BLOOM_HASHES = 7
+LOG_SEARCH_MAX_RESULTS = 200
+
+# Live tail (/tail, /api/logs/tail)
+LOG_TAIL_POLL_INTERVAL = 1.0  # seconds; followers are also woken on every log call
+LOG_TAIL_MAX_READ = 256 * 1024  # bytes per read
+LOG_TAIL_EDIT_INTERVAL = 3  # seconds between /tail message edits
+LOG_TAIL_LINES = 25  # Lines shown in the /tail message
+LOG_TAIL_MAX_SECONDS = 600  # /tail stops by itself after this long
+
+# =============================================================================
+# AUDIT LOG
+# =============================================================================
+
+# Append-only JSON-lines record of commands and power actions
+AUDIT_FILE = LOG_DIR / "audit.jsonl"
+
+# The background writer batches entries and fsyncs once per flush
+AUDIT_FLUSH_INTERVAL = 1.0  # seconds
+AUDIT_BATCH_SIZE = 100
+AUDIT_MAX_PENDING = 10000  # Entries held while the disk is failing; oldest dropped beyond
+
+# Sparse offset index granularity for /api/audit (records per index point)
+AUDIT_INDEX_EVERY = 100
+
+# =============================================================================
+# SCREENSHOT ARCHIVE
+# =============================================================================
+
+# Every capture is kept here; least-recently viewed ones are evicted first
+SCREENSHOT_DIR = Path(__file__).parent / "screenshots"
+SCREENSHOT_ARCHIVE_MAX_MB = int(os.getenv("REMO_SCREENSHOT_ARCHIVE_MAX_MB", "500"))
+SCREENSHOT_THUMB_SIZE = 320  # Max thumbnail width/height in pixels
+
+# Periodic background captures (0 = disabled)
+SCREENSHOT_INTERVAL = int(os.getenv("REMO_SCREENSHOT_INTERVAL", "0"))  # seconds
+
 # =============================================================================
 # RATE LIMITING
 # =============================================================================
@@ -112,6 +312,46 @@ LOG_FILE = LOG_DIR / "remo.log"
 RATE_LIMIT_COMMANDS = 30
 RATE_LIMIT_WINDOW = 60  # seconds
 
+# "sliding_window" (steady limit) or "token_bucket" (allows short bursts)
+RATE_LIMIT_ALGORITHM = "sliding_window"
+
+# Limiter key tables are capped; idle keys are evicted first
+RATE_LIMIT_MAX_KEYS = 10000
+
+# Heavier commands use up more of the limit (cost= in bot/commands.py, default 1)
+COMMAND_COSTS = {spec.name: spec.cost for spec in COMMANDS if spec.cost != 1}
+
+# =============================================================================
+# COMMAND METRICS
+# =============================================================================
+
+# Latency histograms keep one slot per minute for the last hour
+METRICS_SLOT_SECONDS = 60
+METRICS_SLOTS = 60
+
+# Rolling windows reported by /stats and the dashboard
+METRICS_WINDOWS = {"5m": 300, "1h": 3600}
+
+# =============================================================================
+# DASHBOARD LIVE UPDATES
+# =============================================================================
+
+# Stats/logs are collected once per interval and pushed to every open tab
+DASHBOARD_STREAM_INTERVAL = 5  # seconds
+DASHBOARD_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments
+DASHBOARD_STREAM_QUEUE = 10  # Pending updates per tab before it is resynced
+DASHBOARD_LOG_LINES = 20  # Log records shown in the dashboard
+
+# =============================================================================
+# DASHBOARD COMPRESSION & CACHING
+# =============================================================================
+
+# Responses smaller than this go out as-is (compression would not pay off)
+DASHBOARD_COMPRESS_MIN_SIZE = 1024  # bytes
+DASHBOARD_GZIP_LEVEL = 6
+DASHBOARD_BROTLI_QUALITY = 5  # Used when the optional brotli package is installed
+DASHBOARD_PAGE_CACHE_SIZE = 8  # Rendered page shells kept
+
 # =============================================================================
 # DASHBOARD AUTHENTICATION
 # =============================================================================
@@ -127,12 +367,22 @@ if not DASHBOARD_USERNAME or not DASHBOARD_PASSWORD:
         "See .env.example for reference."
     )
 
-# Session secret for signing cookies
-DASHBOARD_SECRET_KEY = os.getenv("REMO_DASHBOARD_SECRET_KEY", secrets.token_hex(32))
+# Session secret for signing cookies (saved to file, so a restart keeps sessions)
+DASHBOARD_SECRET_KEY = os.getenv("REMO_DASHBOARD_SECRET_KEY") or _get_or_create_secret(
+    Path(__file__).parent / ".dashboard_secret"
+)
 
 # Session timeout (seconds)
 DASHBOARD_SESSION_TIMEOUT = int(os.getenv("REMO_DASHBOARD_SESSION_TIMEOUT", "86400"))  # 24 hours
 
+# Server-side session table (revocable from the dashboard)
+DASHBOARD_SESSION_FILE = Path(__file__).parent / "sessions.json"
+DASHBOARD_SESSION_MAX = 50  # Oldest sessions are dropped beyond this
+DASHBOARD_SESSION_CACHE_SIZE = 256  # Verified cookies kept (skips the signature check)
+DASHBOARD_SESSION_TOUCH_INTERVAL = 60  # seconds between "last seen" updates
+
 # Login rate limiting
 DASHBOARD_MAX_LOGIN_ATTEMPTS = 5
 DASHBOARD_LOGIN_WINDOW = 900  # 15 minutes
+# IPs tracked; when all are active, new IPs share one throttled entry
+DASHBOARD_LOGIN_MAX_KEYS = 10000
@@ -3,52 +3,38 @@
 import asyncio
 import bcrypt
 import secrets
-from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Callable
 from functools import wraps
-from collections import defaultdict
 
 from aiohttp import web
-from itsdangerous import URLSafeSerializer, BadSignature
 from loguru import logger
 
 import config
+from utils.ratelimit import SlidingWindowLimiter
+from dashboard.sessions import sessions
 
 
 # =============================================================================
 # SESSION MANAGEMENT
 # =============================================================================
 
-_serializer = URLSafeSerializer(config.DASHBOARD_SECRET_KEY)
-
-
-def create_session_token(user_data: Dict[str, Any]) -> str:
-    """Create a signed session token."""
-    session_data = {
-        "user": user_data,
-        "created_at": datetime.now().timestamp(),
-    }
-    return _serializer.dumps(session_data)
+def create_session_token(user_data: Dict[str, Any], client_ip: str = "", user_agent: str = "") -> str:
+    """Start a server-side session and return its signed token."""
+    return sessions.create(user_data, client_ip, user_agent)
 
 
 def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verify and decode session token."""
-    try:
-        session_data = _serializer.loads(token)
-        
-        # Check expiration
-        created_at = datetime.fromtimestamp(session_data["created_at"])
-        if datetime.now() - created_at > timedelta(seconds=config.DASHBOARD_SESSION_TIMEOUT):
-            return None
-        
-        return session_data["user"]
-    except (BadSignature, KeyError, ValueError):
-        return None
+    """Return the user of a live session (cached; see dashboard/sessions.py)."""
+    session = sessions.verify(token)
+    return session["user"] if session else None
 
 
-def set_session_cookie(response: web.Response, user_data: Dict[str, Any]) -> None:
+def set_session_cookie(response: web.Response, user_data: Dict[str, Any], request: Optional[web.Request] = None) -> None:
     """Set session cookie on response."""
-    token = create_session_token(user_data)
+    if request is not None:
+        token = create_session_token(user_data, get_client_ip(request), request.headers.get("User-Agent", ""))
+    else:
+        token = create_session_token(user_data)
     response.set_cookie(
         "session",
         token,
@@ -67,8 +53,18 @@ def get_session(request: web.Request) -> Optional[Dict[str, Any]]:
     return verify_session_token(token)
 
 
-def clear_session(response: web.Response) -> None:
-    """Clear session cookie."""
+def get_session_id(request: web.Request) -> Optional[str]:
+    """Id of the request's session (to mark it in the sessions list)."""
+    token = request.cookies.get("session")
+    return sessions.session_id(token) if token else None
+
+
+def clear_session(response: web.Response, request: Optional[web.Request] = None) -> None:
+    """Revoke the request's session and clear the cookie."""
+    if request is not None:
+        session_id = get_session_id(request)
+        if session_id:
+            sessions.revoke(session_id)
     response.del_cookie("session")
 
 
@@ -106,34 +102,14 @@ def validate_credentials(username: str, password: str) -> bool:
 # RATE LIMITING
 # =============================================================================
 
-class LoginRateLimiter:
-    """Rate limiter for login attempts."""
-    
-    def __init__(self):
-        self.attempts: Dict[str, list[float]] = defaultdict(list)
-    
-    def is_allowed(self, ip: str) -> bool:
-        """Check if IP is allowed to attempt login."""
-        now = datetime.now().timestamp()
-        cutoff = now - config.DASHBOARD_LOGIN_WINDOW
-        
-        # Remove old attempts
-        self.attempts[ip] = [t for t in self.attempts[ip] if t > cutoff]
-        
-        # Check if under limit
-        if len(self.attempts[ip]) < config.DASHBOARD_MAX_LOGIN_ATTEMPTS:
-            self.attempts[ip].append(now)
-            return True
-        
-        return False
-    
-    def reset(self, ip: str) -> None:
-        """Reset attempts for IP (on successful login)."""
-        self.attempts[ip] = []
-
-
-# Global rate limiter
-login_rate_limiter = LoginRateLimiter()
+# Global rate limiter (keyed by client IP). Throttled IPs are never evicted
+# to make room, so cycling through many source IPs can't reset the limit.
+login_rate_limiter = SlidingWindowLimiter(
+    limit=config.DASHBOARD_MAX_LOGIN_ATTEMPTS,
+    window=config.DASHBOARD_LOGIN_WINDOW,
+    max_keys=config.DASHBOARD_LOGIN_MAX_KEYS,
+    evict_active=False,
+)
 
 
 # =============================================================================
@@ -0,0 +1,223 @@
+# REMO - Dashboard HTTP Middleware
+# Negotiated gzip/brotli, ETags with 304s, cached page shells and traffic accounting
+
+import gzip
+import json
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from aiohttp import web, hdrs
+import aiohttp_jinja2
+
+import config
+from dashboard.auth import get_session_id
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Preferred first; br only when the brotli package is installed
+ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts (Accept-Encoding with q-values), or None."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=config.DASHBOARD_BROTLI_QUALITY)
+    # mtime=0 keeps the output (and its length) identical for identical bodies
+    return gzip.compress(body, compresslevel=config.DASHBOARD_GZIP_LEVEL, mtime=0)
+
+
+def make_etag(body: bytes, encoding: Optional[str]) -> str:
+    """Strong ETag of a body; each encoding is its own representation."""
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 asks for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+class TrafficMeter:
+    """Bytes per dashboard session: what responses weigh vs. what was sent.
+    
+    raw is the uncompressed body, wire the body actually sent (compressed,
+    or nothing for a 304). Streamed responses (SSE, files) are not counted.
+    """
+    
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self.total = self._empty()
+        self._sessions: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+    
+    @staticmethod
+    def _empty() -> Dict[str, int]:
+        return {"responses": 0, "not_modified": 0, "raw": 0, "wire": 0}
+    
+    def record(self, session_id: Optional[str], raw: int, wire: int) -> None:
+        counters = [self.total]
+        if session_id:
+            if session_id not in self._sessions:
+                self._sessions[session_id] = self._empty()
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            counters.append(self._sessions[session_id])
+        
+        for counter in counters:
+            counter["responses"] += 1
+            counter["not_modified"] += wire == 0
+            counter["raw"] += raw
+            counter["wire"] += wire
+    
+    def get(self, session_id: str) -> Dict[str, int]:
+        return self._sessions.get(session_id) or self._empty()
+
+
+class CachedPage:
+    """One rendered template, plus its compressed variants (built on demand)."""
+    
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[Optional[str], Tuple[bytes, str]] = {}
+    
+    def variant(self, encoding: Optional[str]) -> Tuple[bytes, str]:
+        if encoding not in self._variants:
+            body = compress(self.body, encoding) if encoding else self.body
+            self._variants[encoding] = (body, make_etag(self.body, encoding))
+        return self._variants[encoding]
+
+
+class PageCache:
+    """Rendered page shells, keyed by template version and context.
+    
+    The version is the template file's mtime and size, so editing a
+    template is picked up on the next request. A hit costs one stat() and
+    a dict lookup; the compressed bytes and ETag are reused as well.
+    """
+    
+    def __init__(self, templates_dir: Path, size: int):
+        self.templates_dir = templates_dir
+        self.size = size
+        self._pages: "OrderedDict[tuple, CachedPage]" = OrderedDict()
+        
+        # Cache accounting
+        self.hits = 0
+        self.renders = 0
+    
+    def _version(self, name: str) -> Tuple[int, int]:
+        stat = (self.templates_dir / name).stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def render(self, request: web.Request, name: str, context: Dict[str, Any]) -> web.Response:
+        key = (name, self._version(name), json.dumps(context, sort_keys=True, default=str))
+        page = self._pages.get(key)
+        if page is None:
+            page = CachedPage(aiohttp_jinja2.render_string(name, request, context).encode("utf-8"))
+            self._pages[key] = page
+            if len(self._pages) > self.size:
+                self._pages.popitem(last=False)
+            self.renders += 1
+        else:
+            self._pages.move_to_end(key)
+            self.hits += 1
+        
+        encoding = negotiate_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        body, etag = page.variant(encoding)
+        response = web.Response(body=body, content_type="text/html", charset="utf-8")
+        response.headers[hdrs.ETAG] = etag
+        response.headers[hdrs.VARY] = "Accept-Encoding"
+        if encoding:
+            response.headers[hdrs.CONTENT_ENCODING] = encoding
+        response["raw_size"] = len(page.body)
+        return response
+
+
+@web.middleware
+async def http_cache_middleware(
+    request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> web.StreamResponse:
+    """ETag/304 and negotiated compression for buffered GET responses.
+    
+    Streamed responses (SSE, FileResponse) are passed through untouched;
+    FileResponse already answers conditional requests itself.
+    """
+    response = await handler(request)
+    if (
+        request.method not in (hdrs.METH_GET, hdrs.METH_HEAD)
+        or not isinstance(response, web.Response)
+        or response.status != 200
+        or not isinstance(response.body, bytes)
+    ):
+        return response
+    
+    body = response.body
+    compressible = (
+        hdrs.CONTENT_ENCODING not in response.headers
+        and len(body) >= config.DASHBOARD_COMPRESS_MIN_SIZE
+        and response.content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+    encoding = negotiate_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, "")) if compressible else None
+    
+    if hdrs.ETAG not in response.headers:
+        response.headers[hdrs.ETAG] = make_etag(body, encoding)
+    if compressible:
+        response.headers[hdrs.VARY] = "Accept-Encoding"
+    # Revalidate every time: pages and API data are per-user and change
+    response.headers.setdefault(hdrs.CACHE_CONTROL, "private, no-cache")
+    
+    raw_size = response.get("raw_size", len(body))
+    session_id = get_session_id(request)
+    
+    if etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), response.headers[hdrs.ETAG]):
+        traffic.record(session_id, raw_size, 0)
+        return web.Response(status=304, headers={
+            name: response.headers[name]
+            for name in (hdrs.ETAG, hdrs.CACHE_CONTROL, hdrs.VARY)
+            if name in response.headers
+        })
+    
+    if encoding:
+        response.body = compress(body, encoding)
+        response.headers[hdrs.CONTENT_ENCODING] = encoding
+    traffic.record(session_id, raw_size, len(response.body))
+    return response
+
+
+# Singleton instances
+page_cache = PageCache(Path(__file__).parent / "templates", config.DASHBOARD_PAGE_CACHE_SIZE)
+traffic = TrafficMeter(config.DASHBOARD_SESSION_MAX)
@@ -1,7 +1,8 @@
 # REMO - Dashboard Routes
 
 import os
-import re
+import json
+import asyncio
 from pathlib import Path
 from datetime import datetime
 
@@ -16,11 +17,26 @@ from dashboard.auth import (
     validate_credentials,
     set_session_cookie,
     get_session,
+    get_session_id,
     clear_session,
     login_rate_limiter,
     get_client_ip,
 )
-from system.status import status
+from bot.registry import lazy_backend
+from utils.metrics import metrics
+from utils.audit import audit
+from dashboard.stream import stream, collect_stats
+from dashboard.sessions import sessions
+from dashboard.middleware import http_cache_middleware, page_cache, traffic
+from utils.logger import log_buffer
+from utils.logsearch import log_search, parse_time
+from utils.logtail import log_tail
+
+# Shared with the bot; PIL is only imported once the gallery is used
+archive = lazy_backend("system.archive:archive")
+
+# Same scan cache as /ls
+browser = lazy_backend("system.files:browser")
 
 
 # Templates directory
@@ -31,8 +47,7 @@ templates_dir = Path(__file__).parent / "templates"
 # PUBLIC ROUTES
 # =============================================================================
 
-@aiohttp_jinja2.template("login.html")
-async def login_page(request: web.Request) -> dict:
+async def login_page(request: web.Request) -> web.Response:
     """Show login page or redirect if already logged in."""
     session = get_session(request)
     
@@ -40,7 +55,7 @@ async def login_page(request: web.Request) -> dict:
         # Already logged in, redirect to dashboard
         return web.HTTPFound("/dashboard")
     
-    return {"error": None}
+    return page_cache.render(request, "login.html", {"error": None})
 
 
 async def login_handler(request: web.Request) -> web.Response:
@@ -70,7 +85,7 @@ async def login_handler(request: web.Request) -> web.Response:
         
         # Create session
         response = web.HTTPFound("/dashboard")
-        set_session_cookie(response, {"username": username})
+        set_session_cookie(response, {"username": username}, request)
         
         return response
     else:
@@ -86,7 +101,7 @@ async def login_handler(request: web.Request) -> web.Response:
 async def logout_handler(request: web.Request) -> web.Response:
     """Handle logout."""
     response = web.HTTPFound("/")
-    clear_session(response)
+    clear_session(response, request)
     logger.info(f"User logged out from IP: {get_client_ip(request)}")
     return response
 
@@ -96,108 +111,281 @@ async def logout_handler(request: web.Request) -> web.Response:
 # =============================================================================
 
 @login_required
-@aiohttp_jinja2.template("dashboard.html")
-async def dashboard_page(request: web.Request) -> dict:
-    """Show main dashboard."""
+async def dashboard_page(request: web.Request) -> web.Response:
+    """Show main dashboard (rendered once per template version)."""
     session = request["session"]
     
-    return {
+    return page_cache.render(request, "dashboard.html", {
         "username": session["username"],
         "user_id": config.TELEGRAM_USER_ID,
         "webhook": config.WEBHOOK_DOMAIN,
         "device": config.DEVICE_NAME,
-    }
+    })
 
 
 @login_required
 async def api_stats(request: web.Request) -> web.Response:
-    """API endpoint for system stats - returns clean JSON."""
+    """API endpoint for system stats (polling fallback for /api/stream)."""
+    return web.json_response(await collect_stats())
+
+
+@login_required
+async def api_logs(request: web.Request) -> web.Response:
+    """API endpoint for recent log records (polling fallback for /api/stream).
+    
+    Served from the in-memory ring buffer. Query: since (cursor from the
+    previous response) to get only newer records, limit. Newest first.
+    """
     try:
-        # Get individual stats directly instead of parsing markdown
-        cpu = await status.get_cpu_percent()
-        memory = await status.get_memory_info()
-        disk = await status.get_disk_info()
-        uptime_str = await status.get_uptime()
-        battery = await status.get_battery_info()
-        
-        # Format clean values
-        stats = {
-            "cpu": f"{cpu:.1f}",
-            "ram": f"{memory['used_gb']}GB / {memory['total_gb']}GB ({memory['percent']}%)",
-            "disk": f"{disk['used_gb']}GB / {disk['total_gb']}GB ({disk['percent']}%)",
-            "uptime": uptime_str,
-        }
-        
-        # Add battery if available
-        if battery:
-            battery_icon = "🔌" if battery['plugged'] else "🔋"
-            battery_status = f"{battery_icon} {battery['percent']}%"
-            if not battery['plugged']:
-                battery_status += f" ({battery['time_left']} left)"
-            else:
-                battery_status += " (Charging)"
-            stats["battery"] = battery_status
-        else:
-            stats["battery"] = "N/A"
-        
-        return web.json_response(stats)
+        since = int(request.query.get("since", "0"))
+        limit = int(request.query.get("limit", config.DASHBOARD_LOG_LINES))
+        limit = max(1, min(config.LOG_BUFFER_SIZE, limit))
+    except ValueError:
+        return web.json_response({"error": "Invalid since or limit"}, status=400)
+    
+    return web.json_response(log_buffer.since(since, limit))
+
+
+@login_required
+async def api_logs_search(request: web.Request) -> web.Response:
+    """API endpoint for searching current and rotated logs.
+    
+    Query: q (case-insensitive substring), level (minimum), module (prefix),
+    start/end (unix time or "YYYY-MM-DD HH:MM[:SS]"), limit. Newest first;
+    the response also says how many log segments the index let us skip.
+    """
+    bounds = {}
+    for key in ("start", "end"):
+        if request.query.get(key):
+            bounds[key] = parse_time(request.query[key])
+            if bounds[key] is None:
+                return web.json_response({"error": f"Invalid {key}"}, status=400)
+    
+    try:
+        limit = max(1, min(config.LOG_SEARCH_MAX_RESULTS, int(request.query.get("limit", "50"))))
+    except ValueError:
+        return web.json_response({"error": "Invalid limit"}, status=400)
+    
+    try:
+        return web.json_response(await log_search.search(
+            request.query.get("q", ""),
+            level=request.query.get("level"),
+            module=request.query.get("module"),
+            limit=limit,
+            **bounds,
+        ))
     except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        return web.json_response({
-            "cpu": "Error",
-            "ram": "Error",
-            "disk": "Error",
-            "uptime": "Error",
-            "battery": "Error",
-        })
+        logger.error(f"Error searching logs: {e}")
+        return web.json_response({"error": "Failed to search logs"}, status=500)
 
 
 @login_required
-async def api_logs(request: web.Request) -> web.Response:
-    """API endpoint for logs."""
+async def api_logs_tail(request: web.Request) -> web.StreamResponse:
+    """Live tail of remo.log (like tail -f).
+    
+    Query: level (minimum), module (prefix), format=text for a plain-text
+    stream a browser shows as it arrives; otherwise Server-Sent Events with
+    {"lines": [...]} batches.
+    """
+    text = request.query.get("format") == "text"
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/plain; charset=utf-8" if text else "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+    
+    follower = log_tail.follow(request.query.get("level"), request.query.get("module"))
     try:
-        log_file = config.LOG_FILE
-        
-        if not log_file.exists():
-            return web.json_response({"logs": []})
-        
-        # Read last 20 lines
-        with open(log_file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            recent_lines = lines[-20:] if len(lines) > 20 else lines
-        
-        # Parse log lines
-        logs = []
-        for line in recent_lines:
-            line = line.strip()
-            if not line:
+        while True:
+            lines = await follower.read(config.DASHBOARD_STREAM_HEARTBEAT)
+            if follower.closed:
+                break  # Server shutting down
+            if not lines:
+                if not text:
+                    await response.write(b": ping\n\n")
                 continue
-            
-            # Parse loguru format: "2026-01-19 08:30:33 | INFO     | module:func:line | message"
-            # Note: Level field is padded with spaces, milliseconds may be present or absent
-            match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:\.\d+)? \| (\w+)\s+\| (.+)', line)
-            
-            if match:
-                time_str, level, rest = match.groups()
-                
-                # Extract message from "module:func:line | message"
-                # Split by last | to get the actual message
-                parts = rest.split(' | ', 1)
-                message = parts[1] if len(parts) > 1 else rest
-                
-                logs.append({
-                    "time": time_str,  # Already without milliseconds
-                    "level": level.strip(),
-                    "message": message[:200],  # Limit message length
-                })
-        
-        # Reverse to show newest first
-        logs.reverse()
-        
-        return web.json_response({"logs": logs})
+            if text:
+                await response.write(("\n".join(lines) + "\n").encode("utf-8"))
+            else:
+                await response.write(f"data: {json.dumps({'lines': lines})}\n\n".encode("utf-8"))
+    except ConnectionResetError:
+        pass
+    finally:
+        log_tail.unfollow(follower)
+    return response
+
+
+@login_required
+async def api_stream(request: web.Request) -> web.StreamResponse:
+    """Server-Sent Events: a full snapshot, then only changed fields.
+    
+    Every tab shares one collector (see dashboard/stream.py); a comment line
+    is sent every DASHBOARD_STREAM_HEARTBEAT seconds to keep proxies from
+    closing an idle connection.
+    """
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # Don't let a reverse proxy buffer events
+    })
+    await response.prepare(request)
+    
+    queue = stream.subscribe()
+    try:
+        await response.write(b"retry: 5000\n\n")
+        while True:
+            try:
+                update = await asyncio.wait_for(queue.get(), config.DASHBOARD_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                await response.write(b": ping\n\n")
+                continue
+            if update is None:
+                break
+            await response.write(f"data: {json.dumps(update)}\n\n".encode("utf-8"))
+    except ConnectionResetError:
+        pass
+    finally:
+        stream.unsubscribe(queue)
+    return response
+
+
+@login_required
+async def api_screenshots(request: web.Request) -> web.Response:
+    """API endpoint for the paginated screenshot gallery."""
+    try:
+        page = max(1, int(request.query.get("page", "1")))
+        per_page = max(1, min(100, int(request.query.get("per_page", "24"))))
+    except ValueError:
+        return web.json_response({"error": "Invalid page"}, status=400)
+    
+    items, total = await archive.list_page(page, per_page)
+    for item in items:
+        item["thumb_url"] = f"/api/screenshots/{item['id']}/thumb"
+        item["url"] = f"/api/screenshots/{item['id']}"
+    
+    return web.json_response({
+        "screenshots": items,
+        "page": page,
+        "pages": max(1, (total + per_page - 1) // per_page),
+        "total": total,
+    })
+
+
+@login_required
+async def api_screenshot_thumb(request: web.Request) -> web.StreamResponse:
+    """Serve a screenshot thumbnail (immutable, cached by the browser)."""
+    path = await archive.get_thumbnail(request.match_info["id"])
+    if path is None:
+        raise web.HTTPNotFound()
+    
+    # Thumbnails never change once written, so browsers can keep them
+    return web.FileResponse(
+        path,
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
+@login_required
+async def api_screenshot_full(request: web.Request) -> web.StreamResponse:
+    """Serve a full-size archived screenshot."""
+    path = await archive.get_full(request.match_info["id"])
+    if path is None or not path.exists():
+        raise web.HTTPNotFound()
+    
+    return web.FileResponse(
+        path,
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
+@login_required
+async def api_metrics(request: web.Request) -> web.Response:
+    """API endpoint for per-command latency percentiles (ms)."""
+    window = request.query.get("window", next(iter(config.METRICS_WINDOWS)))
+    if window not in config.METRICS_WINDOWS:
+        return web.json_response({"error": "Invalid window"}, status=400)
+    
+    return web.json_response({
+        "window": window,
+        "windows": list(config.METRICS_WINDOWS),
+        "commands": metrics.summary(config.METRICS_WINDOWS[window]),
+    })
+
+
+@login_required
+async def api_audit(request: web.Request) -> web.Response:
+    """API endpoint for the audit log.
+    
+    Query: offset (record number), limit, since (unix time) and exact-match
+    filters user, action, outcome, source. Without offset/since the newest
+    entries are returned.
+    """
+    try:
+        offset = int(request.query["offset"]) if "offset" in request.query else None
+        since = float(request.query["since"]) if "since" in request.query else None
+        limit = max(1, min(500, int(request.query.get("limit", "50"))))
+    except ValueError:
+        return web.json_response({"error": "Invalid offset, since or limit"}, status=400)
+    
+    filters = {
+        key: request.query[key]
+        for key in ("user", "action", "outcome", "source")
+        if key in request.query
+    }
+    
+    try:
+        return web.json_response(await audit.query(offset, limit, since, **filters))
     except Exception as e:
-        logger.error(f"Error reading logs: {e}")
-        return web.json_response({"logs": []})
+        logger.error(f"Error reading audit log: {e}")
+        return web.json_response({"error": "Failed to read audit log"}, status=500)
+
+
+@login_required
+async def api_fs(request: web.Request) -> web.Response:
+    """API endpoint for browsing folders.
+    
+    Query: path (default: first allowed folder or home), page, sort
+    (name, size or date).
+    """
+    try:
+        page = max(0, int(request.query.get("page", "0")))
+    except ValueError:
+        return web.json_response({"error": "Invalid page"}, status=400)
+    
+    path = request.query.get("path") or str(browser.default_path())
+    listing, error = await browser.list(path, page, request.query.get("sort", "name"))
+    if error:
+        return web.json_response({"error": error.lstrip("❌ ")}, status=400)
+    return web.json_response(listing.to_dict())
+
+
+@login_required
+async def api_sessions(request: web.Request) -> web.Response:
+    """API endpoint for active dashboard sessions (current one marked).
+    
+    Each session carries its traffic: raw (uncompressed) vs. wire bytes.
+    """
+    active = sessions.active()
+    for session in active:
+        session["traffic"] = traffic.get(session["id"])
+    
+    return web.json_response({
+        "sessions": active,
+        "current": get_session_id(request),
+        "traffic": traffic.total,
+    })
+
+
+@login_required
+async def api_session_revoke(request: web.Request) -> web.Response:
+    """Revoke a dashboard session (logs that browser out on its next request)."""
+    session_id = request.match_info["id"]
+    if not sessions.revoke(session_id):
+        return web.json_response({"error": "Session not found"}, status=404)
+    
+    logger.info(f"Dashboard session revoked by {request['session'].get('username')} from IP: {get_client_ip(request)}")
+    return web.json_response({"revoked": session_id, "current": session_id == get_session_id(request)})
 
 
 # =============================================================================
@@ -212,6 +400,9 @@ def setup_routes(app: web.Application) -> None:
         loader=jinja2.FileSystemLoader(str(templates_dir))
     )
     
+    # Compression, ETags and 304s for buffered GET responses
+    app.middlewares.append(http_cache_middleware)
+    
     # Public routes
     app.router.add_get("/", login_page)
     app.router.add_post("/login", login_handler)
@@ -221,3 +412,19 @@ def setup_routes(app: web.Application) -> None:
     app.router.add_get("/dashboard", dashboard_page)
     app.router.add_get("/api/stats", api_stats)
     app.router.add_get("/api/logs", api_logs)
+    app.router.add_get("/api/logs/search", api_logs_search)
+    app.router.add_get("/api/logs/tail", api_logs_tail)
+    app.router.add_get("/api/stream", api_stream)
+    app.router.add_get("/api/metrics", api_metrics)
+    app.router.add_get("/api/audit", api_audit)
+    app.router.add_get("/api/fs", api_fs)
+    app.router.add_get("/api/sessions", api_sessions)
+    app.router.add_post("/api/sessions/{id}/revoke", api_session_revoke)
+    app.router.add_get("/api/screenshots", api_screenshots)
+    app.router.add_get("/api/screenshots/{id}/thumb", api_screenshot_thumb)
+    app.router.add_get("/api/screenshots/{id}", api_screenshot_full)
+    
+    # Open event streams would otherwise hold shutdown until they time out
+    app.on_shutdown.append(stream.close)
+    app.on_shutdown.append(log_tail.close)
+    app.on_shutdown.append(sessions.close)
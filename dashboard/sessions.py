@@ -0,0 +1,181 @@
+# REMO - Dashboard Sessions
+# Server-side session table (persisted, revocable) with a cache of verified cookies
+
+import json
+import time
+import secrets
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from itsdangerous import URLSafeSerializer, BadSignature
+from loguru import logger
+
+import config
+
+
+class SessionStore:
+    """Dashboard sessions, keyed by a random id that the cookie carries signed.
+    
+    The table lives in memory and is written to disk when a session is
+    created, revoked or expires (and on shutdown), so a restart keeps
+    everyone logged in. Each session expires ttl seconds after login.
+    
+    Verifying a cookie (signature check + decode) is only done the first
+    time a token is seen; verified tokens are kept in a bounded LRU that
+    maps token -> session id, so the per-request cost is two dict lookups.
+    Revoking a session removes it from the table, which invalidates every
+    cached token pointing at it on the next lookup.
+    """
+    
+    def __init__(self, path: Path, secret_key: str, ttl: int, cache_size: int, max_sessions: int):
+        self.path = path
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.max_sessions = max_sessions
+        self._serializer = URLSafeSerializer(secret_key, salt="remo-session")
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._verified: "OrderedDict[str, str]" = OrderedDict()
+        self._dirty = False
+        
+        # Cache accounting
+        self.hits = 0
+        self.misses = 0
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            self._sessions = json.loads(self.path.read_text(encoding="utf-8"))
+            self._evict_expired()
+            logger.info(f"Loaded {len(self._sessions)} dashboard sessions")
+        except Exception as e:
+            logger.error(f"Failed to load dashboard sessions: {e}")
+    
+    def _save(self) -> None:
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._sessions, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Failed to save dashboard sessions: {e}")
+    
+    def _evict_expired(self) -> bool:
+        now = time.time()
+        expired = [sid for sid, session in self._sessions.items() if session["expires"] <= now]
+        for sid in expired:
+            del self._sessions[sid]
+        return bool(expired)
+    
+    def create(self, user: Dict[str, Any], client_ip: str = "", user_agent: str = "") -> str:
+        """Start a session; returns the signed token for the cookie."""
+        now = time.time()
+        self._evict_expired()
+        
+        # Too many sessions: drop the least recently used
+        while len(self._sessions) >= self.max_sessions:
+            oldest = min(self._sessions, key=lambda sid: self._sessions[sid]["last_seen"])
+            del self._sessions[oldest]
+        
+        sid = secrets.token_urlsafe(18)
+        self._sessions[sid] = {
+            "user": user,
+            "created": now,
+            "last_seen": now,
+            "expires": now + self.ttl,
+            "ip": client_ip,
+            "user_agent": user_agent[:200],
+        }
+        self._save()
+        return self._serializer.dumps({"sid": sid})
+    
+    def session_id(self, token: str) -> Optional[str]:
+        """Session id of a signed token, verifying it only on a cache miss."""
+        sid = self._verified.get(token)
+        if sid is not None:
+            self._verified.move_to_end(token)
+            self.hits += 1
+            return sid
+        
+        self.misses += 1
+        try:
+            sid = self._serializer.loads(token)["sid"]
+        except (BadSignature, KeyError, TypeError, ValueError):
+            return None
+        
+        self._verified[token] = sid
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return sid
+    
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Session record for a cookie token, or None if invalid/expired/revoked."""
+        sid = self.session_id(token)
+        if sid is None:
+            return None
+        
+        session = self._sessions.get(sid)
+        if session is None:
+            self._verified.pop(token, None)
+            return None
+        
+        now = time.time()
+        if session["expires"] <= now:
+            self.revoke(sid)
+            return None
+        
+        # last_seen is informational: written to disk with the next save
+        if now - session["last_seen"] >= config.DASHBOARD_SESSION_TOUCH_INTERVAL:
+            session["last_seen"] = now
+            self._dirty = True
+        return session
+    
+    def revoke(self, sid: str) -> bool:
+        """End a session everywhere; returns whether it existed."""
+        if self._sessions.pop(sid, None) is None:
+            return False
+        for token in [token for token, cached in self._verified.items() if cached == sid]:
+            del self._verified[token]
+        self._save()
+        return True
+    
+    def active(self) -> List[Dict[str, Any]]:
+        """Live sessions, most recently used first."""
+        if self._evict_expired() or self._dirty:
+            self._save()
+        sessions = [
+            {
+                "id": sid,
+                "username": session["user"].get("username", ""),
+                "ip": session["ip"],
+                "user_agent": session["user_agent"],
+                "created": session["created"],
+                "last_seen": session["last_seen"],
+                "expires": session["expires"],
+            }
+            for sid, session in self._sessions.items()
+        ]
+        sessions.sort(key=lambda session: session["last_seen"], reverse=True)
+        return sessions
+    
+    async def close(self, app: Any = None) -> None:
+        """Write pending last_seen updates (aiohttp on_shutdown hook)."""
+        if self._dirty:
+            self._save()
+        logger.debug(f"Session cache: {self.hits} hits, {self.misses} misses")
+
+
+# Singleton instance
+sessions = SessionStore(
+    path=config.DASHBOARD_SESSION_FILE,
+    secret_key=config.DASHBOARD_SECRET_KEY,
+    ttl=config.DASHBOARD_SESSION_TIMEOUT,
+    cache_size=config.DASHBOARD_SESSION_CACHE_SIZE,
+    max_sessions=config.DASHBOARD_SESSION_MAX,
+)
@@ -0,0 +1,166 @@
+# REMO - Dashboard Live Updates
+# One producer collects stats/logs and fans changes out to every open tab (SSE)
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from loguru import logger
+
+import config
+from bot.registry import lazy_backend
+from utils.logger import log_buffer
+
+
+status = lazy_backend("system.status:status")
+
+
+async def collect_stats() -> Dict[str, str]:
+    """Formatted system stats for the dashboard cards."""
+    try:
+        cpu, memory, disk, uptime_str, battery = await asyncio.gather(
+            status.get_cpu_percent(),
+            status.get_memory_info(),
+            status.get_disk_info(),
+            status.get_uptime(),
+            status.get_battery_info(),
+        )
+        
+        stats = {
+            "cpu": f"{cpu:.1f}",
+            "ram": f"{memory['used_gb']}GB / {memory['total_gb']}GB ({memory['percent']}%)",
+            "disk": f"{disk['used_gb']}GB / {disk['total_gb']}GB ({disk['percent']}%)",
+            "uptime": uptime_str,
+        }
+        
+        # Add battery if available
+        if battery:
+            battery_icon = "🔌" if battery['plugged'] else "🔋"
+            battery_status = f"{battery_icon} {battery['percent']}%"
+            if not battery['plugged']:
+                battery_status += f" ({battery['time_left']} left)"
+            else:
+                battery_status += " (Charging)"
+            stats["battery"] = battery_status
+        else:
+            stats["battery"] = "N/A"
+        
+        return stats
+    except Exception as e:
+        logger.error(f"Error getting stats: {e}")
+        return {key: "Error" for key in ("cpu", "ram", "disk", "uptime", "battery")}
+
+
+class DashboardStream:
+    """Fan-out of dashboard snapshots to Server-Sent Events subscribers.
+    
+    One producer task collects stats every DASHBOARD_STREAM_INTERVAL seconds,
+    however many tabs are open, and only while at least one is. Each
+    subscriber gets the full snapshot when it joins (logs = the latest
+    records) and afterwards only the stats fields that changed plus the log
+    records added since the last tick (logs_added). A subscriber whose queue
+    fills up (a stalled tab) is reset to a single full snapshot instead of
+    buffering every update.
+    """
+    
+    def __init__(self, interval: float, queue_size: int):
+        self.interval = interval
+        self.queue_size = queue_size
+        self._snapshot: Dict[str, Any] = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        
+        # Producer accounting (collections vs. messages delivered)
+        self.collections = 0
+        self.delivered = 0
+    
+    def __len__(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Join the stream; the queue yields update dicts (None = closing)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._snapshot:
+            queue.put_nowait(self._snapshot)
+        self._subscribers.add(queue)
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+    
+    async def _collect(self) -> Dict[str, Any]:
+        stats = await collect_stats()
+        self.collections += 1
+        logs = log_buffer.latest(config.DASHBOARD_LOG_LINES)
+        return {"stats": stats, "logs": logs, "cursor": logs[0]["id"] if logs else 0}
+    
+    def _changes(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields of snapshot that differ from the previous one."""
+        changes: Dict[str, Any] = {}
+        old_stats = self._snapshot.get("stats", {})
+        stats = {key: value for key, value in snapshot["stats"].items() if old_stats.get(key) != value}
+        if stats:
+            changes["stats"] = stats
+        cursor = self._snapshot.get("cursor", 0)
+        if snapshot["cursor"] != cursor:
+            added = log_buffer.since(cursor, config.DASHBOARD_LOG_LINES)
+            # A gap means the tab's list is stale; send the whole list instead
+            if added["missed"]:
+                changes["logs"] = snapshot["logs"]
+            else:
+                # Records logged after the snapshot go out with the next one
+                changes["logs_added"] = [
+                    entry for entry in added["logs"] if entry["id"] <= snapshot["cursor"]
+                ]
+            changes["cursor"] = snapshot["cursor"]
+        return changes
+    
+    def _publish(self, update: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Replace the backlog with one full snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot)
+            else:
+                queue.put_nowait(update)
+            self.delivered += 1
+    
+    async def _run(self) -> None:
+        """Producer loop; exits once the last subscriber has left."""
+        logger.debug("Dashboard stream started")
+        try:
+            while self._subscribers:
+                try:
+                    snapshot = await self._collect()
+                    changes = self._changes(snapshot)
+                    self._snapshot = snapshot
+                    if changes:
+                        self._publish(changes)
+                except Exception as e:
+                    logger.error(f"Dashboard stream error: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            logger.debug(
+                f"Dashboard stream stopped: {self.collections} collections, "
+                f"{self.delivered} messages delivered"
+            )
+    
+    async def close(self, app: Any = None) -> None:
+        """End every open stream (aiohttp on_shutdown hook)."""
+        for queue in list(self._subscribers):
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+
+
+# Singleton instance
+stream = DashboardStream(
+    interval=config.DASHBOARD_STREAM_INTERVAL,
+    queue_size=config.DASHBOARD_STREAM_QUEUE,
+)
@@ -9,7 +9,6 @@ from aiohttp import web
 from telegram import Update, Bot
 from telegram.ext import (
     Application,
-    CommandHandler,
     CallbackQueryHandler,
     ContextTypes,
 )
@@ -18,25 +17,19 @@ from loguru import logger
 import config
 from utils.logger import setup_logger
 
-# Setup file logging
+# Setup file logging (a no-op when a worker process re-imports this module)
 setup_logger()
 
-from bot.handlers import (
-    start_command,
-    help_command,
-    lock_command,
-    sleep_command,
-    shutdown_command,
-    restart_command,
-    status_command,
-    screenshot_command,
-    brightness_command,
-    volume_command,
-    mute_command,
-    unmute_command,
-    confirmation_callback,
-    error_handler,
-)
+from bot.handlers import confirmation_callback, panel_callback, ls_callback, error_handler
+from bot.registry import registry, lazy_backend
+from system.scheduler import scheduler
+from system.idle import idle_monitor
+from bot.acl import acl
+from bot.confirmations import confirmations
+from bot.panel import panels
+from bot.tail import tails
+from bot.middleware import TimedRequest
+from utils.audit import audit
 
 
 # =============================================================================
@@ -102,32 +95,16 @@ async def setup_application() -> Application:
         Application.builder()
         .token(config.TELEGRAM_BOT_TOKEN)
         .updater(None)  # We'll handle updates manually via webhook
+        .request(TimedRequest())  # Times Telegram replies for /stats
         .build()
     )
     
-    # Register command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    
-    # Power commands
-    application.add_handler(CommandHandler("lock", lock_command))
-    application.add_handler(CommandHandler("sleep", sleep_command))
-    application.add_handler(CommandHandler("shutdown", shutdown_command))
-    application.add_handler(CommandHandler("restart", restart_command))
-    
-    # Status
-    application.add_handler(CommandHandler("status", status_command))
-    
-    # Display
-    application.add_handler(CommandHandler("screenshot", screenshot_command))
-    application.add_handler(CommandHandler("brightness", brightness_command))
-    
-    # Audio
-    application.add_handler(CommandHandler("volume", volume_command))
-    application.add_handler(CommandHandler("mute", mute_command))
-    application.add_handler(CommandHandler("unmute", unmute_command))
+    # Register every command declared in bot/commands.py
+    registry.register(application)
     
-    # Callback handlers for confirmations
+    # Callback handlers for the live panel, /ls and confirmations
+    application.add_handler(CallbackQueryHandler(panel_callback, pattern=r"^panel:"))
+    application.add_handler(CallbackQueryHandler(ls_callback, pattern=r"^ls:"))
     application.add_handler(CallbackQueryHandler(confirmation_callback))
     
     # Error handler
@@ -157,6 +134,8 @@ async def main() -> None:
     logger.info("=" * 70)
     logger.info(f"Device: {config.DEVICE_NAME} ({config.DEVICE_ID})")
     logger.info(f"Authorized User ID: {config.TELEGRAM_USER_ID}")
+    if config.ACL_USERS:
+        logger.info(f"Additional operators: {len(config.ACL_USERS)}")
     logger.info(f"Webhook Host: {config.WEBHOOK_HOST}:{config.WEBHOOK_PORT}")
     logger.info(f"Webhook Path: {config.WEBHOOK_PATH}")
     logger.info("=" * 70)
@@ -184,6 +163,36 @@ async def main() -> None:
     # Health check
     webapp.router.add_get("/health", health_handler)
     
+    # Scheduled power actions and idle policies (report to the authorized user)
+    async def notify_user(text: str) -> None:
+        await application.bot.send_message(chat_id=config.TELEGRAM_USER_ID, text=text)
+    
+    scheduler.notify = notify_user
+    idle_monitor.notify = notify_user
+    
+    # Unanswered confirmation buttons are replaced once they expire
+    async def expire_confirmation(pending) -> None:
+        await application.bot.edit_message_text(
+            "⌛ Confirmation expired.",
+            chat_id=pending.chat_id,
+            message_id=pending.message_id,
+        )
+    
+    confirmations.on_expire = expire_confirmation
+    background_tasks = [
+        scheduler.start(),
+        asyncio.create_task(idle_monitor.run()),
+        asyncio.create_task(acl.watch()),
+        asyncio.create_task(audit.run()),
+        asyncio.create_task(confirmations.run()),
+    ]
+    
+    # Periodic screenshot archiving (optional)
+    if config.SCREENSHOT_INTERVAL > 0:
+        archive = lazy_backend("system.archive:archive")
+        background_tasks.append(
+            asyncio.create_task(archive.run_periodic(config.SCREENSHOT_INTERVAL))
+        )
     
     # Start web server
     runner = web.AppRunner(webapp)
@@ -230,9 +239,16 @@ async def main() -> None:
         logger.info("Shutting down...")
         
         # Cleanup
+        for task in background_tasks:
+            task.cancel()
+        # Live messages edit through the bot, so end them while it still runs
+        await panels.close_all()
+        await tails.close_all()
         await application.stop()
         await application.shutdown()
         await runner.cleanup()
+        registry.close_backends()
+        audit.close()
         
         logger.info("Bot stopped")
 
@@ -0,0 +1,243 @@
+# REMO - Screenshot Archive Module
+# Handles: On-disk screenshot store, thumbnails, LRU eviction
+
+import re
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Tuple, Optional, Dict, Any, List, Set
+
+from loguru import logger
+
+import config
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    logger.warning("Pillow not available, screenshot thumbnails disabled")
+
+
+# Archive IDs are timestamps, e.g. 20260119-083033-123456
+_ID_PATTERN = re.compile(r"^\d{8}-\d{6}-\d{6}$")
+
+
+def _make_thumbnail(source: Path, target: Path, max_size: int) -> int:
+    """Decode a full screenshot once and write a JPEG thumbnail. Returns its size."""
+    partial = target.with_suffix(".part")
+    with Image.open(source) as image:
+        image.thumbnail((max_size, max_size))
+        image.convert("RGB").save(partial, format="JPEG", quality=80, optimize=True)
+    
+    # Publish atomically so readers never see a half-written thumbnail
+    partial.replace(target)
+    return target.stat().st_size
+
+
+class ScreenshotArchive:
+    """Size-capped screenshot archive with LRU eviction by total bytes."""
+    
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.full_dir = root / "full"
+        self.thumb_dir = root / "thumbs"
+        self.max_bytes = max_bytes
+        
+        # id -> {"size": bytes on disk (full + thumb), "created": timestamp}
+        # Ordered least- to most-recently used
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._load_job: Optional[asyncio.Future] = None
+        
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbs")
+        self._thumb_jobs: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Future] = set()  # Background thumbnails (keeps them referenced)
+    
+    def _scan(self) -> Tuple["OrderedDict[str, Dict[str, Any]]", int]:
+        """Read the index from the files already on disk (runs in the pool)."""
+        entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        total_bytes = 0
+        
+        self.full_dir.mkdir(parents=True, exist_ok=True)
+        self.thumb_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Oldest access first, so LRU order survives restarts
+        files = sorted(self.full_dir.glob("*.png"), key=lambda p: p.stat().st_atime)
+        for path in files:
+            entry_id = path.stem
+            if not _ID_PATTERN.match(entry_id):
+                continue
+            
+            size = path.stat().st_size
+            thumb = self.thumb_dir / f"{entry_id}.jpg"
+            if thumb.exists():
+                size += thumb.stat().st_size
+            
+            entries[entry_id] = {
+                "size": size,
+                "created": datetime.strptime(entry_id, "%Y%m%d-%H%M%S-%f").timestamp(),
+            }
+            total_bytes += size
+        
+        return entries, total_bytes
+    
+    async def _load(self) -> None:
+        """Build the in-memory index once; concurrent first callers share one scan."""
+        if self._loaded:
+            return
+        
+        if self._load_job is None:
+            self._load_job = asyncio.ensure_future(self._run_load())
+        # Shielded: a cancelled request must not cancel the scan for the others
+        await asyncio.shield(self._load_job)
+    
+    async def _run_load(self) -> None:
+        try:
+            entries, total_bytes = await asyncio.get_running_loop().run_in_executor(self._pool, self._scan)
+        except Exception:
+            self._load_job = None  # Let the next caller retry
+            raise
+        
+        self._entries, self._total_bytes = entries, total_bytes
+        self._loaded = True
+        logger.info(
+            f"Screenshot archive loaded: {len(self._entries)} items, "
+            f"{self._total_bytes / (1024 ** 2):.1f} MB"
+        )
+    
+    def _evict(self) -> None:
+        """Drop least-recently used screenshots until under the byte cap."""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            entry_id, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry["size"]
+            
+            for path in (self.full_dir / f"{entry_id}.png", self.thumb_dir / f"{entry_id}.jpg"):
+                path.unlink(missing_ok=True)
+            
+            logger.debug(f"Evicted screenshot {entry_id}")
+    
+    def _touch(self, entry_id: str) -> None:
+        """Mark a screenshot as recently used."""
+        self._entries.move_to_end(entry_id)
+    
+    async def add(self, image_bytes: bytes) -> Optional[str]:
+        """Store a PNG screenshot and queue its thumbnail. Returns the archive ID."""
+        try:
+            loop = asyncio.get_running_loop()
+            await self._load()
+            
+            entry_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            path = self.full_dir / f"{entry_id}.png"
+            await loop.run_in_executor(self._pool, path.write_bytes, image_bytes)
+            
+            self._entries[entry_id] = {
+                "size": len(image_bytes),
+                "created": datetime.now().timestamp(),
+            }
+            self._total_bytes += len(image_bytes)
+            self._evict()
+            
+            # Generate thumbnail now, while the capture is fresh
+            task = asyncio.ensure_future(self.get_thumbnail(entry_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            
+            return entry_id
+        
+        except Exception as e:
+            logger.error(f"Failed to archive screenshot: {e}")
+            return None
+    
+    async def list_page(self, page: int = 1, per_page: int = 24) -> Tuple[List[Dict[str, Any]], int]:
+        """List screenshots newest first. Returns (items, total)."""
+        await self._load()
+        
+        ordered = sorted(self._entries.items(), key=lambda kv: kv[1]["created"], reverse=True)
+        start = (max(1, page) - 1) * per_page
+        
+        items = [
+            {
+                "id": entry_id,
+                "time": datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M:%S"),
+                "size": entry["size"],
+            }
+            for entry_id, entry in ordered[start:start + per_page]
+        ]
+        return items, len(ordered)
+    
+    async def get_full(self, entry_id: str) -> Optional[Path]:
+        """Get the path of a full-size screenshot."""
+        await self._load()
+        if entry_id not in self._entries:
+            return None
+        
+        self._touch(entry_id)
+        return self.full_dir / f"{entry_id}.png"
+    
+    async def get_thumbnail(self, entry_id: str) -> Optional[Path]:
+        """Get the thumbnail path, generating it once in the worker pool if needed."""
+        if not PIL_AVAILABLE or not _ID_PATTERN.match(entry_id):
+            return None
+        
+        await self._load()
+        if entry_id not in self._entries:
+            return None
+        
+        self._touch(entry_id)
+        thumb = self.thumb_dir / f"{entry_id}.jpg"
+        if thumb.exists():
+            return thumb
+        
+        # Concurrent requests for the same thumbnail share one decode
+        job = self._thumb_jobs.get(entry_id)
+        if job is None:
+            job = asyncio.get_running_loop().run_in_executor(
+                self._pool,
+                _make_thumbnail,
+                self.full_dir / f"{entry_id}.png",
+                thumb,
+                config.SCREENSHOT_THUMB_SIZE,
+            )
+            self._thumb_jobs[entry_id] = job
+        
+        try:
+            thumb_size = await job
+            if self._thumb_jobs.pop(entry_id, None) is not None:
+                if entry_id not in self._entries:
+                    # Evicted while the thumbnail was being generated
+                    thumb.unlink(missing_ok=True)
+                    return None
+                self._entries[entry_id]["size"] += thumb_size
+                self._total_bytes += thumb_size
+                self._evict()
+            return thumb if thumb.exists() else None
+        except Exception as e:
+            self._thumb_jobs.pop(entry_id, None)
+            logger.error(f"Failed to create thumbnail for {entry_id}: {e}")
+            return None
+    
+    async def run_periodic(self, interval: int) -> None:
+        """Capture and archive a screenshot every `interval` seconds."""
+        from system.display import display
+        
+        logger.info(f"Periodic screenshots enabled (every {interval}s)")
+        while True:
+            await asyncio.sleep(interval)
+            success, message, image_bytes = await display.take_screenshot()
+            if success and image_bytes:
+                await self.add(image_bytes)
+    
+    def close(self) -> None:
+        """Shut down the thumbnail worker pool."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+archive = ScreenshotArchive(
+    root=config.SCREENSHOT_DIR,
+    max_bytes=config.SCREENSHOT_ARCHIVE_MAX_MB * 1024 * 1024,
+)
@@ -1,56 +1,488 @@
 # REMO - Audio Control Module
-# Handles: Volume, Mute, Unmute
+# Handles: Volume, Mute, Unmute, Per-app volume
 
+import time
 import asyncio
-from typing import Tuple, Optional
+import threading
+from collections import deque, defaultdict
+from concurrent.futures import Future
+from typing import Tuple, Optional, Callable, Any, Deque, List, Dict, Set
 
 from loguru import logger
 
+import config
+
 try:
+    import comtypes
     from pycaw.pycaw import AudioUtilities
     PYCAW_AVAILABLE = True
 except ImportError:
     PYCAW_AVAILABLE = False
     logger.warning("pycaw not available, audio control disabled")
 
+try:
+    from pycaw.callbacks import AudioSessionNotification
+except ImportError:
+    AudioSessionNotification = None
 
-class AudioControl:
-    """Windows audio control using pycaw."""
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class PycawBackend:
+    """Master endpoint volume via pycaw. Must be created on the worker thread."""
     
     def __init__(self):
-        self._volume_interface = None
+        devices = AudioUtilities.GetSpeakers()
+        # pycaw 20251023+ uses AudioDevice with EndpointVolume property
+        self._interface = devices.EndpointVolume
     
-    def _get_volume_interface(self):
-        """Get the audio endpoint volume interface."""
-        if not PYCAW_AVAILABLE:
-            return None
-            
+    def get_volume(self) -> float:
+        return self._interface.GetMasterVolumeLevelScalar()
+    
+    def set_volume(self, scalar: float) -> None:
+        self._interface.SetMasterVolumeLevelScalar(scalar, None)
+    
+    def get_mute(self) -> bool:
+        return bool(self._interface.GetMute())
+    
+    def set_mute(self, muted: bool) -> None:
+        self._interface.SetMute(1 if muted else 0, None)
+    
+    def list_sessions(self) -> Dict[int, Tuple[str, Any]]:
+        """Enumerate audio sessions as {pid: (process name, ISimpleAudioVolume)}."""
+        sessions = {}
+        for session in AudioUtilities.GetAllSessions():
+            # System sounds have no owning process
+            if session.Process is None:
+                continue
+            sessions[session.ProcessId] = (session.Process.name(), session.SimpleAudioVolume)
+        return sessions
+    
+    def watch_sessions(self, on_change: Callable[[], None]) -> bool:
+        """Call on_change when a new session appears. Returns False if unsupported."""
+        if AudioSessionNotification is None:
+            return False
+        
+        class _Callback(AudioSessionNotification):
+            def on_session_created(self, new_session):
+                on_change()
+        
+        self._session_manager = AudioUtilities.GetAudioSessionManager()
+        self._session_callback = _Callback()
+        self._session_manager.RegisterSessionNotification(self._session_callback)
+        # Notifications only start flowing after the first enumeration
+        self._session_manager.GetSessionEnumerator()
+        return True
+
+
+class FakeSession:
+    """In-memory stand-in for ISimpleAudioVolume."""
+    
+    def __init__(self, volume: float = 1.0):
+        self.volume = volume
+        self.muted = False
+    
+    def GetMasterVolume(self) -> float:
+        return self.volume
+    
+    def SetMasterVolume(self, level: float, context: Any) -> None:
+        self.volume = level
+    
+    def GetMute(self) -> int:
+        return int(self.muted)
+    
+    def SetMute(self, muted: int, context: Any) -> None:
+        self.muted = bool(muted)
+
+
+class FakeAudioBackend:
+    """In-memory audio endpoint for non-Windows hosts and tests."""
+    
+    def __init__(self):
+        self.volume = 0.5
+        self.muted = False
+        self.set_calls = 0  # Number of volume writes that reached the "hardware"
+        self.sessions: Dict[int, Tuple[str, FakeSession]] = {}
+        self.enumerations = 0  # Number of full session enumerations
+        self._on_session_change: Optional[Callable[[], None]] = None
+    
+    def get_volume(self) -> float:
+        return self.volume
+    
+    def set_volume(self, scalar: float) -> None:
+        self.set_calls += 1
+        self.volume = scalar
+    
+    def get_mute(self) -> bool:
+        return self.muted
+    
+    def set_mute(self, muted: bool) -> None:
+        self.muted = muted
+    
+    def list_sessions(self) -> Dict[int, Tuple[str, Any]]:
+        self.enumerations += 1
+        return dict(self.sessions)
+    
+    def watch_sessions(self, on_change: Callable[[], None]) -> bool:
+        self._on_session_change = on_change
+        return True
+    
+    def add_session(self, pid: int, name: str) -> FakeSession:
+        """Simulate an application starting to play audio."""
+        session = FakeSession()
+        self.sessions[pid] = (name, session)
+        if self._on_session_change:
+            self._on_session_change()
+        return session
+    
+    def remove_session(self, pid: int) -> None:
+        """Simulate an application exiting (no notification, like Windows)."""
+        self.sessions.pop(pid, None)
+
+
+def default_backend_factory() -> Optional[Callable[[], Any]]:
+    """Pick the audio backend from config.AUDIO_BACKEND."""
+    if config.AUDIO_BACKEND == "fake":
+        return FakeAudioBackend
+    if PYCAW_AVAILABLE:
+        return PycawBackend
+    return None
+
+
+# =============================================================================
+# AUDIO WORKER
+# =============================================================================
+
+class AudioWorker(threading.Thread):
+    """Single long-lived thread that owns the audio endpoint.
+    
+    COM objects are apartment-bound, so the endpoint is created, used and
+    released on this thread only. Commands are processed in FIFO order;
+    a volume set that is still last in the queue absorbs later volume sets,
+    so a burst of /volume calls results in one write of the latest level.
+    Once anything else (e.g. mute) is queued behind it, a new set is queued
+    separately so it can't overtake that command.
+    """
+    
+    def __init__(self, backend_factory: Callable[[], Any]):
+        super().__init__(name="audio-worker", daemon=True)
+        self._backend_factory = backend_factory
+        self._backend = None
+        
+        self._cond = threading.Condition()
+        # Each item: [fn, futures]; fn(backend) -> result
+        self._queue: Deque[List[Any]] = deque()
+        self._queued_volume: Optional[List[Any]] = None
+        self._stopping = False
+    
+    def submit(self, fn: Callable[[Any], Any]) -> Future:
+        """Queue a call to run against the backend on the worker thread."""
+        future: Future = Future()
+        with self._cond:
+            self._queue.append([fn, [future]])
+            self._cond.notify()
+        return future
+    
+    def submit_volume(self, scalar: float) -> Future:
+        """Queue a volume set, merging it into a queued one if that is last in line."""
+        future: Future = Future()
+        with self._cond:
+            if self._queued_volume is not None and self._queue and self._queue[-1] is self._queued_volume:
+                self._queued_volume[0] = self._volume_setter(scalar)
+                self._queued_volume[1].append(future)
+            else:
+                self._queued_volume = [self._volume_setter(scalar), [future]]
+                self._queue.append(self._queued_volume)
+                self._cond.notify()
+        return future
+    
+    @staticmethod
+    def _volume_setter(scalar: float) -> Callable[[Any], float]:
+        def apply(backend: Any) -> float:
+            backend.set_volume(scalar)
+            return scalar
+        return apply
+    
+    def stop(self) -> None:
+        """Ask the worker to finish queued commands and exit."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+    
+    def run(self) -> None:
+        if PYCAW_AVAILABLE:
+            comtypes.CoInitialize()
+        
         try:
-            if self._volume_interface is None:
-                devices = AudioUtilities.GetSpeakers()
-                # pycaw 20251023+ uses AudioDevice with EndpointVolume property
-                self._volume_interface = devices.EndpointVolume
-            return self._volume_interface
-        except Exception as e:
-            logger.error(f"Failed to get audio interface: {e}")
-            return None
+            while True:
+                with self._cond:
+                    while not self._queue and not self._stopping:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    fn, futures = self._queue.popleft()
+                    # A volume set leaving the queue can no longer absorb new ones
+                    if self._queued_volume is not None and self._queued_volume[1] is futures:
+                        self._queued_volume = None
+                
+                self._execute(fn, futures)
+        finally:
+            self._backend = None
+            if PYCAW_AVAILABLE:
+                comtypes.CoUninitialize()
+    
+    def _execute(self, fn: Callable[[Any], Any], futures: List[Future]) -> None:
+        """Run one command, re-creating the backend once if it has gone stale."""
+        for attempt in range(2):
+            try:
+                if self._backend is None:
+                    self._backend = self._backend_factory()
+                result = fn(self._backend)
+                for future in futures:
+                    if not future.cancelled():
+                        future.set_result(result)
+                return
+            except Exception as e:
+                # Endpoint may have changed (e.g. headphones unplugged)
+                self._backend = None
+                if attempt == 1:
+                    for future in futures:
+                        if not future.cancelled():
+                            future.set_exception(e)
+
+
+# =============================================================================
+# SESSION CACHE
+# =============================================================================
+
+def _app_key(name: str) -> str:
+    """Normalize a process name for lookups ('Spotify.exe' -> 'spotify')."""
+    name = name.lower().strip()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+class SessionCache:
+    """Per-application audio sessions, indexed by pid and by app name.
+    
+    Only touched from the audio worker thread. Enumeration happens when a
+    session-created notification marks the cache dirty (or, without
+    notifications, when the TTL expires); the result is diffed against the
+    cache so existing entries are kept. Sessions that vanished are dropped
+    lazily when a call against them fails.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._by_pid: Dict[int, Tuple[str, Any]] = {}
+        self._by_app: Dict[str, Set[int]] = defaultdict(set)
+        self._dirty = True
+        self._watching = False
+        self._refreshed_at = 0.0
+        self._backend_id: Optional[int] = None
+    
+    def invalidate(self) -> None:
+        """Mark the cache stale (safe to call from COM callback threads)."""
+        self._dirty = True
+    
+    def refresh(self, backend: Any) -> None:
+        """Bring the cache up to date with the backend if anything changed."""
+        if id(backend) != self._backend_id:
+            # Backend was re-created; old session objects are unusable
+            self._backend_id = id(backend)
+            self._by_pid.clear()
+            self._by_app.clear()
+            self._watching = backend.watch_sessions(self.invalidate)
+            self._dirty = True
+        
+        stale = not self._watching and time.monotonic() - self._refreshed_at > self.ttl
+        if not self._dirty and not stale:
+            return
+        
+        self._dirty = False
+        current = backend.list_sessions()
+        
+        for pid in set(self._by_pid) - set(current):
+            self._drop(pid)
+        for pid in set(current) - set(self._by_pid):
+            name, control = current[pid]
+            self._by_pid[pid] = (name, control)
+            self._by_app[_app_key(name)].add(pid)
+        
+        self._refreshed_at = time.monotonic()
+    
+    def _drop(self, pid: int) -> None:
+        name, _ = self._by_pid.pop(pid)
+        pids = self._by_app.get(_app_key(name))
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self._by_app[_app_key(name)]
+    
+    def find(self, app: str) -> List[Tuple[int, str, Any]]:
+        """Get every session belonging to an app (one dict lookup)."""
+        return [
+            (pid, self._by_pid[pid][0], self._by_pid[pid][1])
+            for pid in self._by_app.get(_app_key(app), ())
+        ]
+    
+    def all(self) -> List[Tuple[int, str, Any]]:
+        return [(pid, name, control) for pid, (name, control) in self._by_pid.items()]
+    
+    def forget(self, pid: int) -> None:
+        """Drop a session whose process has gone away."""
+        if pid in self._by_pid:
+            self._drop(pid)
+
+
+# =============================================================================
+# VOLUME RAMPS
+# =============================================================================
+
+class RampScheduler:
+    """Drive volume fades from one fixed-rate timer task.
+    
+    Only one ramp is active at a time; starting a new one (or a plain
+    volume set) cancels the current ramp. The timer task lives only while
+    a ramp is running, and each tick just queues a coalesced volume set on
+    the audio worker, so a slow endpoint never delays the schedule.
+    """
+    
+    def __init__(self, tick_rate: int):
+        self.interval = 1.0 / max(1, tick_rate)
+        self._task: Optional[asyncio.Task] = None
+        self._ramp: Optional[dict] = None
+        self.last_stats: Optional[dict] = None
+    
+    @property
+    def active(self) -> bool:
+        return self._ramp is not None
+    
+    def start(
+        self,
+        worker: AudioWorker,
+        start_level: float,
+        target_level: float,
+        duration: float,
+    ) -> asyncio.Future:
+        """Start a ramp, replacing any ramp in progress. Resolves with stats."""
+        self.cancel()
+        
+        loop = asyncio.get_running_loop()
+        self._ramp = {
+            "worker": worker,
+            "start_level": start_level,
+            "target_level": target_level,
+            "duration": max(duration, self.interval),
+            "started": loop.time(),
+            "done": loop.create_future(),
+            "ticks": 0,
+            "jitter_total": 0.0,
+            "jitter_max": 0.0,
+            "level": start_level,
+        }
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._ramp["done"]
+    
+    def cancel(self) -> None:
+        """Stop the ramp in progress, leaving the volume where it is."""
+        ramp, self._ramp = self._ramp, None
+        if ramp is not None and not ramp["done"].done():
+            ramp["done"].set_result(self._stats(ramp, cancelled=True))
+    
+    def _stats(self, ramp: dict, cancelled: bool = False) -> dict:
+        ticks = max(1, ramp["ticks"])
+        return {
+            "cancelled": cancelled,
+            "level": ramp["level"],
+            "ticks": ramp["ticks"],
+            "mean_jitter_ms": ramp["jitter_total"] / ticks * 1000,
+            "max_jitter_ms": ramp["jitter_max"] * 1000,
+        }
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        current = None
+        
+        while self._ramp is not None:
+            ramp = self._ramp
+            now = loop.time()
+            if ramp is not current:
+                # A new ramp (maybe picked up after the last one's final
+                # write) starts its own schedule: its first tick is on time
+                current = ramp
+                next_tick = now
+            
+            # Tick jitter: how late this tick fired against its schedule
+            jitter = max(0.0, now - next_tick)
+            ramp["ticks"] += 1
+            ramp["jitter_total"] += jitter
+            ramp["jitter_max"] = max(ramp["jitter_max"], jitter)
+            
+            progress = min(1.0, (now - ramp["started"]) / ramp["duration"])
+            level = ramp["start_level"] + (ramp["target_level"] - ramp["start_level"]) * progress
+            ramp["level"] = level
+            future = ramp["worker"].submit_volume(level)
+            
+            if progress >= 1.0:
+                self._ramp = None
+                try:
+                    await asyncio.wrap_future(future)
+                    stats = self._stats(ramp)
+                    self.last_stats = stats
+                    ramp["done"].set_result(stats)
+                except Exception as e:
+                    ramp["done"].set_exception(e)
+                continue
+            
+            next_tick += self.interval
+            if next_tick < now:
+                next_tick = now + self.interval
+            await asyncio.sleep(next_tick - loop.time())
+
+
+# =============================================================================
+# AUDIO CONTROL
+# =============================================================================
+
+class AudioControl:
+    """Windows audio control using pycaw."""
+    
+    def __init__(self, backend_factory: Optional[Callable[[], Any]] = None):
+        self._backend_factory = backend_factory
+        self._worker: Optional[AudioWorker] = None
+        self.ramps = RampScheduler(config.VOLUME_RAMP_TICK_RATE)
+        self.sessions = SessionCache(config.AUDIO_SESSION_CACHE_TTL)
+    
+    def _get_worker(self) -> Optional[AudioWorker]:
+        """Get the audio worker, starting it on first use."""
+        if self._worker is None:
+            factory = self._backend_factory or default_backend_factory()
+            if factory is None:
+                return None
+            self._worker = AudioWorker(factory)
+            self._worker.start()
+        return self._worker
+    
+    async def _call(self, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(backend) on the audio worker thread and await the result."""
+        return await asyncio.wrap_future(self._worker.submit(fn))
     
     async def get_volume(self) -> Tuple[bool, str, int]:
         """Get current volume level (0-100)."""
         try:
-            interface = self._get_volume_interface()
-            if interface is None:
+            if self._get_worker() is None:
                 return False, "❌ Audio control not available", 0
             
             # Get scalar volume (0.0 - 1.0)
-            volume = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: interface.GetMasterVolumeLevelScalar()
-            )
-            volume_percent = int(volume * 100)
+            volume = await self._call(lambda backend: backend.get_volume())
+            volume_percent = int(round(volume * 100))
             
             return True, f"🔊 Current volume: {volume_percent}%", volume_percent
-            
+        
         except Exception as e:
             logger.error(f"Failed to get volume: {e}")
             return False, f"❌ Failed to get volume: {e}", 0
@@ -61,15 +493,16 @@ class AudioControl:
             # Clamp value between 0 and 100
             level = max(0, min(100, level))
             
-            interface = self._get_volume_interface()
-            if interface is None:
+            worker = self._get_worker()
+            if worker is None:
                 return False, "❌ Audio control not available"
             
-            # Set scalar volume (0.0 - 1.0)
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: interface.SetMasterVolumeLevelScalar(level / 100.0, None)
-            )
+            # An explicit level wins over any fade in progress
+            self.ramps.cancel()
+            
+            # Set scalar volume (0.0 - 1.0); superseded sets report the final level
+            applied = await asyncio.wrap_future(worker.submit_volume(level / 100.0))
+            level = int(round(applied * 100))
             
             # Choose emoji based on level
             if level == 0:
@@ -83,26 +516,134 @@ class AudioControl:
             
             logger.info(f"Volume set to {level}%")
             return True, f"{emoji} Volume set to {level}%"
-            
+        
         except Exception as e:
             logger.error(f"Failed to set volume: {e}")
             return False, f"❌ Failed to set volume: {e}"
     
+    async def ramp_volume(self, level: int, duration: float) -> Tuple[bool, str]:
+        """Fade volume to level (0-100) over duration seconds."""
+        try:
+            level = max(0, min(100, level))
+            
+            worker = self._get_worker()
+            if worker is None:
+                return False, "❌ Audio control not available"
+            
+            # Continue from where a cancelled ramp left off, if any
+            current = await self._call(lambda backend: backend.get_volume())
+            stats = await self.ramps.start(worker, current, level / 100.0, duration)
+            
+            reached = int(round(stats["level"] * 100))
+            if stats["cancelled"]:
+                return True, f"⏹️ Fade interrupted at {reached}%"
+            
+            # Accuracy: read back what the endpoint actually ended at
+            final = await self._call(lambda backend: backend.get_volume())
+            error = abs(final * 100 - level)
+            
+            logger.info(
+                f"Volume faded to {level}% over {duration:g}s "
+                f"({stats['ticks']} ticks, jitter avg {stats['mean_jitter_ms']:.1f}ms "
+                f"max {stats['max_jitter_ms']:.1f}ms, error {error:.1f}%)"
+            )
+            return True, (
+                f"🎚️ Volume faded to {level}% over {duration:g}s\n"
+                f"⏱️ {stats['ticks']} ticks, jitter avg {stats['mean_jitter_ms']:.1f}ms "
+                f"/ max {stats['max_jitter_ms']:.1f}ms"
+            )
+        
+        except Exception as e:
+            logger.error(f"Failed to fade volume: {e}")
+            return False, f"❌ Failed to fade volume: {e}"
+    
+    def _read_apps(self, backend: Any) -> List[Tuple[str, int, bool]]:
+        """List (name, volume %, muted) per app. Runs on the worker thread."""
+        self.sessions.refresh(backend)
+        
+        apps = []
+        for pid, name, control in self.sessions.all():
+            try:
+                volume = int(round(control.GetMasterVolume() * 100))
+                apps.append((name, volume, bool(control.GetMute())))
+            except Exception:
+                self.sessions.forget(pid)
+        return sorted(apps)
+    
+    def _write_app_volume(self, backend: Any, app: str, scalar: float) -> int:
+        """Set volume on every session of an app. Runs on the worker thread."""
+        self.sessions.refresh(backend)
+        matches = self.sessions.find(app)
+        if not matches:
+            # Might have started since the last notification/TTL
+            self.sessions.invalidate()
+            self.sessions.refresh(backend)
+            matches = self.sessions.find(app)
+        
+        updated = 0
+        for pid, name, control in matches:
+            try:
+                control.SetMasterVolume(scalar, None)
+                updated += 1
+            except Exception:
+                self.sessions.forget(pid)
+        return updated
+    
+    async def list_apps(self) -> Tuple[bool, str]:
+        """List applications that currently have audio sessions."""
+        try:
+            if self._get_worker() is None:
+                return False, "❌ Audio control not available"
+            
+            apps = await self._call(self._read_apps)
+            if not apps:
+                return True, "🔇 No applications are playing audio"
+            
+            lines = ["🎛️ **Audio Applications**", ""]
+            for name, volume, muted in apps:
+                suffix = " (muted)" if muted else ""
+                lines.append(f"• `{_app_key(name)}` - {volume}%{suffix}")
+            return True, "\n".join(lines)
+        
+        except Exception as e:
+            logger.error(f"Failed to list audio apps: {e}")
+            return False, f"❌ Failed to list audio apps: {e}"
+    
+    async def set_app_volume(self, app: str, level: int) -> Tuple[bool, str]:
+        """Set volume (0-100) for one application."""
+        try:
+            level = max(0, min(100, level))
+            
+            if self._get_worker() is None:
+                return False, "❌ Audio control not available"
+            
+            start = time.perf_counter()
+            updated = await self._call(
+                lambda backend: self._write_app_volume(backend, app, level / 100.0)
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            if not updated:
+                return False, f"❌ No audio session found for '{app}' (see /apps)"
+            
+            logger.info(f"Volume for {app} set to {level}% ({updated} sessions, {elapsed_ms:.1f}ms)")
+            return True, f"🎛️ {app} volume set to {level}%"
+        
+        except Exception as e:
+            logger.error(f"Failed to set volume for {app}: {e}")
+            return False, f"❌ Failed to set volume for {app}: {e}"
+    
     async def mute(self) -> Tuple[bool, str]:
         """Mute audio."""
         try:
-            interface = self._get_volume_interface()
-            if interface is None:
+            if self._get_worker() is None:
                 return False, "❌ Audio control not available"
             
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: interface.SetMute(1, None)
-            )
+            await self._call(lambda backend: backend.set_mute(True))
             
             logger.info("Audio muted")
             return True, "🔇 Audio muted"
-            
+        
         except Exception as e:
             logger.error(f"Failed to mute: {e}")
             return False, f"❌ Failed to mute: {e}"
@@ -110,18 +651,14 @@ class AudioControl:
     async def unmute(self) -> Tuple[bool, str]:
         """Unmute audio."""
         try:
-            interface = self._get_volume_interface()
-            if interface is None:
+            if self._get_worker() is None:
                 return False, "❌ Audio control not available"
             
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: interface.SetMute(0, None)
-            )
+            await self._call(lambda backend: backend.set_mute(False))
             
             logger.info("Audio unmuted")
             return True, "🔊 Audio unmuted"
-            
+        
         except Exception as e:
             logger.error(f"Failed to unmute: {e}")
             return False, f"❌ Failed to unmute: {e}"
@@ -129,20 +666,23 @@ class AudioControl:
     async def is_muted(self) -> Tuple[bool, bool]:
         """Check if audio is muted. Returns (success, is_muted)."""
         try:
-            interface = self._get_volume_interface()
-            if interface is None:
+            if self._get_worker() is None:
                 return False, False
             
-            muted = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: interface.GetMute()
-            )
+            muted = await self._call(lambda backend: backend.get_mute())
             
             return True, bool(muted)
-            
+        
         except Exception as e:
             logger.error(f"Failed to check mute status: {e}")
             return False, False
+    
+    def close(self) -> None:
+        """Stop the audio worker thread."""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker.join(timeout=2)
+            self._worker = None
 
 
 # Singleton instance
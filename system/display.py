@@ -2,12 +2,15 @@
 # Handles: Screenshot, Brightness
 
 import io
+import time
 import asyncio
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 from pathlib import Path
 
 from loguru import logger
 
+import config
+
 try:
     import pyautogui
     PYAUTOGUI_AVAILABLE = True
@@ -26,6 +29,33 @@ except ImportError:
 class DisplayControl:
     """Windows display control functions."""
     
+    def __init__(self):
+        # Per-monitor brightness cache (index = monitor number)
+        self._brightness_cache: List[int] = []
+        self._brightness_cached_at = 0.0
+        
+        # Latest requested level; writers collapse bursts onto this value
+        self._pending_brightness: Optional[int] = None
+        # Outcome of the burst currently being collected, shared by its callers
+        self._brightness_batch: Optional[asyncio.Future] = None
+        self._brightness_lock: Optional[asyncio.Lock] = None
+    
+    def _cache_valid(self) -> bool:
+        """Check if the cached brightness can be served without hardware access."""
+        if not self._brightness_cache:
+            return False
+        return time.monotonic() - self._brightness_cached_at < config.BRIGHTNESS_CACHE_TTL
+    
+    def _update_cache(self, levels: List[int]) -> None:
+        """Store per-monitor brightness levels."""
+        self._brightness_cache = list(levels)
+        self._brightness_cached_at = time.monotonic()
+    
+    def invalidate_brightness_cache(self) -> None:
+        """Force the next read to hit the hardware."""
+        self._brightness_cache = []
+        self._brightness_cached_at = 0.0
+    
     async def take_screenshot(self) -> Tuple[bool, str, Optional[bytes]]:
         """Take a screenshot and return as bytes."""
         if not PYAUTOGUI_AVAILABLE:
@@ -48,58 +78,102 @@ class DisplayControl:
             
             logger.info("Screenshot taken successfully")
             return True, "📸 Screenshot captured!", buffer.getvalue()
-            
+        
         except Exception as e:
             logger.error(f"Failed to take screenshot: {e}")
             return False, f"❌ Failed to take screenshot: {e}", None
     
-    async def get_brightness(self) -> Tuple[bool, str, int]:
-        """Get current screen brightness (0-100)."""
+    async def get_brightness(self, monitor: int = 0) -> Tuple[bool, str, int]:
+        """Get current screen brightness (0-100), served from cache when fresh."""
         if not SBC_AVAILABLE:
             return False, "❌ Brightness control not available", 0
         
         try:
-            brightness = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: sbc.get_brightness()[0]  # Get first monitor
-            )
+            if not self._cache_valid():
+                levels = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    sbc.get_brightness  # All monitors in one WMI/DDC-CI round-trip
+                )
+                self._update_cache(levels)
             
-            return True, f"☀️ Current brightness: {brightness}%", brightness
+            if monitor >= len(self._brightness_cache):
+                return False, f"❌ Monitor {monitor} not found", 0
             
+            brightness = self._brightness_cache[monitor]
+            return True, f"☀️ Current brightness: {brightness}%", brightness
+        
         except Exception as e:
+            self.invalidate_brightness_cache()
             logger.error(f"Failed to get brightness: {e}")
             return False, f"❌ Failed to get brightness: {e}", 0
     
     async def set_brightness(self, level: int) -> Tuple[bool, str]:
-        """Set screen brightness (0-100)."""
+        """Set screen brightness (0-100).
+        
+        Bursts of calls are collapsed: every caller records its level as the
+        pending value and joins the current batch. The first caller of a
+        batch to get the write lock applies only the most recent level; the
+        others wait for that write and return its outcome, so a failed write
+        is reported to every caller it superseded.
+        """
         if not SBC_AVAILABLE:
             return False, "❌ Brightness control not available"
         
+        # Clamp value between 0 and 100
+        level = max(0, min(100, level))
+        self._pending_brightness = level
+        
+        if self._brightness_lock is None:
+            self._brightness_lock = asyncio.Lock()
+        if self._brightness_batch is None:
+            self._brightness_batch = asyncio.get_running_loop().create_future()
+        batch = self._brightness_batch
+        
+        async with self._brightness_lock:
+            if not batch.done():
+                # Let the rest of a burst arrive before touching the hardware
+                await asyncio.sleep(config.BRIGHTNESS_DEBOUNCE)
+                
+                # Later calls start a new batch from here on
+                if self._brightness_batch is batch:
+                    self._brightness_batch = None
+                target = self._pending_brightness
+                self._pending_brightness = None
+                if target is None:
+                    target = level  # The previous holder was cancelled mid-write
+                
+                batch.set_result(await self._write_brightness(target))
+        
+        return batch.result()
+    
+    async def _write_brightness(self, level: int) -> Tuple[bool, str]:
+        """Apply a level to every monitor (always written; the screen may
+        have been changed outside REMO since the last read)."""
         try:
-            # Clamp value between 0 and 100
-            level = max(0, min(100, level))
-            
             await asyncio.get_event_loop().run_in_executor(
                 None,
                 lambda: sbc.set_brightness(level)
             )
-            
-            # Choose emoji based on level
-            if level < 25:
-                emoji = "🌑"
-            elif level < 50:
-                emoji = "🌓"
-            elif level < 75:
-                emoji = "🌔"
-            else:
-                emoji = "☀️"
-            
+            # Monitor count is only known once a read has happened
+            if self._brightness_cache:
+                self._update_cache([level] * len(self._brightness_cache))
             logger.info(f"Brightness set to {level}%")
-            return True, f"{emoji} Brightness set to {level}%"
-            
         except Exception as e:
+            self.invalidate_brightness_cache()
             logger.error(f"Failed to set brightness: {e}")
             return False, f"❌ Failed to set brightness: {e}"
+        
+        # Choose emoji based on level
+        if level < 25:
+            emoji = "🌑"
+        elif level < 50:
+            emoji = "🌓"
+        elif level < 75:
+            emoji = "🌔"
+        else:
+            emoji = "☀️"
+        
+        return True, f"{emoji} Brightness set to {level}%"
 
 
 # Singleton instance
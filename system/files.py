@@ -0,0 +1,429 @@
+# REMO - File Transfer Module
+# Handles: Browsing folders (/ls, /api/fs) and streaming files off the
+#          machine in compressed, size-limited parts
+
+import os
+import time
+import zlib
+import shutil
+import asyncio
+import tempfile
+import itertools
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+import config
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def resolve_path(text: str) -> Tuple[Optional[Path], Optional[str]]:
+    """Resolve a user-supplied path, enforcing FILE_ROOTS if configured.
+    
+    Returns (path, error message).
+    """
+    try:
+        path = Path(text.strip().strip('"')).expanduser().resolve()
+    except (OSError, RuntimeError) as e:
+        return None, f"❌ Invalid path: {e}"
+    
+    if config.FILE_ROOTS and not any(path.is_relative_to(root) for root in config.FILE_ROOTS):
+        return None, "❌ Path is outside the allowed folders"
+    return path, None
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class CachedDirectory:
+    """One scandir() of a directory, valid while the directory's mtime holds.
+    
+    os.DirEntry caches is_dir() and stat() after the first call (on Windows
+    both come free with the scan), so entries shown once are never re-stat'ed.
+    Sorted orders are built on first request and kept.
+    """
+    
+    def __init__(self, path: Path, mtime_ns: int):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        with os.scandir(path) as scan:
+            self.entries: List[os.DirEntry] = list(scan)
+        self._orders: Dict[str, List[os.DirEntry]] = {}
+    
+    def sorted(self, key: str) -> List[os.DirEntry]:
+        order = self._orders.get(key)
+        if order is None:
+            order = sorted(self.entries, key=SORT_KEYS[key])
+            self._orders[key] = order
+        return order
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _size(entry: os.DirEntry) -> int:
+    stat = _stat(entry)
+    return stat.st_size if stat and not _is_dir(entry) else 0
+
+
+def _mtime(entry: os.DirEntry) -> float:
+    stat = _stat(entry)
+    return stat.st_mtime if stat else 0.0
+
+
+# Folders first, then by name / largest / newest. Only "name" avoids stat().
+SORT_KEYS = {
+    "name": lambda entry: (not _is_dir(entry), entry.name.casefold()),
+    "size": lambda entry: (not _is_dir(entry), -_size(entry), entry.name.casefold()),
+    "date": lambda entry: (not _is_dir(entry), -_mtime(entry), entry.name.casefold()),
+}
+
+
+class Listing:
+    """One page of a directory listing.
+    
+    Built in an executor thread: the parent check and the entries' stat()
+    happen there, so rendering the page never touches the disk.
+    """
+    
+    def __init__(self, path: Path, entries: List[os.DirEntry], page: int, pages: int,
+                 total: int, sort: str, cached: bool):
+        self.path = path
+        self.entries = entries
+        self.page = page
+        self.pages = pages
+        self.total = total
+        self.sort = sort
+        self.cached = cached
+        self.parent = self._parent()
+        for entry in entries:
+            _size(entry)  # Caches is_dir() and stat() on the DirEntry
+    
+    def _parent(self) -> Optional[Path]:
+        """Parent folder, if it is still inside the allowed folders."""
+        parent = self.path.parent
+        if parent == self.path:
+            return None
+        _, error = resolve_path(str(parent))
+        return None if error else parent
+    
+    def is_folder(self, entry: os.DirEntry) -> bool:
+        return _is_dir(entry)
+    
+    def label(self, entry: os.DirEntry) -> str:
+        """Button text for an entry."""
+        if _is_dir(entry):
+            return f"📁 {entry.name}"
+        return f"📄 {entry.name} · {format_size(_size(entry))}"
+    
+    def to_dict(self) -> dict:
+        """JSON form for /api/fs."""
+        return {
+            "path": str(self.path),
+            "parent": str(self.parent) if self.parent else None,
+            "page": self.page,
+            "pages": self.pages,
+            "total": self.total,
+            "sort": self.sort,
+            "cached": self.cached,
+            "entries": [
+                {
+                    "name": entry.name,
+                    "dir": _is_dir(entry),
+                    "size": _size(entry),
+                    "modified": _mtime(entry),
+                }
+                for entry in self.entries
+            ],
+        }
+
+
+class DirectoryBrowser:
+    """Paginated directory listings shared by /ls and the dashboard.
+    
+    Scans are cached per directory (LRU, FILE_BROWSER_CACHE_DIRS entries) and
+    reused while the directory's mtime is unchanged, so paging or coming back
+    to a folder costs one stat() instead of a scan of every entry. Adding,
+    removing or renaming entries bumps the mtime; a file growing in place
+    does not, so sizes can lag until the folder itself changes.
+    """
+    
+    def __init__(self, max_dirs: int, max_tokens: int):
+        self.max_dirs = max_dirs
+        self.max_tokens = max_tokens
+        self._cache: "OrderedDict[Path, CachedDirectory]" = OrderedDict()
+        self._lock = threading.Lock()  # Scans run in executor threads
+        self.hits = 0
+        self.misses = 0
+        
+        # Telegram callback data is limited to 64 bytes, so buttons carry
+        # short tokens that map back to paths
+        self._tokens: "OrderedDict[str, Path]" = OrderedDict()
+        self._token_of: Dict[Path, str] = {}
+        self._counter = itertools.count(1)
+    
+    def _scan(self, path: Path) -> Tuple[CachedDirectory, bool]:
+        mtime_ns = path.stat().st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                return cached, True
+            self.misses += 1
+        
+        # Scan outside the lock so a slow folder doesn't hold up others
+        cached = CachedDirectory(path, mtime_ns)
+        with self._lock:
+            self._cache[path] = cached
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_dirs:
+                self._cache.popitem(last=False)
+        return cached, False
+    
+    async def list(self, text: str, page: int = 0, sort: str = "name") -> Tuple[Optional[Listing], Optional[str]]:
+        """Get one page of a folder; returns (listing, error message).
+        
+        The scan and stat() calls run in an executor, so a huge or slow
+        (network) folder doesn't stall the bot or the dashboard.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._list, text, page, sort)
+    
+    def _list(self, text: str, page: int, sort: str) -> Tuple[Optional[Listing], Optional[str]]:
+        path, error = resolve_path(text)
+        if error:
+            return None, error
+        if sort not in SORT_KEYS:
+            return None, f"❌ Unknown sort: {sort} (use {', '.join(SORT_KEYS)})"
+        if not path.is_dir():
+            return None, f"❌ Not a folder: {path}"
+        
+        try:
+            cached, hit = self._scan(path)
+        except OSError as e:
+            return None, f"❌ Cannot open {path}: {e.strerror or e}"
+        
+        size = config.FILE_BROWSER_PAGE_SIZE
+        total = len(cached.entries)
+        pages = max(1, -(-total // size))
+        page = max(0, min(page, pages - 1))
+        
+        # Name order needs no stat(); size/date stat every entry once per scan
+        entries = cached.sorted(sort)[page * size:(page + 1) * size]
+        return Listing(path, entries, page, pages, total, sort, hit), None
+    
+    def default_path(self) -> Path:
+        """Where /ls starts without an argument."""
+        return config.FILE_ROOTS[0] if config.FILE_ROOTS else Path.home()
+    
+    def token(self, path: Path) -> str:
+        """Short, reusable token for a path (for callback data)."""
+        token = self._token_of.get(path)
+        if token is not None:
+            self._tokens.move_to_end(token)
+            return token
+        
+        token = format(next(self._counter), "x")
+        self._tokens[token] = path
+        self._token_of[path] = token
+        while len(self._tokens) > self.max_tokens:
+            _, old = self._tokens.popitem(last=False)
+            self._token_of.pop(old, None)
+        return token
+    
+    def path_for(self, token: str) -> Optional[Path]:
+        return self._tokens.get(token)
+
+
+class TransferStats:
+    """Counters for one transfer (throughput and memory)."""
+    
+    def __init__(self, path: Path, size: int, compressed: bool):
+        self.path = path
+        self.size = size
+        self.compressed = compressed
+        self.bytes_read = 0
+        self.bytes_sent = 0
+        self.parts = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        self.peak_rss = 0
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+    
+    def sample_memory(self) -> None:
+        if self._process is not None:
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+    
+    def describe(self) -> str:
+        """Summary line for the final reply."""
+        mb = 1024 * 1024
+        elapsed = max(self.elapsed, 1e-6)
+        lines = [
+            f"📦 {self.path.name} - {self.size / mb:.1f} MB",
+            f"├ Sent: {self.bytes_sent / mb:.1f} MB in {self.parts} part(s)"
+            + (" (gzip)" if self.compressed else ""),
+            f"├ Time: {self.elapsed:.1f}s ({self.bytes_read / mb / elapsed:.1f} MB/s read)",
+        ]
+        if self.peak_rss:
+            lines.append(f"└ Peak RSS: {self.peak_rss / mb:.0f} MB")
+        else:
+            lines[-1] = lines[-1].replace("├", "└")
+        return "\n".join(lines)
+
+
+class _PartWriter:
+    """Reads the source in chunks and writes (optionally gzipped) parts.
+    
+    Only one chunk plus the compressor state is ever in memory; each part
+    is spooled to a temporary file of at most FILE_PART_SIZE bytes.
+    """
+    
+    def __init__(self, path: Path, workdir: Path, stats: TransferStats):
+        self.source = open(path, "rb")
+        self.workdir = workdir
+        self.stats = stats
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if stats.compressed else None
+        self.pending = b""
+        self.eof = False
+        self.number = 0
+    
+    def _next_data(self) -> bytes:
+        """Next block of output bytes (compressed if enabled); b"" when done."""
+        while not self.eof:
+            chunk = self.source.read(config.FILE_CHUNK_SIZE)
+            self.stats.bytes_read += len(chunk)
+            if not chunk:
+                self.eof = True
+                return self.compressor.flush() if self.compressor else b""
+            data = self.compressor.compress(chunk) if self.compressor else chunk
+            if data:
+                return data
+        return b""
+    
+    def next_part(self) -> Optional[Path]:
+        """Write the next part file; None when the source is exhausted."""
+        limit = config.FILE_PART_SIZE
+        written = 0
+        self.number += 1
+        part = self.workdir / f"part{self.number:03d}"
+        
+        with open(part, "wb") as out:
+            while written < limit:
+                data = self.pending or self._next_data()
+                self.pending = b""
+                if not data:
+                    break
+                room = limit - written
+                if len(data) > room:
+                    data, self.pending = data[:room], data[room:]
+                out.write(data)
+                written += len(data)
+                if self.number == 1 or written % (16 * config.FILE_CHUNK_SIZE) < len(data):
+                    self.stats.sample_memory()
+        
+        self.stats.sample_memory()
+        if written == 0:
+            part.unlink()
+            return None
+        return part
+    
+    def close(self) -> None:
+        self.source.close()
+
+
+class FileTransfer:
+    """Stream files to the bot in parts small enough for Telegram."""
+    
+    def is_compressible(self, path: Path) -> bool:
+        return path.suffix.lower() in config.FILE_COMPRESS_EXTENSIONS
+    
+    def check(self, text: str) -> Tuple[Optional[Path], Optional[str]]:
+        """Validate a /getfile path; returns (path, error message)."""
+        path, error = resolve_path(text)
+        if error:
+            return None, error
+        if not path.is_file():
+            return None, f"❌ Not a file: {path}"
+        if not os.access(path, os.R_OK):
+            return None, f"❌ Cannot read: {path}"
+        return path, None
+    
+    def begin(self, path: Path) -> TransferStats:
+        """Start the counters for a transfer of a checked path."""
+        return TransferStats(path, path.stat().st_size, self.is_compressible(path))
+    
+    def is_single_part(self, stats: TransferStats) -> bool:
+        # gzip never grows text by more than a few bytes per 64 KB block
+        return stats.size <= config.FILE_PART_SIZE - 64 * 1024
+    
+    def part_name(self, stats: TransferStats, number: int) -> str:
+        """file.log.gz for a single part, file.log.gz.001/.002/... otherwise."""
+        name = stats.path.name + (".gz" if stats.compressed else "")
+        return name if self.is_single_part(stats) else f"{name}.{number:03d}"
+    
+    async def parts(self, path: Path, stats: TransferStats) -> AsyncIterator[Tuple[Path, int]]:
+        """Yield (part file, part number) for a file.
+        
+        The next part is prepared in a worker thread while the current one
+        uploads, so reading/compressing overlaps with the network. At most
+        two part files exist on disk at any time.
+        """
+        loop = asyncio.get_running_loop()
+        workdir = Path(tempfile.mkdtemp(prefix="remo-transfer-"))
+        writer = _PartWriter(path, workdir, stats)
+        following = loop.run_in_executor(None, writer.next_part)
+        try:
+            while True:
+                current = await following
+                if current is None:
+                    break
+                following = loop.run_in_executor(None, writer.next_part)
+                
+                stats.parts += 1
+                stats.bytes_sent += current.stat().st_size
+                yield current, stats.parts
+                current.unlink()
+        finally:
+            # Let an in-flight part finish before closing the source under it
+            try:
+                await following
+            except Exception:
+                pass
+            writer.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+            stats.elapsed = time.perf_counter() - stats.start
+            logger.info(
+                f"Transferred {path} ({stats.bytes_read} bytes read, {stats.bytes_sent} sent, "
+                f"{stats.parts} parts) in {stats.elapsed:.1f}s, peak RSS {stats.peak_rss >> 20} MB"
+            )
+
+
+# Singleton instances
+browser = DirectoryBrowser(
+    max_dirs=config.FILE_BROWSER_CACHE_DIRS,
+    max_tokens=config.FILE_BROWSER_MAX_TOKENS,
+)
+transfer = FileTransfer()
@@ -0,0 +1,225 @@
+# REMO - Idle Detection Module
+# Handles: User idle time, automatic lock/sleep policies
+
+import json
+import time
+import ctypes
+import asyncio
+from pathlib import Path
+from typing import Tuple, Optional, Dict, Callable, Awaitable
+
+from loguru import logger
+
+import config
+from system.power import power
+from utils.audit import audit
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# =============================================================================
+# IDLE SOURCES
+# =============================================================================
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+
+class WindowsIdleSource:
+    """Idle time from GetLastInputInfo (one user32 call, no allocation)."""
+    
+    def __init__(self):
+        self._info = LASTINPUTINFO()
+        self._info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+    
+    def idle_seconds(self) -> float:
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            return 0.0
+        # Both tick counts are 32-bit and wrap every ~49.7 days
+        elapsed = (self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF
+        return elapsed / 1000.0
+
+
+class FakeIdleSource:
+    """Settable idle time for non-Windows hosts and tests."""
+    
+    def __init__(self):
+        self.idle = 0.0
+        self.on_battery = False
+    
+    def idle_seconds(self) -> float:
+        return self.idle
+
+
+def default_idle_source():
+    """Pick the idle source from config.IDLE_SOURCE (None if unavailable).
+    
+    Like the audio backend, the fake is only used when asked for: off
+    Windows the monitor is disabled rather than silently never firing.
+    """
+    if config.IDLE_SOURCE == "fake":
+        return FakeIdleSource()
+    if hasattr(ctypes, "windll"):
+        return WindowsIdleSource()
+    return None
+
+
+# =============================================================================
+# POLICY ENGINE
+# =============================================================================
+
+POLICY_NAMES = ("lock", "sleep")
+
+
+class IdleMonitor:
+    """Sample idle time on a fixed tick and apply lock/sleep policies.
+    
+    Policies are minutes of idle time (None = disabled): "lock" applies
+    always, "sleep" only while running on battery. Each policy fires at
+    most once per idle period; any user input starts a new period.
+    """
+    
+    def __init__(self, path: Path, source=None):
+        self.path = path
+        self.source = source if source is not None else default_idle_source()
+        self.policies: Dict[str, Optional[int]] = dict(config.IDLE_POLICY_DEFAULTS)
+        self._fired: set = set()
+        self._last_idle = 0.0
+        
+        # Probe cost accounting (for /idle)
+        self._samples = 0
+        self._probe_time = 0.0
+        
+        # Set by main to report triggered actions
+        self.notify: Optional[Callable[[str], Awaitable[None]]] = None
+    
+    def _load(self) -> None:
+        """Load policies changed from the bot."""
+        if not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+            self.policies.update({k: v for k, v in saved.items() if k in POLICY_NAMES})
+        except Exception as e:
+            logger.error(f"Failed to load idle policies: {e}")
+    
+    def _save(self) -> None:
+        try:
+            self.path.write_text(json.dumps(self.policies, indent=2), encoding="utf-8")
+        except Exception as e:
+            logger.error(f"Failed to save idle policies: {e}")
+    
+    def set_policy(self, name: str, minutes: Optional[int]) -> Tuple[bool, str]:
+        """Enable (minutes) or disable (None) a policy."""
+        if name not in POLICY_NAMES:
+            return False, f"❌ Unknown policy: {name} (use lock or sleep)"
+        if minutes is not None and minutes < 1:
+            return False, "❌ Minutes must be at least 1"
+        
+        self.policies[name] = minutes
+        self._save()
+        
+        if minutes is None:
+            logger.info(f"Idle {name} policy disabled")
+            return True, f"✅ Idle {name} disabled"
+        
+        logger.info(f"Idle {name} policy set to {minutes} min")
+        where = " on battery" if name == "sleep" else ""
+        return True, f"✅ Will {name} after {minutes} min idle{where}"
+    
+    def idle_seconds(self) -> float:
+        """Sample idle time, accounting for the probe's cost."""
+        start = time.perf_counter()
+        idle = self.source.idle_seconds()
+        self._probe_time += time.perf_counter() - start
+        self._samples += 1
+        return idle
+    
+    def on_battery(self) -> bool:
+        if isinstance(self.source, FakeIdleSource):
+            return self.source.on_battery
+        if not PSUTIL_AVAILABLE:
+            return False
+        battery = psutil.sensors_battery()
+        return battery is not None and not battery.power_plugged
+    
+    def get_status(self) -> str:
+        """Formatted idle time, policies and probe cost."""
+        if self.source is None:
+            return "❌ Idle detection not available (Windows only)"
+        
+        idle = int(self.idle_seconds())
+        avg_us = self._probe_time / self._samples * 1e6 if self._samples else 0.0
+        
+        def describe(name: str) -> str:
+            minutes = self.policies.get(name)
+            return f"after {minutes} min" if minutes else "off"
+        
+        return "\n".join([
+            "💤 **Idle Monitor**",
+            "",
+            f"⏱️ **Idle for:** {idle // 60}m {idle % 60}s",
+            f"🔒 **Lock:** {describe('lock')}",
+            f"😴 **Sleep (battery):** {describe('sleep')}",
+            f"📏 **Probe cost:** {avg_us:.1f}µs avg over {self._samples} samples "
+            f"every {config.IDLE_CHECK_INTERVAL}s",
+        ])
+    
+    async def tick(self) -> None:
+        """Sample once and fire any policy whose threshold was crossed."""
+        idle = self.idle_seconds()
+        
+        # Idle time went down: the user is back, start a new idle period
+        if idle < self._last_idle:
+            self._fired.clear()
+        self._last_idle = idle
+        
+        for name, action in (("lock", power.lock_screen), ("sleep", power.sleep)):
+            minutes = self.policies.get(name)
+            if not minutes or name in self._fired or idle < minutes * 60:
+                continue
+            if name == "sleep" and not self.on_battery():
+                continue
+            
+            self._fired.add(name)
+            logger.info(f"Idle for {int(idle)}s, triggering {name}")
+            await self._notify(f"💤 Idle for {int(idle // 60)} min, triggering {name}")
+            start = time.perf_counter()
+            success, message = await action()
+            audit.record(
+                "idle", name, "ok" if success else "failed",
+                latency=time.perf_counter() - start, source="idle", detail=f"idle {int(idle)}s",
+            )
+            if not success:
+                await self._notify(message)
+    
+    async def run(self) -> None:
+        """Idle monitor loop."""
+        self._load()
+        if self.source is None:
+            logger.warning("Idle detection not available, idle policies disabled")
+            return
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Idle monitor error: {e}")
+            await asyncio.sleep(config.IDLE_CHECK_INTERVAL)
+    
+    async def _notify(self, text: str) -> None:
+        if self.notify is None:
+            return
+        try:
+            await self.notify(text)
+        except Exception as e:
+            logger.error(f"Failed to send idle notification: {e}")
+
+
+# Singleton instance
+idle_monitor = IdleMonitor(config.IDLE_POLICY_FILE)
@@ -2,105 +2,188 @@
 # Handles: Lock, Sleep, Shutdown, Restart
 
 import ctypes
-import subprocess
+import time
 import asyncio
-from typing import Tuple
+from typing import Tuple, List, Callable, Any, NamedTuple, Optional
 
 from loguru import logger
 
+import config
+
+
+class CommandResult(NamedTuple):
+    """Outcome of an OS command run by run_command."""
+    returncode: int
+    stdout: str
+    stderr: str
+    elapsed: float
+    
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+    
+    def describe(self) -> str:
+        """Short diagnostic for logs and error replies."""
+        detail = (self.stderr or self.stdout).strip().splitlines()
+        reason = detail[-1] if detail else "no output"
+        return f"exit code {self.returncode}: {reason}"
+
+
+class CommandTimeout(Exception):
+    """Raised when an OS command does not finish in time."""
+
+
+async def run_command(cmd: List[str], timeout: Optional[float] = None) -> CommandResult:
+    """Run an OS command as an async subprocess with a timeout.
+    
+    Never blocks the event loop or a pool thread; a command that overruns
+    its timeout is killed and raises CommandTimeout.
+    """
+    timeout = timeout or config.POWER_COMMAND_TIMEOUT
+    start = time.perf_counter()
+    
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise CommandTimeout(f"{' '.join(cmd)} timed out after {timeout:g}s")
+    
+    result = CommandResult(
+        returncode=process.returncode,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+        elapsed=time.perf_counter() - start,
+    )
+    
+    log = logger.debug if result.ok else logger.warning
+    log(f"{' '.join(cmd)} -> {result.describe()} ({result.elapsed * 1000:.0f}ms)")
+    return result
+
+
+async def run_api(fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """Run a blocking Windows API call in a worker thread with a timeout."""
+    timeout = timeout or config.POWER_COMMAND_TIMEOUT
+    return await asyncio.wait_for(
+        asyncio.get_running_loop().run_in_executor(None, fn),
+        timeout
+    )
+
 
 class PowerControl:
     """Windows power control functions."""
     
-    @staticmethod
-    async def lock_screen() -> Tuple[bool, str]:
+    def __init__(self):
+        # Hibernate-off is idempotent; try it once per process (a failure,
+        # e.g. no admin rights, would fail the same way every time)
+        self._hibernate_attempted = False
+    
+    async def lock_screen(self) -> Tuple[bool, str]:
         """Lock the Windows screen."""
         try:
             # Use ctypes to call Windows API
-            ctypes.windll.user32.LockWorkStation()
+            result = await run_api(ctypes.windll.user32.LockWorkStation)
+            if not result:
+                raise Exception("LockWorkStation returned False")
+            
             logger.info("Screen locked successfully")
             return True, "🔒 Screen locked successfully!"
         except Exception as e:
             logger.error(f"Failed to lock screen: {e}")
             return False, f"❌ Failed to lock screen: {e}"
     
-    @staticmethod
-    async def sleep() -> Tuple[bool, str]:
+    async def _ensure_hibernate_disabled(self) -> None:
+        """Disable hibernation so SetSuspendState sleeps instead of hibernating."""
+        if self._hibernate_attempted:
+            return
+        self._hibernate_attempted = True
+        
+        # Not fatal: sleep may still work without it
+        try:
+            result = await run_command(["powercfg", "-hibernate", "off"])
+        except (CommandTimeout, OSError) as e:
+            logger.warning(f"powercfg -hibernate off failed ({e})")
+            return
+        if not result.ok:
+            logger.warning(f"powercfg -hibernate off failed ({result.describe()})")
+    
+    async def sleep(self) -> Tuple[bool, str]:
         """Put the computer to sleep."""
         try:
-            # Run in executor to avoid blocking
-            await asyncio.get_event_loop().run_in_executor(
+            await self._ensure_hibernate_disabled()
+            
+            # SetSuspendState: Hibernate=False, ForceCritical=False, DisableWakeEvent=False
+            # It only returns after resume (or immediately on failure), so a
+            # call still running after a short wait means we are suspending.
+            loop = asyncio.get_running_loop()
+            suspend = loop.run_in_executor(
                 None,
-                lambda: subprocess.run(
-                    ["powercfg", "-hibernate", "off"],
-                    capture_output=True,
-                    check=False
-                )
+                lambda: ctypes.windll.powrprof.SetSuspendState(0, 0, 0)
             )
             
-            # SetSuspendState: Hibernate=False, ForceCritical=False, DisableWakeEvent=False
-            result = ctypes.windll.powrprof.SetSuspendState(0, 0, 0)
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(suspend),
+                    config.POWER_SUSPEND_CONFIRM_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                result = True
             
             if result:
                 logger.info("Computer going to sleep")
                 return True, "😴 Going to sleep..."
             else:
                 raise Exception("SetSuspendState returned False")
-                
+        
         except Exception as e:
             logger.error(f"Failed to sleep: {e}")
             return False, f"❌ Failed to sleep: {e}"
     
-    @staticmethod
-    async def shutdown(delay: int = 5) -> Tuple[bool, str]:
+    async def shutdown(self, delay: int = 5) -> Tuple[bool, str]:
         """Shutdown the computer with delay."""
         try:
-            cmd = ["shutdown", "/s", "/t", str(delay)]
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: subprocess.run(cmd, capture_output=True, check=True)
-            )
+            result = await run_command(["shutdown", "/s", "/t", str(delay)])
+            if not result.ok:
+                logger.error(f"Failed to shutdown: {result.describe()}")
+                return False, f"❌ Failed to shutdown: {result.describe()}"
+            
             logger.info(f"Shutdown scheduled in {delay} seconds")
             return True, f"🔴 Shutting down in {delay} seconds..."
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to shutdown: {e}")
-            return False, f"❌ Failed to shutdown: {e}"
         except Exception as e:
             logger.error(f"Failed to shutdown: {e}")
             return False, f"❌ Failed to shutdown: {e}"
     
-    @staticmethod
-    async def restart(delay: int = 5) -> Tuple[bool, str]:
+    async def restart(self, delay: int = 5) -> Tuple[bool, str]:
         """Restart the computer with delay."""
         try:
-            cmd = ["shutdown", "/r", "/t", str(delay)]
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: subprocess.run(cmd, capture_output=True, check=True)
-            )
+            result = await run_command(["shutdown", "/r", "/t", str(delay)])
+            if not result.ok:
+                logger.error(f"Failed to restart: {result.describe()}")
+                return False, f"❌ Failed to restart: {result.describe()}"
+            
             logger.info(f"Restart scheduled in {delay} seconds")
             return True, f"🔄 Restarting in {delay} seconds..."
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to restart: {e}")
-            return False, f"❌ Failed to restart: {e}"
         except Exception as e:
             logger.error(f"Failed to restart: {e}")
             return False, f"❌ Failed to restart: {e}"
     
-    @staticmethod
-    async def cancel_shutdown() -> Tuple[bool, str]:
+    async def cancel_shutdown(self) -> Tuple[bool, str]:
         """Cancel a scheduled shutdown/restart."""
         try:
-            cmd = ["shutdown", "/a"]
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: subprocess.run(cmd, capture_output=True, check=True)
-            )
+            result = await run_command(["shutdown", "/a"])
+            if not result.ok:
+                # 1116 = ERROR_NO_SHUTDOWN_IN_PROGRESS
+                logger.error(f"Failed to cancel: {result.describe()}")
+                return False, f"❌ No scheduled shutdown to cancel"
+            
             logger.info("Shutdown/restart cancelled")
             return True, "✅ Shutdown/restart cancelled!"
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to cancel: {e}")
-            return False, f"❌ No scheduled shutdown to cancel"
         except Exception as e:
             logger.error(f"Failed to cancel: {e}")
             return False, f"❌ Failed to cancel: {e}"
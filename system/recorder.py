@@ -0,0 +1,197 @@
+# REMO - Screen Recorder Module
+# Handles: Short screen recordings (GIF / MP4)
+
+import io
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, Optional, Iterable, Deque
+
+from loguru import logger
+
+import config
+
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except ImportError:
+    PYAUTOGUI_AVAILABLE = False
+    logger.warning("pyautogui not available, screen recording disabled")
+
+
+# =============================================================================
+# ENCODER (runs in a worker process)
+# =============================================================================
+
+def _encode_frames(
+    frames: Iterable[bytes],
+    size: Tuple[int, int],
+    fps: int,
+    fmt: str,
+) -> Tuple[bytes, str]:
+    """Encode raw RGB frames into an animated GIF or MP4.
+    
+    Runs in a separate process so encoding never competes with the event
+    loop for the GIL. Falls back to GIF when the MP4 toolchain is missing
+    or fails (e.g. no ffmpeg binary for imageio).
+    """
+    frames = list(frames)  # In the worker, after unpickling: not a copy in the bot
+    if fmt == "mp4":
+        try:
+            import numpy as np
+            import imageio.v3 as iio
+            
+            width, height = size
+            arrays = np.stack([
+                np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 3)
+                for raw in frames
+            ])
+            data = iio.imwrite("<bytes>", arrays, extension=".mp4", fps=fps)
+            return data, "mp4"
+        except Exception:
+            pass  # Missing or broken MP4 toolchain: GIF always works
+    
+    from PIL import Image
+    
+    images = [Image.frombytes("RGB", size, raw) for raw in frames]
+    buffer = io.BytesIO()
+    images[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=images[1:],
+        duration=int(1000 / fps),
+        loop=0,
+    )
+    return buffer.getvalue(), "gif"
+
+
+# =============================================================================
+# RECORDER
+# =============================================================================
+
+class ScreenRecorder:
+    """Capture the screen into a bounded frame ring and encode it off-loop."""
+    
+    def __init__(self):
+        self._lock: Optional[asyncio.Lock] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the encoder process pool (created per recording, see close())."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1)
+        return self._pool
+    
+    @staticmethod
+    def _grab_frame(scale: float) -> Tuple[bytes, Tuple[int, int]]:
+        """Take one screenshot and return it as raw, downscaled RGB bytes."""
+        image = pyautogui.screenshot().convert("RGB")
+        
+        # Even dimensions keep MP4 (yuv420) encoders happy
+        width = max(2, int(image.width * scale) // 2 * 2)
+        height = max(2, int(image.height * scale) // 2 * 2)
+        if (width, height) != image.size:
+            image = image.resize((width, height))
+        
+        return image.tobytes(), (width, height)
+    
+    async def record(self, seconds: int) -> Tuple[bool, str, Optional[bytes], str]:
+        """Record the screen. Returns (success, message, data, format)."""
+        if not PYAUTOGUI_AVAILABLE:
+            return False, "❌ Recording not available (pyautogui not installed)", None, ""
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._lock.locked():
+            return False, "⚠️ A recording is already in progress", None, ""
+        
+        seconds = max(1, min(config.RECORD_MAX_SECONDS, seconds))
+        # Lower the frame rate so the whole clip fits in RECORD_MAX_FRAMES
+        # instead of the ring silently dropping its start
+        fps = max(1, min(config.RECORD_FPS, config.RECORD_MAX_FRAMES // seconds))
+        interval = 1.0 / fps
+        
+        # Ring of raw frames: memory never exceeds frame size x ring length
+        frames: Deque[bytes] = deque(maxlen=min(seconds * fps, config.RECORD_MAX_FRAMES))
+        size: Tuple[int, int] = (0, 0)
+        
+        async with self._lock:
+            try:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                next_tick = start
+                end = start + seconds
+                
+                while next_tick < end:
+                    raw, size = await loop.run_in_executor(
+                        None,
+                        lambda: self._grab_frame(config.RECORD_SCALE)
+                    )
+                    frames.append(raw)
+                    
+                    # Fixed-rate schedule; skip ticks if capture fell behind
+                    next_tick += interval
+                    now = loop.time()
+                    if next_tick < now:
+                        next_tick += ((now - next_tick) // interval + 1) * interval
+                    await asyncio.sleep(max(0.0, next_tick - now))
+                
+                captured = len(frames)
+                if captured == 0:
+                    return False, "❌ No frames captured", None, ""
+                
+                duration = captured / fps
+                
+                # Handing the ring to the encoder pickles it, so this process
+                # briefly holds it twice; the encoder process holds one more copy
+                ring_mb = size[0] * size[1] * 3 * frames.maxlen / (1024 ** 2)
+                logger.info(
+                    f"Captured {captured} frames at {size[0]}x{size[1]}, {fps} fps "
+                    f"(ring {ring_mb:.1f} MB, peak ~{ring_mb * 2:.1f} MB here during "
+                    f"hand-off + {ring_mb:.1f} MB in the encoder)"
+                )
+                
+                # Encode in a worker process so the event loop stays responsive
+                encode_start = time.perf_counter()
+                try:
+                    data, fmt = await loop.run_in_executor(
+                        self._get_pool(),
+                        _encode_frames,
+                        frames,
+                        size,
+                        fps,
+                        config.RECORD_FORMAT,
+                    )
+                finally:
+                    # Recordings are rare: don't keep an idle encoder process around
+                    self.close()
+                encode_time = time.perf_counter() - encode_start
+                frames.clear()
+                
+                throughput = captured / encode_time if encode_time > 0 else 0.0
+                size_mb = len(data) / (1024 ** 2)
+                logger.info(
+                    f"Encoded {captured} frames to {fmt.upper()} in {encode_time:.2f}s "
+                    f"({throughput:.1f} frames/s, {size_mb:.2f} MB)"
+                )
+                
+                return True, (
+                    f"🎥 {duration:.1f}s recording ({captured} frames at {fps} fps, {size_mb:.1f} MB)\n"
+                    f"⚙️ Encoded in {encode_time:.1f}s ({throughput:.1f} frames/s)"
+                ), data, fmt
+            
+            except Exception as e:
+                logger.error(f"Failed to record screen: {e}")
+                return False, f"❌ Failed to record screen: {e}", None, ""
+    
+    def close(self) -> None:
+        """Shut down the encoder process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+recorder = ScreenRecorder()
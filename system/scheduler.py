@@ -0,0 +1,195 @@
+# REMO - Power Scheduler Module
+# Handles: Scheduled shutdown/restart/sleep/lock, persisted across restarts
+
+import json
+import time
+import heapq
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Tuple, Optional, Dict, Any, List, Callable, Awaitable
+
+from loguru import logger
+
+import config
+from system.power import power
+from utils.audit import audit
+
+
+# Action name -> coroutine performing it
+ACTIONS: Dict[str, Callable[[], Awaitable[Tuple[bool, str]]]] = {
+    "shutdown": power.shutdown,
+    "restart": power.restart,
+    "sleep": power.sleep,
+    "lock": power.lock_screen,
+}
+
+MISSED_POLICIES = ("run", "skip")
+
+
+class PowerScheduler:
+    """Timer heap of scheduled power actions, driven by a single task.
+    
+    Jobs live in a dict keyed by ID; the heap holds (run_at, id) pairs and
+    cancelled jobs are skipped lazily when they reach the top. Every change
+    is written to disk so schedules survive a restart. A job that comes due
+    more than SCHEDULE_MISSED_GRACE seconds late (e.g. the machine was off)
+    is handled by its missed policy: "run" executes it anyway, "skip" drops it.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._next_id = 1
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        # Set by main to report fired/missed jobs (e.g. send a Telegram message)
+        self.notify: Optional[Callable[[str], Awaitable[None]]] = None
+    
+    def _load(self) -> None:
+        """Load persisted jobs from disk."""
+        if not self.path.exists():
+            return
+        
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._next_id = data.get("next_id", 1)
+            for job in data.get("jobs", []):
+                self._jobs[job["id"]] = job
+                heapq.heappush(self._heap, (job["run_at"], job["id"]))
+            logger.info(f"Loaded {len(self._jobs)} scheduled power actions")
+        except Exception as e:
+            logger.error(f"Failed to load schedules: {e}")
+    
+    def _save(self) -> None:
+        """Persist jobs atomically (write temp file, then rename)."""
+        try:
+            data = {"next_id": self._next_id, "jobs": list(self._jobs.values())}
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            logger.error(f"Failed to save schedules: {e}")
+    
+    def start(self) -> asyncio.Task:
+        """Load persisted jobs and start the scheduler task."""
+        self._wakeup = asyncio.Event()
+        self._load()
+        self._task = asyncio.create_task(self._run())
+        return self._task
+    
+    def add(
+        self,
+        action: str,
+        run_at: float,
+        missed_policy: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """Schedule an action at a Unix timestamp."""
+        if action not in ACTIONS:
+            return False, f"❌ Unknown action: {action}"
+        
+        policy = missed_policy or config.SCHEDULE_MISSED_POLICY.get(action, "skip")
+        if policy not in MISSED_POLICIES:
+            return False, f"❌ Missed policy must be one of: {', '.join(MISSED_POLICIES)}"
+        
+        job_id = str(self._next_id)
+        self._next_id += 1
+        self._jobs[job_id] = {
+            "id": job_id,
+            "action": action,
+            "run_at": run_at,
+            "missed_policy": policy,
+            "created_at": time.time(),
+        }
+        heapq.heappush(self._heap, (run_at, job_id))
+        self._save()
+        self._wake()
+        
+        when = datetime.fromtimestamp(run_at).strftime("%Y-%m-%d %H:%M")
+        logger.info(f"Scheduled {action} #{job_id} at {when} (missed: {policy})")
+        return True, f"⏰ Scheduled {action} #{job_id} at {when}\nUse /cancel {job_id} to cancel"
+    
+    def cancel(self, job_id: str) -> Tuple[bool, str]:
+        """Cancel a scheduled job. Its heap entry is dropped lazily."""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False, f"❌ No scheduled action #{job_id}"
+        
+        self._save()
+        self._wake()
+        logger.info(f"Cancelled scheduled {job['action']} #{job_id}")
+        return True, f"✅ Cancelled {job['action']} #{job_id}"
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get pending jobs ordered by run time."""
+        return sorted(self._jobs.values(), key=lambda job: job["run_at"])
+    
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            
+            while self._heap and self._heap[0][0] <= now:
+                run_at, job_id = heapq.heappop(self._heap)
+                job = self._jobs.get(job_id)
+                if job is None or job["run_at"] != run_at:
+                    continue  # Cancelled
+                
+                del self._jobs[job_id]
+                self._save()
+                await self._fire(job, lateness=now - run_at)
+            
+            # Wall-clock deadlines: cap the wait so suspend/resume is noticed
+            timeout = config.SCHEDULE_MAX_SLEEP
+            if self._heap:
+                timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+            
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _fire(self, job: Dict[str, Any], lateness: float) -> None:
+        """Run a due job, or skip it if it was missed and its policy says so."""
+        action = job["action"]
+        
+        if lateness > config.SCHEDULE_MISSED_GRACE and job["missed_policy"] == "skip":
+            minutes = int(lateness // 60)
+            logger.warning(f"Skipped missed {action} #{job['id']} ({minutes} min late)")
+            await self._notify(f"⏭️ Skipped scheduled {action} #{job['id']} (missed by {minutes} min)")
+            audit.record("scheduler", action, "skipped", source="scheduler", detail=f"#{job['id']}")
+            return
+        
+        logger.info(f"Running scheduled {action} #{job['id']}")
+        await self._notify(f"⏰ Running scheduled {action} #{job['id']}")
+        start = time.perf_counter()
+        try:
+            success, message = await ACTIONS[action]()
+        except Exception as e:
+            success, message = False, f"❌ Scheduled {action} failed: {e}"
+        audit.record(
+            "scheduler", action, "ok" if success else "failed",
+            latency=time.perf_counter() - start, source="scheduler", detail=f"#{job['id']}",
+        )
+        
+        if not success:
+            logger.error(f"Scheduled {action} #{job['id']} failed: {message}")
+            await self._notify(message)
+    
+    async def _notify(self, text: str) -> None:
+        if self.notify is None:
+            return
+        try:
+            await self.notify(text)
+        except Exception as e:
+            logger.error(f"Failed to send schedule notification: {e}")
+
+
+# Singleton instance
+scheduler = PowerScheduler(config.SCHEDULE_FILE)
@@ -0,0 +1,160 @@
+# REMO - Audio worker and volume ramp checks (FakeAudioBackend)
+# Run with: python -m pytest tests/  (or: python tests/test_audio.py)
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from system.audio import AudioControl, AudioWorker, FakeAudioBackend
+
+
+class RecordingBackend(FakeAudioBackend):
+    """Fake endpoint that remembers the order of writes."""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+    
+    def set_volume(self, scalar: float) -> None:
+        super().set_volume(scalar)
+        self.calls.append(("volume", scalar))
+    
+    def set_mute(self, muted: bool) -> None:
+        super().set_mute(muted)
+        self.calls.append(("mute", muted))
+
+
+def run_queued(worker: AudioWorker) -> None:
+    """Start a worker on an already-filled queue and let it drain."""
+    worker.start()
+    worker.stop()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+
+
+def test_volume_sets_coalesce():
+    """A burst of queued sets is one write of the latest level."""
+    backend = RecordingBackend()
+    worker = AudioWorker(lambda: backend)
+    futures = [worker.submit_volume(level / 10) for level in range(1, 6)]
+    run_queued(worker)
+    
+    assert backend.calls == [("volume", 0.5)]
+    assert [future.result() for future in futures] == [0.5] * 5
+
+
+def test_mute_keeps_its_place_behind_a_queued_set():
+    """A set queued after a mute can't merge into the set before it."""
+    backend = RecordingBackend()
+    worker = AudioWorker(lambda: backend)
+    worker.submit_volume(0.2)
+    worker.submit(lambda b: b.set_mute(True))
+    worker.submit_volume(0.4)
+    worker.submit_volume(0.6)
+    run_queued(worker)
+    
+    assert backend.calls == [("volume", 0.2), ("mute", True), ("volume", 0.6)]
+
+
+def test_backend_recreated_after_failure():
+    """A stale endpoint is replaced once; a second failure is reported."""
+    created = []
+    
+    class FlakyBackend(FakeAudioBackend):
+        def set_volume(self, scalar: float) -> None:
+            if len(created) == 1:
+                raise OSError("endpoint gone")
+            super().set_volume(scalar)
+    
+    def factory():
+        created.append(FlakyBackend())
+        return created[-1]
+    
+    worker = AudioWorker(factory)
+    recovered = worker.submit_volume(0.3)
+    run_queued(worker)
+    assert recovered.result() == 0.3
+    assert len(created) == 2 and created[-1].volume == 0.3
+    
+    def always_fails(backend):
+        raise OSError("no audio device")
+    
+    worker = AudioWorker(FakeAudioBackend)
+    failed = worker.submit(always_fails)
+    run_queued(worker)
+    assert isinstance(failed.exception(), OSError)
+
+
+def test_ramp_completes_at_target():
+    backend = FakeAudioBackend()
+    control = AudioControl(backend_factory=lambda: backend)
+    try:
+        success, message = asyncio.run(control.ramp_volume(80, 0.2))
+        assert success and "faded to 80%" in message
+        assert round(backend.volume, 2) == 0.8
+        assert control.ramps.last_stats["ticks"] > 1
+        assert not control.ramps.active
+    finally:
+        control.close()
+
+
+def test_ramp_cancelled_by_plain_set():
+    backend = FakeAudioBackend()
+    control = AudioControl(backend_factory=lambda: backend)
+    
+    async def fade_then_set():
+        fade = asyncio.create_task(control.ramp_volume(100, 5))
+        await asyncio.sleep(0.2)
+        set_result = await control.set_volume(30)
+        return await fade, set_result
+    
+    try:
+        (faded, fade_message), (set_ok, _) = asyncio.run(fade_then_set())
+        assert faded and "interrupted" in fade_message
+        assert set_ok and round(backend.volume, 2) == 0.3
+        assert not control.ramps.active
+    finally:
+        control.close()
+
+
+
+def test_ramp_started_during_final_write_keeps_its_schedule():
+    """A ramp picked up after a slow final write doesn't inherit the old tick time."""
+    class SlowBackend(FakeAudioBackend):
+        def set_volume(self, scalar: float) -> None:
+            time.sleep(0.3)
+            super().set_volume(scalar)
+    
+    control = AudioControl(backend_factory=SlowBackend)
+    
+    async def back_to_back():
+        worker = control._get_worker()
+        first = control.ramps.start(worker, 0.5, 0.2, 0.05)
+        await asyncio.sleep(0.4)  # First ramp is now awaiting its final write
+        second = control.ramps.start(worker, 0.2, 0.8, 0.3)
+        return await first, await second
+    
+    try:
+        first, second = asyncio.run(back_to_back())
+        assert not first["cancelled"] and not second["cancelled"]
+        assert second["max_jitter_ms"] < 100
+    finally:
+        control.close()
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    for test in (
+        test_volume_sets_coalesce,
+        test_mute_keeps_its_place_behind_a_queued_set,
+        test_backend_recreated_after_failure,
+        test_ramp_completes_at_target,
+        test_ramp_cancelled_by_plain_set,
+        test_ramp_started_during_final_write_keeps_its_schedule,
+    ):
+        test()
+        print(f"ok  {test.__name__}")
+    print(f"done in {time.perf_counter() - started:.1f}s")
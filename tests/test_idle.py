@@ -0,0 +1,101 @@
+# REMO - Idle policy checks (FakeIdleSource, power actions patched out)
+# Run with: python -m pytest tests/  (or: python tests/test_idle.py)
+
+import sys
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from system import idle
+from system.idle import FakeIdleSource, IdleMonitor
+
+
+class FakePower:
+    """Counts lock/sleep calls instead of touching the machine."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def lock_screen(self):
+        self.calls.append("lock")
+        return True, "locked"
+    
+    async def sleep(self):
+        self.calls.append("sleep")
+        return True, "sleeping"
+
+
+class FakeAudit:
+    def record(self, *args, **kwargs) -> None:
+        pass
+
+
+def run_ticks(policies, samples, on_battery=False):
+    """Feed idle samples (seconds) through tick(); returns the actions fired."""
+    power = FakePower()
+    saved = idle.power, idle.audit
+    idle.power, idle.audit = power, FakeAudit()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = FakeIdleSource()
+            source.on_battery = on_battery
+            monitor = IdleMonitor(Path(tmp) / "idle_policies.json", source=source)
+            monitor.policies = dict(policies)
+            
+            async def drive():
+                for seconds in samples:
+                    source.idle = seconds
+                    await monitor.tick()
+            
+            asyncio.run(drive())
+    finally:
+        idle.power, idle.audit = saved
+    return power.calls
+
+
+def test_fires_once_per_idle_period():
+    calls = run_ticks({"lock": 1, "sleep": None}, [30, 60, 75, 90, 600])
+    assert calls == ["lock"]
+
+
+def test_rearms_when_idle_time_drops():
+    calls = run_ticks({"lock": 1, "sleep": None}, [60, 90, 5, 30, 61, 120])
+    assert calls == ["lock", "lock"]
+
+
+def test_sleep_only_on_battery():
+    policies = {"lock": None, "sleep": 2}
+    assert run_ticks(policies, [60, 120, 300], on_battery=False) == []
+    assert run_ticks(policies, [60, 120, 300], on_battery=True) == ["sleep"]
+
+
+def test_policies_saved_and_loaded():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "idle_policies.json"
+        monitor = IdleMonitor(path, source=FakeIdleSource())
+        assert monitor.set_policy("lock", 10)[0]
+        assert monitor.set_policy("sleep", 30)[0]
+        assert monitor.set_policy("sleep", None)[0]
+        assert not monitor.set_policy("hibernate", 5)[0]
+        assert not monitor.set_policy("lock", 0)[0]
+        
+        reloaded = IdleMonitor(path, source=FakeIdleSource())
+        reloaded._load()
+        assert reloaded.policies["lock"] == 10
+        assert reloaded.policies["sleep"] is None
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    for test in (
+        test_fires_once_per_idle_period,
+        test_rearms_when_idle_time_drops,
+        test_sleep_only_on_battery,
+        test_policies_saved_and_loaded,
+    ):
+        test()
+        print(f"ok  {test.__name__}")
+    print(f"done in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,60 @@
+# REMO - Rate limiter checks
+# Run with: python -m pytest tests/  (or: python tests/test_ratelimit.py)
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.ratelimit import OVERFLOW_KEY, SlidingWindowLimiter, TokenBucketLimiter
+
+
+MILLION = 1_000_000
+
+
+def test_million_keys_stay_bounded():
+    """A spray of a million distinct keys never grows past max_keys."""
+    for limiter_class in (TokenBucketLimiter, SlidingWindowLimiter):
+        limiter = limiter_class(limit=5, window=60, max_keys=10000)
+        peak = 0
+        for key in range(MILLION):
+            limiter.is_allowed(key)
+            if key % 1000 == 0:
+                peak = max(peak, len(limiter))
+        assert max(peak, len(limiter)) <= limiter.max_keys
+
+
+def test_million_keys_cannot_flush_active_key():
+    """With evict_active=False a throttled key survives a key spray."""
+    limiter = SlidingWindowLimiter(limit=5, window=900, max_keys=10000, evict_active=False)
+    for _ in range(5):
+        assert limiter.is_allowed("attacker")
+    assert not limiter.is_allowed("attacker")
+    
+    for key in range(MILLION):
+        limiter.is_allowed(key)
+    
+    assert len(limiter) <= limiter.max_keys + 1
+    assert not limiter.is_allowed("attacker")
+    # The spray itself ends up sharing one throttled entry
+    assert not limiter.is_allowed(OVERFLOW_KEY)
+
+
+def test_idle_keys_make_room():
+    """Idle keys are still evicted, so the overflow entry is temporary."""
+    limiter = SlidingWindowLimiter(limit=5, window=1, max_keys=10, idle_ttl=0.01, evict_active=False)
+    for key in range(10):
+        limiter.is_allowed(key)
+    time.sleep(0.02)
+    for key in range(10, 20):
+        assert limiter.is_allowed(key)
+    assert OVERFLOW_KEY not in limiter._table
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    for test in (test_million_keys_stay_bounded, test_million_keys_cannot_flush_active_key, test_idle_keys_make_room):
+        test()
+        print(f"ok  {test.__name__}")
+    print(f"done in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,296 @@
+# REMO - Audit Log
+# Append-only JSON-lines record of who did what, when, with what outcome
+
+import os
+import json
+import time
+import asyncio
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+import config
+
+
+class AuditLog:
+    """Batched, append-only audit trail.
+    
+    record() only appends to an in-memory batch; a background writer flushes
+    the batch every AUDIT_FLUSH_INTERVAL seconds (or once it reaches
+    AUDIT_BATCH_SIZE) with a single write and fsync.
+    
+    A sparse offset index - the byte offset and timestamp of every
+    AUDIT_INDEX_EVERY-th record - lets queries seek straight to a record
+    number or point in time instead of rescanning the file.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._batch: List[Dict[str, Any]] = []
+        self._flush_now = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        
+        # Sparse index: entry i describes record number i * AUDIT_INDEX_EVERY
+        self._offsets: List[int] = []
+        self._times: List[float] = []
+        self._count = 0
+        self._size = 0
+        self._indexed = False
+        self.dropped = 0  # Entries lost because the pending batch was full
+    
+    def record(
+        self,
+        user: Any,
+        action: str,
+        outcome: str,
+        latency: Optional[float] = None,
+        source: str = "telegram",
+        detail: Optional[str] = None,
+    ) -> None:
+        """Queue an audit entry (never blocks on disk)."""
+        now = time.time()
+        entry = {
+            "ts": round(now, 3),
+            "time": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+            "user": user,
+            "source": source,
+            "action": action,
+            "outcome": outcome,
+            "latency_ms": round(latency * 1000, 1) if latency is not None else None,
+        }
+        if detail:
+            entry["detail"] = detail[:200]
+        
+        self._batch.append(entry)
+        self._trim()
+        if len(self._batch) >= config.AUDIT_BATCH_SIZE:
+            self._flush_now.set()
+    
+    def _trim(self) -> None:
+        """Bound the pending batch (writes may keep failing), dropping the oldest."""
+        excess = len(self._batch) - config.AUDIT_MAX_PENDING
+        if excess > 0:
+            del self._batch[:excess]
+            self.dropped += excess
+    
+    @staticmethod
+    def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+        """Decode one record; None for a damaged line."""
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) else None
+    
+    def _build_index(self) -> None:
+        """Index an existing file once (at startup)."""
+        self._offsets, self._times = [], []
+        self._count = 0
+        self._size = 0
+        
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Torn last line from a crash; overwritten below
+                    if self._count % config.AUDIT_INDEX_EVERY == 0:
+                        # A damaged record still gets its index point, with
+                        # the previous point's time so the times stay sorted
+                        entry = self._parse(line)
+                        ts = entry.get("ts") if entry else None
+                        if not isinstance(ts, (int, float)):
+                            ts = self._times[-1] if self._times else 0.0
+                        self._offsets.append(offset)
+                        self._times.append(ts)
+                    self._count += 1
+                    offset += len(line)
+                self._size = offset
+            
+            if self.path.stat().st_size != self._size:
+                os.truncate(self.path, self._size)
+        
+        self._indexed = True
+        logger.info(f"Audit log indexed: {self._count} entries")
+    
+    async def _ensure_index(self) -> None:
+        if not self._indexed:
+            await asyncio.get_running_loop().run_in_executor(None, self._build_index)
+    
+    def _write(self, batch: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, float]], int]:
+        """Append a batch with one write + fsync.
+        
+        Returns the new index points and the file size after the write.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        index_points = []
+        chunks = []
+        offset, count = self._size, self._count
+        for entry in batch:
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            if count % config.AUDIT_INDEX_EVERY == 0:
+                index_points.append((offset, entry["ts"]))
+            chunks.append(line)
+            offset += len(line)
+            count += 1
+        
+        with open(self.path, "ab") as f:
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        return index_points, offset
+    
+    async def flush(self) -> None:
+        """Write out the pending batch."""
+        async with self._write_lock:
+            if not self._batch:
+                return
+            await self._ensure_index()
+            batch, self._batch = self._batch, []
+            
+            try:
+                loop = asyncio.get_running_loop()
+                index_points, size = await loop.run_in_executor(None, self._write, batch)
+            except Exception as e:
+                logger.error(f"Failed to write audit log: {e}")
+                self._batch[:0] = batch  # Retry on the next flush
+                self._trim()
+                return
+            
+            for offset, ts in index_points:
+                self._offsets.append(offset)
+                self._times.append(ts)
+            self._count += len(batch)
+            self._size = size
+    
+    async def run(self) -> None:
+        """Background writer: flush on the interval or when a batch fills up.
+        
+        Errors are logged and retried on the next pass, so the writer never
+        dies and leaves record() piling up entries that are never written.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), config.AUDIT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit writer error: {e}")
+            if self.dropped:
+                logger.warning(f"Audit log: dropped {self.dropped} entries (pending batch full)")
+                self.dropped = 0
+    
+    def close(self) -> None:
+        """Synchronously write whatever is still pending (on shutdown)."""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            if not self._indexed:
+                self._build_index()
+            self._write(batch)
+        except Exception as e:
+            logger.error(f"Failed to write audit log on shutdown: {e}")
+    
+    def _read(
+        self,
+        start: int,
+        limit: int,
+        since: Optional[float],
+        filters: Dict[str, str],
+        stop: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Read up to `limit` matching records from record number `start`
+        (up to record number `stop`, default: the end)."""
+        # Seek to the closest index point at or before the start record / time
+        slot = start // config.AUDIT_INDEX_EVERY
+        if since is not None:
+            slot = max(slot, bisect_left(self._times, since) - 1)
+        slot = min(max(slot, 0), len(self._offsets) - 1)
+        if slot < 0:
+            return [], start
+        
+        number = slot * config.AUDIT_INDEX_EVERY
+        stop = self._count if stop is None else min(stop, self._count)
+        entries = []
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[slot])
+            while number < stop and len(entries) < limit:
+                line = f.readline()
+                if not line:
+                    break
+                number += 1
+                if number <= start:
+                    continue
+                
+                entry = self._parse(line)
+                if entry is None:
+                    continue
+                if since is not None and entry.get("ts", 0) < since:
+                    continue
+                if any(str(entry.get(key)) != value for key, value in filters.items()):
+                    continue
+                entry["offset"] = number - 1
+                entries.append(entry)
+        
+        return entries, number
+    
+    def _read_newest(self, limit: int, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Newest `limit` matching records, scanning back one index slot at a time."""
+        entries: List[Dict[str, Any]] = []
+        stop = self._count
+        for slot in range(len(self._offsets) - 1, -1, -1):
+            start = slot * config.AUDIT_INDEX_EVERY
+            chunk, _ = self._read(start, stop - start, None, filters, stop)
+            entries[:0] = chunk
+            stop = start
+            if len(entries) >= limit:
+                break
+        return entries[-limit:]
+    
+    async def query(
+        self,
+        offset: Optional[int] = None,
+        limit: int = 50,
+        since: Optional[float] = None,
+        **filters: str,
+    ) -> Dict[str, Any]:
+        """Query the audit log.
+        
+        offset is a record number (0 = oldest); without it (and without
+        `since`) the newest `limit` matching records are returned, scanning
+        back through the file as far as needed. `next_offset` continues a
+        forward scan. Filters match fields exactly (user, action, outcome,
+        source).
+        """
+        await self._ensure_index()
+        loop = asyncio.get_running_loop()
+        
+        if offset is None and since is None and filters:
+            entries = await loop.run_in_executor(None, self._read_newest, limit, filters)
+            return {"entries": entries, "total": self._count, "next_offset": None}
+        
+        if offset is None:
+            offset = 0 if since is not None else max(0, self._count - limit)
+        
+        entries, next_offset = await loop.run_in_executor(
+            None, self._read, offset, limit, since, filters
+        )
+        return {
+            "entries": entries,
+            "total": self._count,
+            "next_offset": next_offset if next_offset < self._count else None,
+        }
+
+
+# Singleton instance
+audit = AuditLog(config.AUDIT_FILE)
@@ -0,0 +1,18 @@
+# REMO - Duration Parsing
+# Shared by command handlers and macros ("5s", "2m", "1.5h")
+
+import re
+from typing import Optional
+
+
+_DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*(ms|s|sec|m|min|h)?$", re.IGNORECASE)
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600}
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """Parse durations like '90', '5s', '2m' or '1.5h' into seconds."""
+    match = _DURATION_PATTERN.match(text.strip())
+    if not match:
+        return None
+    value, unit = match.groups()
+    return float(value) * _DURATION_UNITS[(unit or "s").lower()]
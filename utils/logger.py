@@ -1,14 +1,77 @@
 # REMO - Logger Setup
 
 import sys
+import threading
+import multiprocessing
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from typing import Any, Deque, Dict, List
 from loguru import logger
 
 import config
+from utils.logsearch import log_search
+from utils.logtail import log_tail
+
+
+class LogBuffer:
+    """Ring buffer of the most recent log records (a loguru sink).
+    
+    Every record gets an increasing id, which doubles as the cursor for
+    since(): a client passes the last id it has seen and gets only newer
+    records. Cost depends on the number of new records, never on the size
+    of the log file, which the live views no longer read.
+    """
+    
+    def __init__(self, size: int):
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.cursor = 0  # id of the newest record
+    
+    def sink(self, message) -> None:
+        record = message.record
+        with self._lock:
+            self.cursor += 1
+            self._records.append({
+                "id": self.cursor,
+                "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+                "level": record["level"].name,
+                "module": record["name"],
+                "message": record["message"][:config.LOG_BUFFER_MESSAGE_MAX],
+            })
+    
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """Newest records first."""
+        with self._lock:
+            count = len(self._records)
+            return list(islice(self._records, max(0, count - limit), count))[::-1]
+    
+    def since(self, cursor: int, limit: int) -> Dict[str, Any]:
+        """Records newer than cursor (newest first, at most limit).
+        
+        missed is True when records after the cursor already fell out of the
+        buffer (the client should treat the result as a fresh list).
+        """
+        with self._lock:
+            count = len(self._records)
+            first = self.cursor - count + 1
+            if cursor > self.cursor:
+                # Cursor from before a restart: start over
+                cursor = 0
+            start = max(0, cursor + 1 - first, count - limit)
+            entries = list(islice(self._records, start, count))[::-1]
+            missed = cursor + 1 < first + start if count else False
+            return {"logs": entries, "cursor": self.cursor, "missed": missed}
 
 
 def setup_logger():
-    """Configure loguru logger for REMO."""
+    """Configure loguru logger for REMO (call once, from the entry point)."""
+    
+    # Worker processes (the recorder's encoder) re-import the entry module
+    # on Windows; they must not open remo.log or hook its rotation
+    if multiprocessing.parent_process() is not None:
+        logger.remove()
+        return logger
     
     # Create logs directory if not exists
     config.LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -40,12 +103,24 @@ def setup_logger():
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
         rotation="10 MB",
         retention="7 days",
-        compression="zip",
+        compression=log_search.compress,  # Zips and indexes each rotated segment
+        buffering=1,  # Flush every line so live tails see it right away
+    )
+    log_search.on_rotate = log_tail.on_rotate
+    
+    # Wakes /tail and /api/logs/tail followers (after the file sink wrote)
+    logger.add(log_tail.sink, level="DEBUG", format="{message}")
+    
+    # Recent records in memory for the dashboard (/api/logs, /api/stream)
+    logger.add(
+        log_buffer.sink,
+        level="DEBUG",
+        format="{message}",
     )
     
     logger.info("Logger initialized")
     return logger
 
 
-# Export configured logger
-remo_logger = setup_logger()
+# Shared ring buffer (added as a sink by setup_logger)
+log_buffer = LogBuffer(config.LOG_BUFFER_SIZE)
@@ -0,0 +1,384 @@
+# REMO - Log Search
+# Searches the current and rotated (zipped) logs, skipping segments via an index
+
+import os
+import re
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set
+
+import config
+
+
+# File sink format: "2026-01-19 08:30:33 | INFO     | module:func:line | message"
+LOG_LINE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:\.\d+)? \| (\w+)\s*\| ([^:|]+):\S* \| (.*)")
+WORD = re.compile(r"\w+")
+
+LEVELS = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def trigrams(words: Iterable[str]) -> Set[str]:
+    """Three-letter pieces of words (lowercase).
+    
+    Any substring of a message that is at least three word characters long
+    consists of trigrams of some word in it, so a segment whose filter lacks
+    one of the query's trigrams cannot contain the query.
+    """
+    grams: Set[str] = set()
+    for word in words:
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+class BloomFilter:
+    """Fixed-size bit array with k hashes (double hashing over blake2b)."""
+    
+    def __init__(self, bits: int, hashes: int, data: Optional[bytearray] = None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+    
+    @classmethod
+    def for_items(cls, items: Set[str]) -> "BloomFilter":
+        bits = max(64, len(items) * config.LOG_INDEX_BLOOM_BITS_PER_ITEM)
+        bloom = cls(bits, config.LOG_INDEX_BLOOM_HASHES)
+        for item in items:
+            bloom.add(item)
+        return bloom
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+    
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.data[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"bits": self.bits, "hashes": self.hashes, "data": base64.b64encode(self.data).decode("ascii")}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        return cls(data["bits"], data["hashes"], bytearray(base64.b64decode(data["data"])))
+
+
+class LogQuery:
+    """Filters for one search; times are "YYYY-MM-DD HH:MM:SS" strings."""
+    
+    def __init__(self, text: str = "", level: Optional[str] = None, module: Optional[str] = None,
+                 start: Optional[str] = None, end: Optional[str] = None):
+        self.text = text.lower()
+        self.min_level = LEVELS.get((level or "").upper(), 0)
+        self.module = module
+        self.start = start
+        self.end = end
+        self.grams = trigrams(WORD.findall(self.text))
+    
+    def skips(self, entry: Dict[str, Any], bloom: Optional[BloomFilter]) -> bool:
+        """True if the index proves a segment has no match."""
+        if self.start and entry["end"] < self.start:
+            return True
+        if self.end and entry["start"] > self.end:
+            return True
+        if self.min_level and not any(
+            count and LEVELS.get(level, 0) >= self.min_level for level, count in entry["levels"].items()
+        ):
+            return True
+        if self.module and not any(module.startswith(self.module) for module in entry["modules"]):
+            return True
+        if bloom is not None and any(gram not in bloom for gram in self.grams):
+            return True
+        return False
+    
+    def matches(self, time_str: str, level: str, module: str, message: str) -> bool:
+        # Timestamps in this format compare correctly as strings
+        if self.start and time_str < self.start:
+            return False
+        if self.end and time_str > self.end:
+            return False
+        if self.min_level and LEVELS.get(level, 0) < self.min_level:
+            return False
+        if self.module and not module.startswith(self.module):
+            return False
+        return not self.text or self.text in message.lower()
+
+
+def _parse(lines: Iterable[str]) -> Iterator[tuple]:
+    """(time, level, module, message) per log line; continuation lines are skipped."""
+    for line in lines:
+        match = LOG_LINE.match(line)
+        if match:
+            yield match.groups()
+
+
+class LogSearch:
+    """Search across remo.log and its rotated zip archives.
+    
+    Rotation hands each finished segment to compress(), which only queues
+    it: a background thread builds a small index entry (time bounds, level
+    and module counts, and a bloom filter of message trigrams) from the
+    plain file and then zips it, so rotation never stalls the logging
+    thread. Segments still waiting for that are searched as plain files.
+    A search reads
+    only the index for most archives and decompresses just the segments
+    that could contain a match. Archives without an index entry (older than
+    this feature) are indexed the first time a search reaches them.
+    """
+    
+    def __init__(self, log_file: Path, index_file: Path):
+        self.log_file = log_file
+        self.index_file = index_file
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._blooms: Dict[str, BloomFilter] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._pending: List[Path] = []  # Rotated segments not zipped yet (oldest first)
+        self._worker: Optional[ThreadPoolExecutor] = None
+        
+        # Called with the rotated (still plain) file before it is zipped;
+        # set by utils/logger.py so live tails can read its last lines
+        self.on_rotate: Optional[Callable[[Path], None]] = None
+    
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.index_file.exists():
+            return
+        try:
+            self._index = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # A damaged index is rebuilt lazily from the archives
+            self._index = {}
+    
+    def _save(self) -> None:
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index), encoding="utf-8")
+        tmp.replace(self.index_file)
+    
+    def _build_entry(self, lines: Iterable[str]) -> Dict[str, Any]:
+        start = end = ""
+        levels: Dict[str, int] = {}
+        modules: Set[str] = set()
+        words: Set[str] = set()
+        count = 0
+        for time_str, level, module, message in _parse(lines):
+            start = start or time_str
+            end = time_str
+            levels[level] = levels.get(level, 0) + 1
+            modules.add(module)
+            words.update(WORD.findall(message.lower()))
+            count += 1
+        
+        return {
+            "start": start,
+            "end": end,
+            "lines": count,
+            "levels": levels,
+            "modules": sorted(modules),
+            "bloom": BloomFilter.for_items(trigrams(words)).to_dict(),
+        }
+    
+    def compress(self, path: str) -> None:
+        """loguru compression hook: queue a rotated segment for indexing and zipping.
+        
+        Runs inside the file sink during rotation (usually on the event
+        loop), so it only lets live tails drain the segment and hands it to
+        the background thread. It must not log.
+        """
+        source = Path(path)
+        
+        if self.on_rotate is not None:
+            try:
+                self.on_rotate(source)
+            except Exception:
+                pass
+        
+        with self._lock:
+            self._pending.append(source)
+            if self._worker is None:
+                # One thread keeps segments in rotation order; pending work
+                # is finished at interpreter exit
+                self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        self._worker.submit(self._archive, source)
+    
+    def _archive(self, source: Path) -> None:
+        """Index a rotated segment, then zip it (background thread)."""
+        archive = Path(f"{source}.zip")
+        tmp = Path(f"{archive}.tmp")  # Not matched by _segments() until complete
+        
+        try:
+            with open(source, "r", encoding="utf-8", errors="replace") as f:
+                entry = self._build_entry(f)
+        except Exception:
+            entry = None  # Indexed later, on first search
+        
+        try:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(source, source.name)
+        except Exception:
+            # Leave the plain segment in place rather than lose it
+            tmp.unlink(missing_ok=True)
+            with self._lock:
+                self._pending.remove(source)
+            return
+        
+        # Swap plain for zipped atomically with respect to _search()
+        with self._lock:
+            tmp.replace(archive)
+            self._pending.remove(source)
+            if entry is not None:
+                self._load()
+                self._index[archive.name] = entry
+                try:
+                    self._save()
+                except OSError:
+                    pass
+        try:
+            source.unlink(missing_ok=True)
+        except OSError:
+            pass  # Still open by a reader (Windows); retention removes it
+    
+    def _segments(self) -> List[Path]:
+        """Rotated archives, by name (loguru names embed the rotation time)."""
+        stem, suffix = os.path.splitext(self.log_file.name)
+        return sorted(self.log_file.parent.glob(f"{stem}.*{suffix}.zip"))
+    
+    @staticmethod
+    def _read_archive(archive: Path) -> Iterator[str]:
+        with zipfile.ZipFile(archive) as zf:
+            for name in zf.namelist():
+                with zf.open(name) as raw:
+                    for line in raw:
+                        yield line.decode("utf-8", errors="replace")
+    
+    def _entry_for(self, archive: Path) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            entry = self._index.get(archive.name)
+        if entry is None:
+            entry = self._build_entry(self._read_archive(archive))
+            with self._lock:
+                self._index[archive.name] = entry
+                self._save()
+        return entry
+    
+    def _bloom_for(self, name: str, entry: Dict[str, Any]) -> BloomFilter:
+        bloom = self._blooms.get(name)
+        if bloom is None:
+            bloom = BloomFilter.from_dict(entry["bloom"])
+            self._blooms[name] = bloom
+        return bloom
+    
+    def _prune(self, archives: List[Path]) -> None:
+        """Forget index entries whose archives were removed by retention (lock held)."""
+        names = {archive.name for archive in archives}
+        self._load()
+        stale = [name for name in self._index if name not in names]
+        for name in stale:
+            del self._index[name]
+            self._blooms.pop(name, None)
+        if stale:
+            self._save()
+    
+    def _search(self, query: LogQuery, limit: int) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with self._lock:
+            archives = self._segments()
+            pending = list(self._pending)
+            self._prune(archives)
+        
+        results: List[Dict[str, Any]] = []
+        scanned = skipped = 0
+        
+        def scan(lines: Iterable[str]) -> None:
+            # Keep the newest matches of this segment only
+            found: Deque[Dict[str, str]] = deque(maxlen=limit - len(results))
+            for time_str, level, module, message in _parse(lines):
+                if query.matches(time_str, level, module, message):
+                    found.append({"time": time_str, "level": level, "module": module, "message": message})
+            results.extend(reversed(found))
+        
+        # Newest first: current file, then archives from the latest back
+        if self.log_file.exists():
+            with open(self.log_file, "r", encoding="utf-8", errors="replace") as f:
+                scan(f)
+            scanned += 1
+        
+        # Rotated segments still waiting to be zipped (no index entry yet)
+        for source in reversed(pending):
+            if len(results) >= limit:
+                break
+            try:
+                with open(source, "r", encoding="utf-8", errors="replace") as f:
+                    scan(f)
+            except FileNotFoundError:
+                # Zipped since the snapshot: read the archive instead
+                try:
+                    scan(self._read_archive(Path(f"{source}.zip")))
+                except (OSError, zipfile.BadZipFile):
+                    skipped += 1
+                    continue
+            scanned += 1
+        
+        for archive in reversed(archives):
+            if len(results) >= limit:
+                break
+            try:
+                entry = self._entry_for(archive)
+                if query.skips(entry, self._bloom_for(archive.name, entry) if query.grams else None):
+                    skipped += 1
+                    continue
+                scan(self._read_archive(archive))
+                scanned += 1
+            except (OSError, zipfile.BadZipFile, KeyError, ValueError):
+                skipped += 1
+        
+        return {
+            "results": results[:limit],
+            "segments": len(archives) + len(pending) + 1,
+            "scanned": scanned,
+            "skipped": skipped,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    async def search(self, text: str = "", level: Optional[str] = None, module: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """Newest matching records first, plus how many segments were skipped."""
+        query = LogQuery(text, level, module, start, end)
+        return await asyncio.get_running_loop().run_in_executor(None, self._search, query, limit)
+
+
+def parse_time(value: str) -> Optional[str]:
+    """Accept unix seconds or "YYYY-MM-DD[ HH:MM[:SS]]"; return the log time format."""
+    value = value.strip()
+    try:
+        return datetime.fromtimestamp(float(value)).strftime(TIME_FORMAT)
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).strftime(TIME_FORMAT)
+        except ValueError:
+            continue
+    return None
+
+
+# Singleton instance
+log_search = LogSearch(config.LOG_FILE, config.LOG_INDEX_FILE)
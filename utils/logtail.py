@@ -0,0 +1,201 @@
+# REMO - Log Tail
+# Follows remo.log by offset (tail -f) for /tail and /api/logs/tail
+
+import os
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Set, Tuple
+
+import config
+from utils.logsearch import LEVELS, LOG_LINE
+
+
+class TailFollower:
+    """One reader of the log file with its own offset and filters.
+    
+    The file is opened, read from the saved offset and closed on every pass
+    (holding it open would block loguru's rename on Windows). Lines written
+    just before a rotation are read from the rotated file by drain_rotated(),
+    which LogSearch.compress() triggers before zipping it, so no line is lost
+    when the file is swapped.
+    """
+    
+    def __init__(self, path: Path, level: Optional[str] = None, module: Optional[str] = None):
+        self.path = path
+        self.min_level = LEVELS.get((level or "").upper(), 0)
+        self.module = module
+        self.wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._partial = b""
+        self._pending = b""
+        self._passing = False  # Whether the last record passed (for traceback lines)
+        self.closed = False  # Set on shutdown; read() then returns [] at once
+        
+        # Start at the current end of the file, like tail -f
+        try:
+            stat = path.stat()
+            self._offset, self._identity = stat.st_size, self._identity_of(stat)
+        except FileNotFoundError:
+            self._offset, self._identity = 0, None
+    
+    @staticmethod
+    def _identity_of(stat: os.stat_result) -> Optional[Tuple[int, int]]:
+        return (stat.st_dev, stat.st_ino) if stat.st_ino else None
+    
+    @staticmethod
+    def _read(path: Path, offset: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(config.LOG_TAIL_MAX_READ)
+    
+    def notify(self) -> None:
+        """Wake the follower (safe from any thread)."""
+        try:
+            self._loop.call_soon_threadsafe(self.wakeup.set)
+        except RuntimeError:
+            pass  # Loop already closed
+    
+    def close(self) -> None:
+        """End this follower (safe from any thread)."""
+        self.closed = True
+        self.notify()
+    
+    def drain_rotated(self, rotated: Path) -> None:
+        """Read what is left of the file that was just rotated away."""
+        with self._lock:
+            try:
+                stat = rotated.stat()
+                if self._identity is None or self._identity_of(stat) in (None, self._identity):
+                    while self._offset < stat.st_size:
+                        data = self._read(rotated, self._offset)
+                        if not data:
+                            break
+                        self._pending += data
+                        self._offset += len(data)
+            except OSError:
+                pass
+            # The next pass starts at the top of the new file
+            self._offset, self._identity = 0, None
+        self.notify()
+    
+    def _poll(self) -> bytes:
+        """New bytes since the last pass (blocking; run in an executor)."""
+        with self._lock:
+            data, self._pending = self._pending, b""
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                return data
+            
+            identity = self._identity_of(stat)
+            if self._identity is not None and identity is not None and identity != self._identity:
+                # Replaced without a drain (e.g. rotated by hand): new file from the top
+                self._offset = 0
+            elif stat.st_size < self._offset:
+                # Truncated
+                self._offset = 0
+            self._identity = identity
+            
+            if stat.st_size > self._offset:
+                chunk = self._read(self.path, self._offset)
+                self._offset += len(chunk)
+                data += chunk
+                if self._offset < stat.st_size:
+                    self.notify()  # More than one read's worth: go again
+            return data
+    
+    def _filter(self, data: bytes) -> List[str]:
+        """Split into complete lines and apply the level/module filters."""
+        data = self._partial + data
+        *complete, self._partial = data.split(b"\n")
+        
+        lines = []
+        for raw in complete:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r")
+            match = LOG_LINE.match(line)
+            if match:
+                _, level, module, _ = match.groups()
+                self._passing = (
+                    LEVELS.get(level, 0) >= self.min_level
+                    and (not self.module or module.startswith(self.module))
+                )
+            if self._passing and line:
+                lines.append(line)
+        return lines
+    
+    async def read(self, timeout: float) -> List[str]:
+        """Wait up to timeout seconds for new lines that pass the filters.
+        
+        Returns [] on timeout or once the follower is closed (check
+        `closed`). The timeout is handled here rather than by cancelling
+        the call, so bytes already read are never dropped.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.closed:
+            remaining = deadline - loop.time()
+            try:
+                await asyncio.wait_for(
+                    self.wakeup.wait(), max(0, min(remaining, config.LOG_TAIL_POLL_INTERVAL))
+                )
+            except asyncio.TimeoutError:
+                pass  # Also catches writes from outside this process
+            self.wakeup.clear()
+            
+            if self.closed:
+                break
+            lines = self._filter(await loop.run_in_executor(None, self._poll))
+            if lines or remaining <= 0:
+                return lines
+        return []
+
+
+class LogTail:
+    """Registry of followers; woken by a loguru sink and by rotation."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._followers: Set[TailFollower] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def __len__(self) -> int:
+        return len(self._followers)
+    
+    def follow(self, level: Optional[str] = None, module: Optional[str] = None) -> TailFollower:
+        follower = TailFollower(self.path, level, module)
+        if self._closed:
+            follower.closed = True
+        with self._lock:
+            self._followers.add(follower)
+        return follower
+    
+    def unfollow(self, follower: TailFollower) -> None:
+        with self._lock:
+            self._followers.discard(follower)
+    
+    def _snapshot(self) -> List[TailFollower]:
+        with self._lock:
+            return list(self._followers)
+    
+    def sink(self, message) -> None:
+        """loguru sink (added after the file sink): new line written."""
+        for follower in self._snapshot():
+            follower.notify()
+    
+    def on_rotate(self, rotated: Path) -> None:
+        """Called from the rotation hook before the segment is compressed."""
+        for follower in self._snapshot():
+            follower.drain_rotated(rotated)
+    
+    async def close(self, app: Any = None) -> None:
+        """End every open tail (aiohttp on_shutdown hook)."""
+        self._closed = True
+        for follower in self._snapshot():
+            follower.close()
+
+
+# Singleton instance
+log_tail = LogTail(config.LOG_FILE)
@@ -0,0 +1,190 @@
+# REMO - Command Metrics
+# Fixed-bucket, rolling-window latency histograms per command and phase
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+
+# Bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+PHASES = ("auth", "handler", "system", "reply", "total")
+
+
+class RollingHistogram:
+    """Latency histogram over a ring of fixed time slots.
+    
+    Recording is one bisect and one increment. Old slots are reset lazily
+    when the ring wraps around to them, so memory is fixed at
+    slots x buckets counters regardless of traffic.
+    """
+    
+    def __init__(self, slot_seconds: int, slots: int):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._counts: List[List[int]] = [[0] * (len(BUCKETS_MS) + 1) for _ in range(slots)]
+        self._slot_ids: List[int] = [-1] * slots
+    
+    def record(self, ms: float) -> None:
+        slot_id = int(time.monotonic() // self.slot_seconds)
+        index = slot_id % self.slots
+        counts = self._counts[index]
+        if self._slot_ids[index] != slot_id:
+            # Slot belongs to an old lap of the ring: reuse it
+            counts[:] = [0] * len(counts)
+            self._slot_ids[index] = slot_id
+        counts[bisect_left(BUCKETS_MS, ms)] += 1
+    
+    def window_counts(self, seconds: int) -> List[int]:
+        """Sum the slots that fall within the last `seconds`."""
+        current = int(time.monotonic() // self.slot_seconds)
+        oldest = current - max(1, seconds // self.slot_seconds) + 1
+        
+        total = [0] * (len(BUCKETS_MS) + 1)
+        for index, slot_id in enumerate(self._slot_ids):
+            if oldest <= slot_id <= current:
+                for bucket, count in enumerate(self._counts[index]):
+                    total[bucket] += count
+        return total
+
+
+def percentile(counts: List[int], q: float) -> Optional[float]:
+    """Estimate the q-th percentile (0-1) in ms, interpolating inside a bucket."""
+    total = sum(counts)
+    if total == 0:
+        return None
+    
+    rank = q * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKETS_MS[bucket - 1] if bucket > 0 else 0
+            upper = BUCKETS_MS[bucket] if bucket < len(BUCKETS_MS) else BUCKETS_MS[-1] * 2
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return float(BUCKETS_MS[-1])
+
+
+class CommandTimer:
+    """Per-invocation phase accumulator, carried in a context variable."""
+    
+    __slots__ = ("command", "reply")
+    
+    def __init__(self, command: str):
+        self.command = command
+        self.reply = 0.0  # Seconds spent in Telegram API calls
+
+
+_current_timer: ContextVar[Optional[CommandTimer]] = ContextVar("remo_command_timer", default=None)
+
+
+class LatencyMetrics:
+    """Per-command, per-phase latency histograms.
+    
+    Phases: auth (middleware checks), handler (the wrapped handler as a
+    whole), reply (Telegram API calls made while handling the command),
+    system (handler time outside Telegram I/O, i.e. the OS/system calls;
+    argument parsing is negligible next to them) and total.
+    """
+    
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], RollingHistogram] = {}
+    
+    def _histogram(self, command: str, phase: str) -> RollingHistogram:
+        key = (command, phase)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = RollingHistogram(config.METRICS_SLOT_SECONDS, config.METRICS_SLOTS)
+            self._histograms[key] = histogram
+        return histogram
+    
+    def start_command(self, command: str):
+        """Begin timing a command; returns a token for finish_command."""
+        timer = CommandTimer(command)
+        return timer, _current_timer.set(timer)
+    
+    def finish_command(self, started, auth: float, handler: float) -> None:
+        """Record all phases of a finished command."""
+        timer, token = started
+        _current_timer.reset(token)
+        
+        # Nested commands (/help -> /start): the outer one waited on this I/O too
+        parent = _current_timer.get()
+        if parent is not None:
+            parent.reply += timer.reply
+        
+        reply = min(timer.reply, handler)
+        phases = {
+            "auth": auth,
+            "handler": handler,
+            "system": handler - reply,
+            "reply": reply,
+            "total": auth + handler,
+        }
+        for phase, seconds in phases.items():
+            self._histogram(timer.command, phase).record(seconds * 1000)
+    
+    def add_reply_time(self, seconds: float) -> None:
+        """Attribute Telegram API time to the command being handled, if any."""
+        timer = _current_timer.get()
+        if timer is not None:
+            timer.reply += seconds
+    
+    def summary(self, window: int) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """{command: {phase: {count, p50, p95, p99}}} over the last `window` seconds."""
+        result: Dict[str, Dict[str, Dict[str, Optional[float]]]] = {}
+        for (command, phase), histogram in self._histograms.items():
+            counts = histogram.window_counts(window)
+            if not sum(counts):
+                continue
+            result.setdefault(command, {})[phase] = {
+                "count": sum(counts),
+                "p50": percentile(counts, 0.50),
+                "p95": percentile(counts, 0.95),
+                "p99": percentile(counts, 0.99),
+            }
+        return result
+    
+    def get_summary(self, window_name: str) -> str:
+        """Formatted per-command latency table for /stats."""
+        window = config.METRICS_WINDOWS[window_name]
+        summary = self.summary(window)
+        
+        lines = [f"⏱️ **Command Latency** (last {window_name})", ""]
+        if not summary:
+            lines.append("No commands recorded yet.")
+            return "\n".join(lines)
+        
+        by_count = sorted(summary.items(), key=lambda item: -item[1]["total"]["count"])
+        for command, phases in by_count:
+            total = phases["total"]
+            lines.append(
+                f"**/{command}** ×{total['count']}: "
+                f"p50 {format_ms(total['p50'])} · p95 {format_ms(total['p95'])} · "
+                f"p99 {format_ms(total['p99'])}"
+            )
+            lines.append(
+                "└ p95 " + " · ".join(
+                    f"{phase} {format_ms(phases[phase]['p95'])}"
+                    for phase in ("auth", "system", "reply") if phase in phases
+                )
+            )
+        
+        return "\n".join(lines)
+
+
+def format_ms(ms: Optional[float]) -> str:
+    """Human-friendly latency ("850ms", "1.20s")."""
+    if ms is None:
+        return "-"
+    if ms >= 1000:
+        return f"{ms / 1000:.2f}s"
+    return f"{ms:.1f}ms" if ms < 10 else f"{ms:.0f}ms"
+
+
+# Singleton instance
+metrics = LatencyMetrics()
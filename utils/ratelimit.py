@@ -0,0 +1,159 @@
+# REMO - Rate Limiting
+# O(1) token-bucket and sliding-window-counter limiters with bounded memory
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+
+# Shared state for new keys once a limiter that keeps active keys is full
+OVERFLOW_KEY = "*overflow*"
+
+
+class _KeyedLimiter(ABC):
+    """Base class: a capped, LRU-ordered table of per-key state.
+    
+    Every check is O(1): one dict lookup, one move_to_end, and eviction of
+    at most a couple of idle keys from the cold end of the table. The table
+    never holds more than max_keys entries, so a spray of distinct keys
+    (IPs, user IDs) cannot grow memory without bound.
+    
+    By default the coldest key is evicted when the table is full, even if
+    it is still being limited. With evict_active=False only idle keys are
+    evicted; once the table is full of active keys, new keys share one
+    OVERFLOW_KEY entry with the same limit. Spraying keys then can't flush
+    a key's history (the login limiter needs this), and the table holds
+    at most max_keys + 1 entries.
+    """
+    
+    # Idle keys evicted per check (amortizes cleanup without full scans)
+    _EVICT_PER_CALL = 2
+    
+    def __init__(self, limit: int, window: float, max_keys: int = 10000, idle_ttl: Optional[float] = None,
+                 evict_active: bool = True):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self.idle_ttl = idle_ttl if idle_ttl is not None else window * 2
+        self.evict_active = evict_active
+        self._table: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._table)
+    
+    @abstractmethod
+    def _new_state(self, now: float) -> List[Any]:
+        """Fresh state for a key; the last item is its last-seen time."""
+    
+    @abstractmethod
+    def _consume(self, state: List[Any], now: float, cost: float) -> bool:
+        """Charge cost against state; returns whether the call is allowed."""
+    
+    def _evict(self, now: float) -> None:
+        """Drop idle keys from the cold end, and the coldest if over the cap."""
+        table = self._table
+        for _ in range(self._EVICT_PER_CALL):
+            if not table:
+                return
+            key = next(iter(table))
+            if now - table[key][-1] > self.idle_ttl:
+                del table[key]
+            else:
+                break
+        
+        if self.evict_active:
+            while len(table) > self.max_keys:
+                table.popitem(last=False)
+    
+    def is_allowed(self, key: Hashable, cost: float = 1) -> bool:
+        """Check and record a call of the given cost for key."""
+        now = time.monotonic()
+        state = self._table.get(key)
+        if state is None and not self.evict_active and len(self._table) >= self.max_keys:
+            self._evict(now)
+            if len(self._table) >= self.max_keys:
+                key = OVERFLOW_KEY
+                state = self._table.get(key)
+        
+        if state is None:
+            state = self._new_state(now)
+            self._table[key] = state
+        else:
+            self._table.move_to_end(key)
+        
+        allowed = self._consume(state, now, cost)
+        state[-1] = now  # Last seen, for idle eviction
+        self._evict(now)
+        return allowed
+    
+    def reset(self, key: Hashable) -> None:
+        """Forget a key (e.g. after a successful login)."""
+        self._table.pop(key, None)
+
+
+class TokenBucketLimiter(_KeyedLimiter):
+    """Token bucket: `limit` tokens, refilled evenly over `window` seconds.
+    
+    Allows short bursts up to `limit` while capping the sustained rate.
+    State per key: [tokens, last_refill, last_seen].
+    """
+    
+    def _new_state(self, now: float) -> List[Any]:
+        return [float(self.limit), now, now]
+    
+    def _consume(self, state: List[Any], now: float, cost: float) -> bool:
+        tokens, last = state[0], state[1]
+        tokens = min(self.limit, tokens + (now - last) * self.limit / self.window)
+        state[1] = now
+        
+        if tokens >= cost:
+            state[0] = tokens - cost
+            return True
+        
+        state[0] = tokens
+        return False
+
+
+class SlidingWindowLimiter(_KeyedLimiter):
+    """Sliding-window counter: at most `limit` cost units per `window` seconds.
+    
+    Approximates a true sliding log with two fixed-window counters, weighting
+    the previous window by how much of it still overlaps the sliding window.
+    State per key: [window_start, previous_count, current_count, last_seen].
+    """
+    
+    def _new_state(self, now: float) -> List[Any]:
+        return [now, 0.0, 0.0, now]
+    
+    def _consume(self, state: List[Any], now: float, cost: float) -> bool:
+        window_start, previous, current = state[0], state[1], state[2]
+        
+        elapsed = now - window_start
+        if elapsed >= self.window:
+            # Roll forward; after two windows the previous one is empty too
+            windows = int(elapsed // self.window)
+            previous = current if windows == 1 else 0.0
+            current = 0.0
+            window_start += windows * self.window
+            elapsed = now - window_start
+        
+        weight = 1.0 - elapsed / self.window
+        estimate = previous * weight + current
+        
+        state[0], state[1] = window_start, previous
+        if estimate + cost <= self.limit:
+            state[2] = current + cost
+            return True
+        
+        state[2] = current
+        return False
+
+
+def create_limiter(algorithm: str, limit: int, window: float, **kwargs) -> _KeyedLimiter:
+    """Build a limiter by name: "token_bucket" or "sliding_window"."""
+    if algorithm == "token_bucket":
+        return TokenBucketLimiter(limit, window, **kwargs)
+    if algorithm == "sliding_window":
+        return SlidingWindowLimiter(limit, window, **kwargs)
+    raise ValueError(f"Unknown rate limit algorithm: {algorithm}")